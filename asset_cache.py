@@ -0,0 +1,121 @@
+import threading
+import pygame
+from typing import Dict, Iterable, Optional, Tuple
+from constants import resource_path
+
+Size = Tuple[int, int]
+
+# Per-file preload states in AssetCache._files (besides a decoded surface).
+LOADING = "loading"
+TAKEN = "taken"
+
+
+class AssetCache:
+    # Process-wide image cache: every file is read and converted once, and
+    # every (path, size) variant is scaled once.
+    def __init__(self):
+        self._images: Dict[str, Optional[pygame.Surface]] = {}
+        self._scaled: Dict[Tuple[str, Optional[Size]], Optional[pygame.Surface]] = {}
+        self.atlas: Optional[pygame.Surface] = None
+        # Per file path, whatever the alpha variant: LOADING while the
+        # preloader decodes it, then the decoded surface until _load takes
+        # it, and TAKEN once _load has. Guarded by _lock.
+        self._files: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._preloader: Optional[threading.Thread] = None
+
+    def _load(self, path: str, alpha: bool) -> Optional[pygame.Surface]:
+        key = path if alpha else f"{path}#opaque"
+        if key in self._images:
+            return self._images[key]
+        with self._lock:
+            img = self._files.get(path)
+            self._files[path] = TAKEN
+        try:
+            if not isinstance(img, pygame.Surface):
+                img = pygame.image.load(resource_path(path))
+            img = img.convert_alpha() if alpha else img.convert()
+        except Exception:
+            img = None
+        self._images[key] = img
+        return img
+
+    def get(
+        self, path: str, size: Optional[Size] = None, alpha: bool = True
+    ) -> Optional[pygame.Surface]:
+        key = (path, tuple(size) if size else None, alpha)
+        if key in self._scaled:
+            return self._scaled[key]
+        # Converting needs a display mode; defer until there is one.
+        if pygame.display.get_surface() is None:
+            return None
+        img = self._load(path, alpha)
+        if img is not None and size:
+            img = pygame.transform.scale(img, size)
+        self._scaled[key] = img
+        return img
+
+    # Pack same-sized tiles into one surface and serve them as subsurfaces.
+    def build_atlas(self, paths: Iterable[str], size: Size) -> Optional[pygame.Surface]:
+        if pygame.display.get_surface() is None:
+            return None
+        paths = [p for p in dict.fromkeys(paths) if (p, size, True) not in self._scaled]
+        tiles = [(p, self._load(p, True)) for p in paths]
+        tiles = [(p, img) for p, img in tiles if img is not None]
+        if not tiles:
+            return self.atlas
+
+        w, h = size
+        atlas = pygame.Surface((w * len(tiles), h), pygame.SRCALPHA).convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+        for i, (path, img) in enumerate(tiles):
+            rect = pygame.Rect(i * w, 0, w, h)
+            atlas.blit(pygame.transform.scale(img, size), rect)
+            self._scaled[(path, tuple(size), True)] = atlas.subsurface(rect)
+        self.atlas = atlas
+        return atlas
+
+    # Decode files on a background thread, so that a later get() only has
+    # to convert and scale them. Decoding needs no display mode. A file
+    # asked for while it is still being decoded is decoded again by the
+    # caller, and the preloader's copy is dropped.
+    def preload(self, paths: Iterable[str]):
+        paths = list(dict.fromkeys(paths))
+
+        def decode():
+            for path in paths:
+                with self._lock:
+                    if path in self._files:
+                        continue
+                    self._files[path] = LOADING
+                try:
+                    img = pygame.image.load(resource_path(path))
+                except Exception:
+                    img = None
+                with self._lock:
+                    if self._files.get(path) is LOADING:
+                        if img is None:
+                            del self._files[path]
+                        else:
+                            self._files[path] = img
+
+        self._preloader = threading.Thread(
+            target=decode, name="asset-preload", daemon=True
+        )
+        self._preloader.start()
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+        self._images.clear()
+        self._scaled.clear()
+        self.atlas = None
+
+
+assets = AssetCache()
+
+
+def get_image(
+    path: str, size: Optional[Size] = None, alpha: bool = True
+) -> Optional[pygame.Surface]:
+    return assets.get(path, size, alpha)
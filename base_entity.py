@@ -1,9 +1,14 @@
 import pygame
 from abc import ABC, abstractmethod
-from constants import GRID_SIZE, COLORS, resource_path
+from typing import Optional, Tuple
+from asset_cache import get_image
+from constants import GRID_SIZE, COLORS, MOVEMENT_DELAY
 
 
 class Entity(ABC):
+    # Time a one-cell move takes on screen; rendering blends it over this.
+    move_ms = MOVEMENT_DELAY
+
     def __init__(
         self,
         x: int,
@@ -14,26 +19,29 @@ class Entity(ABC):
     ):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        # Cell at the start of the current tick, and sim time of the last
+        # move, for render interpolation.
+        self.tick_start = (x, y)
+        self.moved_at_ms = 0
         self.color = color
         self.grid_size = grid_size
-        self.sprite = None
-
-        if sprite_path:
-            try:
-                sprite_file = resource_path(sprite_path)
-                self.sprite = pygame.image.load(sprite_file).convert_alpha()
-                self.sprite = pygame.transform.scale(
-                    self.sprite, (grid_size - 4, grid_size - 4)
-                )
-            except Exception:
-                pass
+        self.sprite_path = sprite_path
+
+    # Shared, pre-scaled image from the asset cache; spawning does no disk I/O.
+    @property
+    def sprite(self) -> Optional[pygame.Surface]:
+        if not self.sprite_path:
+            return None
+        return get_image(self.sprite_path, (self.grid_size - 4, self.grid_size - 4))
 
     @abstractmethod
     def update(self, *args, **kwargs):
         pass
 
     @abstractmethod
-    def render(self, screen: pygame.Surface):
+    def render(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)):
         pass
 
     def get_rect(self) -> pygame.Rect:
@@ -44,6 +52,31 @@ class Entity(ABC):
             self.grid_size - 4,
         )
 
+    # Remember the cell at the start of a tick.
+    def snapshot(self):
+        self.tick_start = (self.x, self.y)
+
+    # At the end of a tick: if the entity left its snapshot cell, start
+    # blending from there.
+    def track_move(self, now_ms: int):
+        if self.tick_start != (self.x, self.y):
+            self.prev_x, self.prev_y = self.tick_start
+            self.moved_at_ms = now_ms
+
+    # Pixel offset from the current cell towards the previous one at render
+    # time now_ms; the last move is blended over move_ms from the tick it
+    # was made in. Jumps are not blended.
+    def lerp_offset(self, now_ms: float) -> Tuple[int, int]:
+        dx = self.prev_x - self.x
+        dy = self.prev_y - self.y
+        if abs(dx) + abs(dy) != 1:
+            return (0, 0)
+        left = 1.0 - (now_ms - self.moved_at_ms) / self.move_ms
+        if left <= 0:
+            return (0, 0)
+        blend = min(1.0, left) * self.grid_size
+        return (round(dx * blend), round(dy * blend))
+
     def get_position(self) -> tuple:
         return (self.x, self.y)
 
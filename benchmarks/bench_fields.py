@@ -0,0 +1,111 @@
+# Whole-map distance fields: dict BFS (_bfs), flat-array BFS
+# (distance_field) and the bitmask wavefront (PassableMask.field).
+#
+#   python benchmarks/bench_fields.py [repeats] [maze_size ...]
+#
+# Mazes are generated corridors, where the wavefront needs one ring per
+# step of the longest path and falls behind the queue-based searches as the
+# maze grows; the other grids are the same size with walls scattered at the
+# given rate, where rings get fewer and wider as the walls thin out. The
+# "open" column is each grid's share of open cells, which is what
+# pathfinding.WAVEFRONT_MIN_OPEN is compared against; "mask+wave" is what
+# a caller pays for a one-off field.
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from constants import CellType
+from maze_generator import MazeGenerator
+from pathfinding import PassableMask, _bfs, bfs_reachable, distance_field
+
+
+WALL_RATES = (0.05, 0.1, 0.2, 0.3, 0.35)
+
+
+def scattered_grid(size: int, wall_rate: float):
+    return [
+        [
+            CellType.WALL if random.random() < wall_rate else CellType.PATH
+            for _ in range(size)
+        ]
+        for _ in range(size)
+    ]
+
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    args = sys.argv[1:]
+    repeats = int(args[0]) if args else 5
+    sizes = [int(a) for a in args[1:]] or [25, 101, 301]
+    for size in sizes:
+        random.seed(size)
+        grids = [("maze", MazeGenerator(size, size).generate())] + [
+            (f"walls {rate:.0%}", scattered_grid(size, rate)) for rate in WALL_RATES
+        ]
+        for kind, maze in grids:
+            width, height = len(maze[0]), len(maze)
+
+            def is_blocked(pos) -> bool:
+                return maze[pos[1]][pos[0]] == CellType.WALL
+
+            # Start inside the grid's main region: scattered walls can box
+            # in the first open cells.
+            open_cells = [
+                (x, y)
+                for y in range(height)
+                for x in range(width)
+                if not is_blocked((x, y))
+            ]
+            seen = set()
+            start, region = open_cells[0], 0
+            for cell in open_cells:
+                if cell in seen:
+                    continue
+                reach = bfs_reachable(cell, width, height, is_blocked)
+                seen |= reach
+                if len(reach) > region:
+                    start, region = cell, len(reach)
+                if region * 2 > len(open_cells):
+                    break
+            open_share = len(open_cells) / (width * height)
+            mask = PassableMask(width, height, is_blocked)
+            results = [
+                (
+                    "_bfs",
+                    timed(lambda: _bfs(start, width, height, is_blocked), repeats),
+                ),
+                (
+                    "distance_field",
+                    timed(
+                        lambda: distance_field([start], width, height, is_blocked),
+                        repeats,
+                    ),
+                ),
+                (
+                    "mask build",
+                    timed(lambda: PassableMask(width, height, is_blocked), repeats),
+                ),
+                ("wavefront", timed(lambda: mask.field([start]), repeats)),
+            ]
+            results.append(("mask+wave", results[2][1] + results[3][1]))
+            print(
+                f"{width}x{height} {kind}, open {open_share:.2f}, "
+                f"start region {region}"
+            )
+            for name, elapsed in results:
+                print(f"  {name:15s} {elapsed * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Saved fog state: packing the explored grid to bits and back, with a
+# round-trip check (exits non-zero if a grid does not survive it).
+#
+#   python benchmarks/bench_fog.py [repeats] [map_size ...]
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from fog_of_war import FogOfWar
+
+
+def main():
+    args = sys.argv[1:]
+    repeats = int(args[0]) if args else 20
+    sizes = [int(a) for a in args[1:]] or [25, 101, 501]
+    random.seed(1)
+    failed = False
+    for size in sizes:
+        fog = FogOfWar(size, size, 32)
+        fog.explored[:] = bytes(random.getrandbits(1) for _ in range(size * size))
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            data = fog.pack_explored()
+        pack_ms = (time.perf_counter() - start) / repeats * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            restored = FogOfWar(size, size, 32)
+            restored.unpack_explored(data)
+        unpack_ms = (time.perf_counter() - start) / repeats * 1000
+
+        ok = restored.explored == fog.explored and len(data) == (size * size + 7) // 8
+        failed = failed or not ok
+        print(f"{size}x{size}: {len(data)} bytes")
+        print(f"    pack: {pack_ms:.3f} ms")
+        print(f"  unpack: {unpack_ms:.3f} ms")
+        print(f"  round trip: {'ok' if ok else 'MISMATCH'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
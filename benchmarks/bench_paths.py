@@ -0,0 +1,72 @@
+# Point-to-point path queries: whole-grid search vs the HPA* planner.
+#
+#   python benchmarks/bench_paths.py [queries] [maze_size ...]
+#
+# "cold" includes the first touch of each cluster (border scan and entrance
+# costs); "warm" repeats the same queries against the filled caches; "step"
+# plans and takes only the first step, which is what a walker pays up front
+# when legs are expanded lazily.
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from constants import CellType
+from maze_generator import MazeGenerator
+from pathfinding import PLANNERS
+
+
+def time_queries(planner, pairs) -> float:
+    start = time.perf_counter()
+    for a, b in pairs:
+        planner.path(a, b)
+    return time.perf_counter() - start
+
+
+def time_first_steps(planner, pairs) -> float:
+    start = time.perf_counter()
+    for a, b in pairs:
+        plan = planner.plan(a, b)
+        if plan is not None:
+            plan.next_step()
+    return time.perf_counter() - start
+
+
+def main():
+    args = sys.argv[1:]
+    queries = int(args[0]) if args else 50
+    sizes = [int(a) for a in args[1:]] or [51, 201, 501]
+    for size in sizes:
+        random.seed(size)
+        maze = MazeGenerator(size, size).generate()
+        width, height = len(maze[0]), len(maze)
+
+        def is_blocked(pos) -> bool:
+            return maze[pos[1]][pos[0]] in (CellType.WALL, CellType.DOOR)
+
+        paths = [
+            (x, y)
+            for y in range(height)
+            for x in range(width)
+            if not is_blocked((x, y))
+        ]
+        pairs = [(random.choice(paths), random.choice(paths)) for _ in range(queries)]
+        print(f"{width}x{height}, {queries} queries")
+        for name, planner_type in PLANNERS.items():
+            planner = planner_type(width, height, is_blocked)
+            cold = time_queries(planner, pairs)
+            warm = time_queries(planner, pairs)
+            step = time_first_steps(planner, pairs)
+            print(
+                f"  {name:5s} cold {cold / queries * 1e3:8.2f}"
+                f"  warm {warm / queries * 1e3:8.2f}"
+                f"  step {step / queries * 1e3:8.2f} ms/query"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Projectile stepping cost: per-dict fireball list vs FireballPool.
+#
+#   python benchmarks/bench_projectiles.py [fireballs] [ticks]
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from constants import CellType, DIRECTIONS
+from maze_generator import MazeGenerator
+from projectiles import FireballPool, WallDistances
+
+TICK_MS = 8
+
+
+def step_dicts(fireballs, maze, now_ms, player):
+    active = []
+    for fb in fireballs:
+        if now_ms < fb["next_ms"]:
+            active.append(fb)
+            continue
+        nx = fb["x"] + fb["dx"]
+        ny = fb["y"] + fb["dy"]
+        if not (0 <= nx < len(maze[0]) and 0 <= ny < len(maze)):
+            continue
+        if maze[ny][nx] in (CellType.WALL, CellType.DOOR):
+            continue
+        if (nx, ny) == player:
+            continue
+        fb["x"] = nx
+        fb["y"] = ny
+        fb["next_ms"] = now_ms + 120
+        active.append(fb)
+    return active
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    random.seed(1)
+    maze = MazeGenerator(101, 101).generate()
+    paths = [
+        (x, y)
+        for y in range(len(maze))
+        for x in range(len(maze[0]))
+        if maze[y][x] == CellType.PATH
+    ]
+    spawns = [(random.choice(paths), random.randrange(4)) for _ in range(count)]
+    player = random.choice(paths)
+
+    fireballs = []
+    pool = FireballPool(WallDistances(maze))
+    for i, ((x, y), d) in enumerate(spawns):
+        now = (i % 15) * TICK_MS
+        dx, dy = DIRECTIONS[d]
+        fireballs.append({"x": x, "y": y, "dx": dx, "dy": dy, "next_ms": now + 120})
+        pool.spawn(x, y, d, now)
+
+    def respawn_dicts(now):
+        while len(fireballs) < count:
+            (x, y), d = random.choice(spawns)
+            dx, dy = DIRECTIONS[d]
+            fireballs.append({"x": x, "y": y, "dx": dx, "dy": dy, "next_ms": now + 120})
+
+    start = time.perf_counter()
+    for t in range(ticks):
+        fireballs = step_dicts(fireballs, maze, t * TICK_MS, player)
+        respawn_dicts(t * TICK_MS)
+    dicts_ms = (time.perf_counter() - start) / ticks * 1000
+
+    start = time.perf_counter()
+    for t in range(ticks):
+        pool.update(t * TICK_MS, player)
+        while len(pool) < count:
+            (x, y), d = random.choice(spawns)
+            pool.spawn(x, y, d, t * TICK_MS)
+    pool_ms = (time.perf_counter() - start) / ticks * 1000
+
+    print(f"{count} fireballs, {ticks} ticks")
+    print(f" dicts: {dicts_ms:.3f} ms/tick")
+    print(f"  pool: {pool_ms:.3f} ms/tick")
+
+
+if __name__ == "__main__":
+    main()
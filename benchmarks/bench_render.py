@@ -0,0 +1,58 @@
+# Headless frame-time benchmark: full repaint vs dirty-rect rendering.
+#
+#   python benchmarks/bench_render.py [frames] [maze_size]
+#
+# maze_size (odd, e.g. 301) generates a maze larger than the window to check
+# that frame time follows the viewport rather than the map.
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+import game_manager
+from constants import DIRECTIONS
+from game_manager import GameManager
+
+
+def run(game: GameManager, dirty: bool, frames: int, seed: int) -> float:
+    random.seed(seed)
+    game.current_level = 3
+    game._init_level()
+    game.dirty_rendering = dirty
+    game.render()
+
+    total = 0.0
+    for _ in range(frames):
+        dx, dy = random.choice(DIRECTIONS)
+        sim = game.sim
+        sim.player.move(dx, dy, sim.maze, sim.elements, sim.now_ms)
+        game.update()
+        start = time.perf_counter()
+        game.render()
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    if len(sys.argv) > 2:
+        size = int(sys.argv[2])
+        game_manager.MAZE_WIDTH = game_manager.MAZE_HEIGHT = size
+    game = GameManager()
+    results = {}
+    for name, dirty in (("full", False), ("dirty", True)):
+        results[name] = run(game, dirty, frames, seed=1)
+        print(f"{name:>6}: {results[name]:.3f} ms/frame over {frames} frames")
+    print(f"speedup: {results['full'] / results['dirty']:.2f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Headless simulation throughput: ticks per second with no window.
+#
+#   python benchmarks/bench_sim.py [ticks] [level] [extra_skeletons] [maze_size]
+#       [--backend=grid|hpa] [--batched]
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from constants import CellType, DIRECTIONS, MAZE_HEIGHT, MAZE_WIDTH
+from fixed_step import FixedStepClock
+from simulation import Simulation, HOLD, RELEASE
+
+
+BACKEND = None
+BATCHED = "--batched" in sys.argv
+for arg in sys.argv[1:]:
+    if arg.startswith("--backend="):
+        BACKEND = arg.split("=", 1)[1]
+
+
+def make_sim(level, clock, extra, size, rng, seed=None) -> Simulation:
+    width, height = size
+    sim = Simulation(
+        level,
+        clock=clock,
+        width=width,
+        height=height,
+        seed=seed,
+        path_backend=BACKEND,
+        batched_ai=BATCHED,
+    )
+    paths = [
+        (x, y)
+        for y in range(sim.height)
+        for x in range(sim.width)
+        if sim.maze[y][x] == CellType.PATH
+    ]
+    for pos in rng.sample(paths, min(extra, len(paths))):
+        sim.spawn_enemy(pos)
+    return sim
+
+
+def run(ticks: int, level: int, extra: int, size, seed: int) -> float:
+    clock = FixedStepClock(max_speed=True)
+    rng = random.Random(seed)
+    sim = make_sim(level, clock, extra, size, rng, seed)
+    direction = None
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        if i % 30 == 0:
+            if direction:
+                sim.push(RELEASE, direction)
+            direction = rng.choice(DIRECTIONS)
+            sim.push(HOLD, direction)
+        if clock.run(sim.step, 1):
+            sim = make_sim(level, clock, extra, size, rng, rng.getrandbits(32))
+            direction = None
+    return time.perf_counter() - start
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    ticks = int(args[0]) if len(args) > 0 else 20000
+    level = int(args[1]) if len(args) > 1 else 3
+    extra = int(args[2]) if len(args) > 2 else 0
+    size = (MAZE_WIDTH, MAZE_HEIGHT)
+    if len(args) > 3:
+        size = (int(args[3]), int(args[3]))
+    elapsed = run(ticks, level, extra, size, seed=1)
+    mode = f"{BACKEND} planner" if BACKEND else "distance fields"
+    mode += ", batched AI" if BATCHED else ""
+    print(f"level {level} (+{extra} skeletons, {mode}): {ticks} ticks")
+    print(f"{elapsed:.2f} s")
+    print(f"{ticks / elapsed:.0f} ticks/s ({elapsed / ticks * 1e6:.1f} us/tick)")
+
+
+if __name__ == "__main__":
+    main()
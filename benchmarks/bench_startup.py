@@ -0,0 +1,56 @@
+# Startup latency: importing the game, constructing GameManager and
+# presenting the first frame (save selection). Each run is a fresh
+# interpreter so nothing is cached between runs.
+#
+#   python benchmarks/bench_startup.py [runs]
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+PHASES = ("import", "init", "first frame")
+
+
+def measure_once():
+    start = time.perf_counter()
+    from game_manager import GameManager
+
+    imported = time.perf_counter()
+    game = GameManager()
+    constructed = time.perf_counter()
+    game.save_screen.present(force=True)
+    shown = time.perf_counter()
+    print(imported - start, constructed - imported, shown - constructed)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--once"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for phase, value in zip(PHASES, out.split()[-3:]):
+            samples[phase].append(float(value))
+    total = [sum(values) for values in zip(*samples.values())]
+    print(f"median of {runs} runs")
+    for phase, values in list(samples.items()) + [("total", total)]:
+        print(f"  {phase:12s} {statistics.median(values) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    if "--once" in sys.argv:
+        measure_once()
+    else:
+        main()
@@ -0,0 +1,65 @@
+import pygame
+from typing import Tuple
+from constants import GRID_SIZE
+
+
+class Camera:
+    # Tile-aligned viewport onto a map that may be larger than the window.
+    # Offsets are in pixels; everything drawn in world space is shifted by
+    # -offset, and anything outside the visible tile range is skipped.
+    def __init__(
+        self,
+        view_size: Tuple[int, int],
+        world_cells: Tuple[int, int],
+        grid_size: int = GRID_SIZE,
+    ):
+        self.grid_size = grid_size
+        self.view_rect = pygame.Rect((0, 0), view_size)
+        self.cols = view_size[0] // grid_size
+        self.rows = view_size[1] // grid_size
+        self.world_w, self.world_h = world_cells
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        return (self.x * self.grid_size, self.y * self.grid_size)
+
+    # Centre on a cell, clamped to the map; returns True if the view scrolled.
+    def follow(self, pos: Tuple[int, int]) -> bool:
+        x = max(0, min(pos[0] - self.cols // 2, self.world_w - self.cols))
+        y = max(0, min(pos[1] - self.rows // 2, self.world_h - self.rows))
+        if (x, y) == (self.x, self.y):
+            return False
+        self.x = x
+        self.y = y
+        return True
+
+    # Visible cells as a half-open range (x0, y0, x1, y1).
+    def visible_range(self) -> Tuple[int, int, int, int]:
+        return (
+            self.x,
+            self.y,
+            min(self.world_w, self.x + self.cols),
+            min(self.world_h, self.y + self.rows),
+        )
+
+    def contains(self, pos: Tuple[int, int]) -> bool:
+        return (
+            self.x <= pos[0] < self.x + self.cols
+            and self.y <= pos[1] < self.y + self.rows
+        )
+
+    def world_to_screen(self, rect: pygame.Rect) -> pygame.Rect:
+        ox, oy = self.offset
+        return rect.move(-ox, -oy)
+
+    def screen_to_world(self, rect: pygame.Rect) -> pygame.Rect:
+        ox, oy = self.offset
+        return rect.move(ox, oy)
+
+    def cell_rect(self, pos: Tuple[int, int]) -> pygame.Rect:
+        gs = self.grid_size
+        return pygame.Rect(
+            (pos[0] - self.x) * gs, (pos[1] - self.y) * gs, gs, gs
+        )
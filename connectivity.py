@@ -0,0 +1,94 @@
+from array import array
+from collections import deque
+from typing import List, Tuple
+from constants import CellType
+
+Coord = Tuple[int, int]
+
+# Cells that split the maze into regions; doors only ever open.
+BLOCKING = (CellType.WALL, CellType.DOOR)
+
+
+class Connectivity:
+    # Region labels for the open cells, with closed doors as separators,
+    # plus a union-find over the labels. Labelling floods the maze once;
+    # opening a door merges the regions around it in near-constant time,
+    # and "can A reach B" is two finds.
+    def __init__(self, maze: List[List]):
+        self.maze = maze
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.label = array("i", [-1]) * (self.width * self.height)
+        self.parent = array("i")
+        self.rank = bytearray()
+        self._flood_all()
+
+    def _new_label(self) -> int:
+        self.parent.append(len(self.parent))
+        self.rank.append(0)
+        return len(self.parent) - 1
+
+    def _flood_all(self):
+        w, h = self.width, self.height
+        maze, label = self.maze, self.label
+        for y in range(h):
+            for x in range(w):
+                if label[y * w + x] >= 0 or maze[y][x] in BLOCKING:
+                    continue
+                region = self._new_label()
+                label[y * w + x] = region
+                q = deque([(x, y)])
+                while q:
+                    cx, cy = q.popleft()
+                    for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                        nx, ny = cx + dx, cy + dy
+                        if not (0 <= nx < w and 0 <= ny < h):
+                            continue
+                        i = ny * w + nx
+                        if label[i] >= 0 or maze[ny][nx] in BLOCKING:
+                            continue
+                        label[i] = region
+                        q.append((nx, ny))
+
+    def _find(self, region: int) -> int:
+        parent = self.parent
+        root = region
+        while parent[root] != root:
+            root = parent[root]
+        while parent[region] != root:
+            parent[region], region = root, parent[region]
+        return root
+
+    def _union(self, a: int, b: int):
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+
+    def region(self, pos: Coord) -> int:
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        region = self.label[y * self.width + x]
+        return self._find(region) if region >= 0 else -1
+
+    def connected(self, a: Coord, b: Coord) -> bool:
+        ra = self.region(a)
+        return ra >= 0 and ra == self.region(b)
+
+    # A door at pos became a path: it joins the regions around it.
+    def open(self, pos: Coord):
+        x, y = pos
+        w = self.width
+        i = y * w + x
+        if self.label[i] < 0:
+            self.label[i] = self._new_label()
+        for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+            if 0 <= nx < w and 0 <= ny < self.height:
+                j = ny * w + nx
+                if self.label[j] >= 0:
+                    self._union(self.label[i], self.label[j])
@@ -13,8 +13,12 @@ GRID_SIZE = 32
 MAZE_WIDTH = 25
 MAZE_HEIGHT = 25
 
-WINDOW_WIDTH = MAZE_WIDTH * GRID_SIZE
-WINDOW_HEIGHT = MAZE_HEIGHT * GRID_SIZE
+# Visible tiles; the camera scrolls over mazes larger than this.
+VIEW_WIDTH = 25
+VIEW_HEIGHT = 25
+
+WINDOW_WIDTH = VIEW_WIDTH * GRID_SIZE
+WINDOW_HEIGHT = VIEW_HEIGHT * GRID_SIZE
 
 
 class CellType(Enum):
@@ -58,11 +62,27 @@ COLORS = {
     "path_dim": (20, 40, 80),
     "wall_dim": (30, 30, 30),
     "exit_dim": (20, 100, 20),
+    "trap": (170, 40, 40),
     "trap_dim": (100, 20, 20),
 }
 
 
 FOV_RADIUS = 6
+# Farthest Manhattan distance at which a skeleton can notice the player.
+PERCEPTION_RADIUS = 5
+# Skeletons farther than this (Manhattan) and out of the player's sight run
+# at low detail: patrols follow a cached loop, other states tick every
+# AI_LOD_INTERVAL_MS.
+AI_FULL_RADIUS = 12
+AI_LOD_INTERVAL_MS = 400
+# Maze distance at which a skeleton hears a sound of loudness 1, and the
+# loudness of what the player does (sneaking makes footsteps silent).
+HEAR_RADIUS = 6
+# Extra steps a skeleton or the pig will walk to avoid stepping on a trap.
+TRAP_AVOID_COST = 4
+NOISE_FOOTSTEP = 1.0
+NOISE_POTION = 1.5
+NOISE_FIGHT = 2.0
 ENEMY_SPEED = 0.5
 
 
@@ -77,6 +97,10 @@ ARTIFACT_HP_HEAL = 20
 
 FPS = 60
 
+# Fixed simulation rate, and how many missed ticks one frame may catch up.
+TICK_RATE = 120
+MAX_CATCHUP_TICKS = 10
+
 EXIT_ARTIFACT_REQUIREMENT = 0
 
 ENEMY_KILL_DAMAGE = 100
@@ -0,0 +1,95 @@
+from array import array
+from typing import Callable, Dict, List, Tuple
+from constants import CellType, DIRECTIONS, TRAP_DAMAGE
+from pathfinding import dijkstra_path
+from projectiles import WallDistances
+
+Coord = Tuple[int, int]
+
+# Danger of entering a cell, in rough hit points.
+LANE_ARMED = 20
+LANE_COOLING = 5
+THORN_DANGER = 10
+
+
+class DangerMap:
+    # Per-cell danger as one flat cost array that searches add to the step
+    # cost: traps, thorns, and the four straight fire lanes of every witch,
+    # which weigh more while the witch's fireball is off cooldown. It is
+    # only touched when something changes (a witch fires or re-arms, thorns
+    # appear or expire, a door opens), never rebuilt per tick.
+    def __init__(self, maze: List[List], walls: WallDistances, witches: List):
+        self.maze = maze
+        self.walls = walls
+        self.width = walls.width
+        self.height = walls.height
+        self.cost = array("H", bytes(2 * self.width * self.height))
+        for y, row in enumerate(maze):
+            for x, cell in enumerate(row):
+                if cell == CellType.TRAP:
+                    self.cost[y * self.width + x] += TRAP_DAMAGE
+        self.lanes: Dict[int, List[int]] = {}
+        self.lane_danger: Dict[int, int] = {}
+        for witch in witches:
+            self._set_lanes(witch, LANE_ARMED)
+
+    # Cells a fireball from the witch would cross, in all four directions.
+    def _lane_cells(self, witch) -> List[int]:
+        walls = self.walls
+        cells = []
+        for d, (dx, dy) in enumerate(DIRECTIONS):
+            x, y = witch.x, witch.y
+            left = walls.ahead_of(x, y, d)
+            while True:
+                if left == 0:
+                    # Re-check in case a door on the lane has opened.
+                    if walls.blocked(x + dx, y + dy):
+                        break
+                    left = walls.ahead_of(x + dx, y + dy, d) + 1
+                x += dx
+                y += dy
+                left -= 1
+                cells.append(y * self.width + x)
+        return cells
+
+    def _set_lanes(self, witch, danger: int):
+        key = id(witch)
+        cost = self.cost
+        old = self.lane_danger.get(key, 0)
+        for i in self.lanes.get(key, ()):
+            cost[i] -= old
+        cells = self._lane_cells(witch)
+        for i in cells:
+            cost[i] += danger
+        self.lanes[key] = cells
+        self.lane_danger[key] = danger
+
+    def witch_fired(self, witch):
+        self._set_lanes(witch, LANE_COOLING)
+
+    def witch_ready(self, witch):
+        self._set_lanes(witch, LANE_ARMED)
+
+    def add_thorns(self, positions: List[Coord]):
+        for x, y in positions:
+            self.cost[y * self.width + x] += THORN_DANGER
+
+    def remove_thorns(self, cells: List[int]):
+        for i in cells:
+            self.cost[i] -= THORN_DANGER
+
+    # Lanes may extend through an opened door.
+    def open_door(self, witches: List):
+        for witch in witches:
+            self._set_lanes(witch, self.lane_danger.get(id(witch), LANE_ARMED))
+
+    def danger(self, pos: Coord) -> int:
+        return self.cost[pos[1] * self.width + pos[0]]
+
+    # Path minimising steps plus danger, as one weighted search.
+    def safest_path(
+        self, start: Coord, goal: Coord, is_blocked: Callable[[Coord], bool]
+    ) -> List[Coord]:
+        return dijkstra_path(
+            start, goal, self.width, self.height, is_blocked, self.cost
+        )
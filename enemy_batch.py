@@ -0,0 +1,117 @@
+from array import array
+from typing import List, Optional, Tuple
+
+from constants import GRID_SIZE
+from game_entities import Enemy
+
+STATES = ("PATROL", "ALERT", "COOLDOWN", "RETURN", "CHASE")
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+
+# Columns holding the per-tick enemy state, with their array typecodes.
+# Positions stay on the Enemy objects, which the spatial hash and the
+# renderer read every tick.
+COLUMNS = (
+    ("health", "i"),
+    ("states", "b"),
+    ("retreat", "i"),
+    ("stun_until", "q"),
+    ("last_move", "q"),
+    ("alert_until", "q"),
+    ("return_at", "q"),
+)
+
+
+def _column(name: str):
+    def get(self):
+        return getattr(self.batch, name)[self.slot]
+
+    def set(self, value):
+        getattr(self.batch, name)[self.slot] = value
+
+    return property(get, set)
+
+
+class BatchedEnemy(Enemy):
+    # Enemy whose AI state lives in a row of an EnemyBatch. The object is a
+    # view kept for rendering, the spatial hash and contact handling; the
+    # regular Enemy methods work on it unchanged.
+    health = _column("health")
+    retreat_steps = _column("retreat")
+    stun_until_ms = _column("stun_until")
+    last_move_ms = _column("last_move")
+    alert_until_ms = _column("alert_until")
+    return_at_ms = _column("return_at")
+
+    def __init__(
+        self,
+        batch: "EnemyBatch",
+        start_pos: Tuple[int, int],
+        grid_size: int = GRID_SIZE,
+    ):
+        self.batch = batch
+        self.slot = batch.add_row()
+        super().__init__(start_pos, grid_size)
+
+    @property
+    def state(self) -> str:
+        return STATES[self.batch.states[self.slot]]
+
+    @state.setter
+    def state(self, value: str):
+        self.batch.states[self.slot] = STATE_CODES[value]
+
+
+class EnemyBatch:
+    # Skeleton AI run a pass at a time over the rows ticking this frame:
+    # perception, then state transitions, then movement, each through the
+    # same Enemy methods as a per-object update. Within a tick skeletons
+    # only share the RNG (drawn in transitions) and the path caches (used
+    # in movement), and every pass runs in enemy order, so the outcome is
+    # the same as calling Enemy.update on each in turn.
+    def __init__(self):
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def add_row(self) -> int:
+        for name, _ in COLUMNS:
+            getattr(self, name).append(0)
+        return len(self.health) - 1
+
+    def spawn(self, pos: Tuple[int, int]) -> BatchedEnemy:
+        return BatchedEnemy(self, pos)
+
+    # Enemy.update for the given (enemy, distance-to-player) rows.
+    def update(
+        self,
+        rows: List[Tuple[BatchedEnemy, Optional[float]]],
+        player,
+        maze,
+        elements,
+        now_ms: int,
+        sneaking: bool = False,
+        noise=None,
+    ):
+        health, stun_until, retreat = self.health, self.stun_until, self.retreat
+
+        # Perception: the tick gate of Enemy.perceive read off the columns,
+        # then each awake row's senses.
+        active = []
+        for enemy, dist in rows:
+            s = enemy.slot
+            if health[s] <= 0 or now_ms < stun_until[s]:
+                continue
+            if retreat[s] > 0:
+                retreat[s] -= 1
+                continue
+            active.append(
+                (enemy, enemy.sense(player, maze, sneaking, dist, noise))
+            )
+
+        moves = []
+        for enemy, senses in active:
+            move = enemy.transition(player, maze, elements, now_ms, *senses)
+            if move is not None:
+                moves.append((enemy, move))
+
+        for enemy, move in moves:
+            enemy.move(move, player, maze, elements)
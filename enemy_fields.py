@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from constants import AI_FULL_RADIUS
+from pathfinding import FlowField
+
+# Cells of target fields kept in the LRU (4 bytes each); on a 25x25 level
+# that is a field for every open cell.
+FIELD_CELL_BUDGET = 1 << 18
+
+
+class EnemyFields:
+    # Distance fields shared by every skeleton on a level, so walking a
+    # leg reads a field instead of searching the maze on each move.
+    # Chasers share one field flooded from the player each time the player
+    # moves, bounded to AI_FULL_RADIUS; walks to a spawn, waypoint or heard
+    # cell share an LRU of fields per target. Opening a door drops them all.
+    def __init__(self):
+        self.field: Optional[FlowField] = None
+        self.field_key = None
+        self.fields: "OrderedDict[Tuple[int, int], FlowField]" = OrderedDict()
+        self.doors_opened = 0
+
+    def open_door(self):
+        self.doors_opened += 1
+        self.fields.clear()
+
+    def player_field(self, enemy, player, maze, elements) -> FlowField:
+        key = (player.x, player.y, self.doors_opened)
+        if self.field_key != key:
+            self.field = FlowField(
+                [(player.x, player.y)],
+                len(maze[0]),
+                len(maze),
+                enemy._build_is_blocked(maze, elements),
+                max_dist=AI_FULL_RADIUS,
+                layers=enemy.cost_layers,
+            )
+            self.field_key = key
+        return self.field
+
+    def target_field(
+        self, enemy, target: Tuple[int, int], maze, elements
+    ) -> FlowField:
+        field = self.fields.get(target)
+        if field is not None:
+            self.fields.move_to_end(target)
+            return field
+        width, height = len(maze[0]), len(maze)
+        field = FlowField(
+            [target],
+            width,
+            height,
+            enemy._build_is_blocked(maze, elements),
+            layers=enemy.cost_layers,
+        )
+        self.fields[target] = field
+        while len(self.fields) > max(1, FIELD_CELL_BUDGET // (width * height)):
+            self.fields.popitem(last=False)
+        return field
@@ -0,0 +1,75 @@
+import time
+from typing import Callable, Optional
+from constants import TICK_RATE, MAX_CATCHUP_TICKS
+
+
+class FixedStepClock:
+    # Simulated monotonic clock advanced in fixed ticks. Simulation time is
+    # tick * 1000 / rate ms, so gameplay no longer depends on the render
+    # frame rate or on hitches. Wall time only decides how many ticks are
+    # owed; when more than max_catchup are owed the backlog is dropped.
+    def __init__(
+        self,
+        rate: int = TICK_RATE,
+        max_catchup: int = MAX_CATCHUP_TICKS,
+        max_speed: bool = False,
+        wall: Callable[[], float] = time.perf_counter,
+    ):
+        self.rate = rate
+        self.max_catchup = max_catchup
+        self.max_speed = max_speed
+        self.wall = wall
+        self.tick = 0
+        self.accumulator = 0.0
+        self.dropped = 0
+        self._last_wall = None
+
+    def __call__(self) -> int:
+        return self.tick * 1000 // self.rate
+
+    @property
+    def now_ms(self) -> int:
+        return self()
+
+    # Blend factor between the last two ticks, for render interpolation.
+    @property
+    def alpha(self) -> float:
+        if self.max_speed:
+            return 1.0
+        return min(1.0, self.accumulator * self.rate)
+
+    # Sim time to draw at: the last tick plus the elapsed part of the next.
+    @property
+    def render_ms(self) -> float:
+        return (self.tick + self.alpha) * 1000 / self.rate
+
+    # Ticks owed for the wall time elapsed since the previous call.
+    def due(self) -> int:
+        if self.max_speed:
+            return self.max_catchup
+        now = self.wall()
+        if self._last_wall is None:
+            self._last_wall = now
+            return 0
+        self.accumulator += now - self._last_wall
+        self._last_wall = now
+
+        steps = int(self.accumulator * self.rate)
+        if steps > self.max_catchup:
+            self.dropped += steps - self.max_catchup
+            self.accumulator = 0.0
+            return self.max_catchup
+        self.accumulator -= steps / self.rate
+        return steps
+
+    # Run step() once per owed tick (or exactly `ticks` times); stops early
+    # and returns the first non-None status.
+    def run(
+        self, step: Callable[[], Optional[str]], ticks: int = None
+    ) -> Optional[str]:
+        for _ in range(self.due() if ticks is None else ticks):
+            self.tick += 1
+            status = step()
+            if status:
+                return status
+        return None
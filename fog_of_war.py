@@ -1,35 +1,114 @@
 import math
-import pygame
-from typing import List, Tuple, Dict, Set
-from constants import CellType, COLORS, GRID_SIZE, FOV_RADIUS
+from typing import List, Tuple
+from constants import CellType, COLORS, FOV_RADIUS
+
+
+# Byte translations between the 0/1 cell grids and ASCII bit digits.
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _circle_stamp(radius: int) -> List[Tuple[int, int]]:
+    # Half-width of the circle for every row offset, so a stamp row is one slice.
+    return [
+        (dy, math.isqrt(radius * radius - dy * dy)) for dy in range(-radius, radius + 1)
+    ]
+
 
 class FogOfWar:
-    def __init__(self, width, height, grid_size):
+    def __init__(self, width, height, grid_size, radius: int = FOV_RADIUS):
         self.width = width
         self.height = height
         self.grid_size = grid_size
-        self.visible = set()
-        self.explored = set()
-
-    def update(self, player_pos: Tuple[int, int]):
+        self.radius = radius
+        # One byte per cell in row-major order: 1 = set, 0 = unset.
+        self.visible = bytearray(width * height)
+        self.explored = bytearray(width * height)
+        self._stamp = _circle_stamp(radius)
+        self._ones = b"\x01" * (2 * radius + 1)
+        self._zeros = bytes(2 * radius + 1)
+        self._spans: List[Tuple[int, int]] = []
+        self._dirty_spans: List[Tuple[int, int]] = []
+        self._last_pos = None
+
+    def update(self, player_pos: Tuple[int, int]) -> bool:
+        if player_pos == self._last_pos:
+            return False
+        self._last_pos = player_pos
         px, py = player_pos
-        self.visible.clear()
-
-        for y in range(max(0, py - FOV_RADIUS), min(self.height, py + FOV_RADIUS + 1)):
-            for x in range(
-                max(0, px - FOV_RADIUS), min(self.width, px + FOV_RADIUS + 1)
-            ):
-                distance = math.sqrt((x - px) ** 2 + (y - py) ** 2)
-
-                if distance <= FOV_RADIUS:
-                    self.visible.add((x, y))
-                    self.explored.add((x, y))
+        visible = self.visible
+        explored = self.explored
+        ones = self._ones
+
+        for start, end in self._spans:
+            visible[start:end] = self._zeros[: end - start]
+        self._dirty_spans.extend(self._spans)
+
+        spans = []
+        for dy, half in self._stamp:
+            y = py + dy
+            if not 0 <= y < self.height:
+                continue
+            x0 = max(0, px - half)
+            x1 = min(self.width, px + half + 1)
+            if x0 >= x1:
+                continue
+            start = y * self.width + x0
+            end = y * self.width + x1
+            visible[start:end] = ones[: end - start]
+            explored[start:end] = ones[: end - start]
+            spans.append((start, end))
+        self._spans = spans
+        self._dirty_spans.extend(spans)
+        if len(self._dirty_spans) > 8 * len(self._stamp):
+            # Nobody has been consuming; collapse to a single full-map span.
+            self._dirty_spans = [(0, self.width * self.height)]
+        return True
+
+    # Index ranges whose visibility may have changed since the last call.
+    def consume_dirty_spans(self) -> List[Tuple[int, int]]:
+        spans = self._dirty_spans
+        self._dirty_spans = []
+        return spans
+
+    def _index(self, pos: Tuple[int, int]) -> int:
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
 
     def is_visible(self, pos: Tuple[int, int]) -> bool:
-        return pos in self.visible
+        i = self._index(pos)
+        return i >= 0 and self.visible[i] == 1
 
     def is_explored(self, pos: Tuple[int, int]) -> bool:
-        return pos in self.explored
+        i = self._index(pos)
+        return i >= 0 and self.explored[i] == 1
+
+    # Zero-copy views for pygame.image.frombuffer(..., "P") and similar consumers.
+    def visible_buffer(self) -> memoryview:
+        return memoryview(self.visible)
+
+    def explored_buffer(self) -> memoryview:
+        return memoryview(self.explored)
+
+    # Explored cells as packed bits, cell i in bit i (little-endian), for
+    # saves. The grid goes through one big integer rather than a loop per
+    # cell.
+    def pack_explored(self) -> bytes:
+        digits = self.explored.translate(_TO_DIGITS)[::-1]
+        return int(digits, 2).to_bytes((len(self.explored) + 7) // 8, "little")
+
+    # Merge packed bits from pack_explored into the explored grid; bits past
+    # the end of the grid are ignored.
+    def unpack_explored(self, data: bytes):
+        n = len(self.explored)
+        bits = int.from_bytes(data, "little") & ((1 << n) - 1)
+        cells = format(bits, f"0{n}b")[::-1].encode("ascii").translate(_FROM_DIGITS)
+        merged = int.from_bytes(self.explored, "little") | int.from_bytes(
+            cells, "little"
+        )
+        self.explored[:] = merged.to_bytes(n, "little")
 
     def get_cell_color(
         self, maze: List[List], pos: Tuple[int, int]
@@ -63,36 +142,3 @@ class FogOfWar:
                 return COLORS["trap_dim"]
 
         return COLORS["unknown"]
-
-    def render(
-        self,
-        screen: pygame.Surface,
-        maze: List[List],
-        grid_size: int = GRID_SIZE,
-        sprites: Dict = None,
-    ):
-
-        for y in range(self.height):
-            for x in range(self.width):
-                rect = pygame.Rect(x * grid_size, y * grid_size, grid_size, grid_size)
-                cell_type = maze[y][x]
-
-                if not (self.is_visible((x, y)) or self.is_explored((x, y))):
-                    pygame.draw.rect(screen, COLORS["unknown"], rect)
-                    continue
-
-                if self.is_visible((x, y)) and sprites:
-                    sprite_map = {
-                        CellType.WALL: "wall",
-                        CellType.PATH: "path",
-                        CellType.EXIT: "exit",
-                        CellType.TRAP: "trap",
-                    }
-                    sprite_key = sprite_map.get(cell_type)
-                    sprite = sprites.get(sprite_key) if sprite_key else None
-                    if sprite:
-                        screen.blit(sprite, rect)
-                        continue
-
-                color = self.get_cell_color(maze, (x, y))
-                pygame.draw.rect(screen, color, rect)
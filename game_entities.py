@@ -1,11 +1,11 @@
 import pygame
 import math
 import random
-import time
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 
 from base_entity import Entity
-from pathfinding import bfs_shortest_path
+from pathfinding import FlowField, weighted_path
+from patrol_routes import PatrolRoutes
 
 from constants import (
     COLORS,
@@ -14,9 +14,15 @@ from constants import (
     TRAP_DAMAGE,
     ENEMY_DAMAGE,
     MOVEMENT_DELAY,
+    PERCEPTION_RADIUS,
+    HEAR_RADIUS,
     CellType,
 )
 
+# Moves Enemy.transition grants: a patrol step along a route, a step toward
+# a fixed cell, or a step of the chase.
+MOVE_PATROL, MOVE_TOWARD, MOVE_CHASE = range(3)
+
 
 class Player(Entity):
 
@@ -46,7 +52,7 @@ class Player(Entity):
         self.collected_coins = 0
         self.potions = 0
         self.armor_hits = 0
-        self.invuln_until = 0.0
+        self.invuln_until_ms = 0
         self.sneaking = False
         self.shield_unlocked = False
         self.shield_blocking = False
@@ -54,7 +60,9 @@ class Player(Entity):
         self.burn_ticks = 0
         self.burn_next_ms = 0
 
-    def move(self, dx: int, dy: int, maze: List[List], elements: dict) -> bool:
+    def move(
+        self, dx: int, dy: int, maze: List[List], elements: dict, now_ms: int
+    ) -> bool:
 
         nx, ny = self.x + dx, self.y + dy
 
@@ -118,21 +126,20 @@ class Player(Entity):
             elements["artifacts"].remove((self.x, self.y))
 
         if maze[self.y][self.x] == CellType.TRAP:
-            self.take_damage(TRAP_DAMAGE)
+            self.take_damage(TRAP_DAMAGE, now_ms)
 
         return True
 
-    def take_damage(self, damage: int):
+    def take_damage(self, damage: int, now_ms: int):
 
-        now = time.time()
-        if now < self.invuln_until:
+        if now_ms < self.invuln_until_ms:
             return
 
         final_damage = damage
         if self.armor_hits > 0:
             final_damage = max(1, int(damage * 0.7))
             self.armor_hits -= 1
-            self.invuln_until = now + 1.5
+            self.invuln_until_ms = now_ms + 1500
 
         self.health -= final_damage
         if self.sound_manager:
@@ -196,13 +203,13 @@ class Player(Entity):
     def update(self, *args, **kwargs):
         pass
 
-    def render(self, screen: pygame.Surface):
+    def render(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)):
+        rect = self.get_rect().move(-offset[0], -offset[1])
         if self.sprite:
-            rect = self.get_rect()
             screen.blit(self.sprite, rect)
 
         else:
-            pygame.draw.rect(screen, self.color, self.get_rect())
+            pygame.draw.rect(screen, self.color, rect)
 
 
 class Enemy(Entity):
@@ -217,19 +224,43 @@ class Enemy(Entity):
         self.health = 100
         self.attack_cooldown = 0
         self.retreat_steps = 0
+        # Random source for AI decisions; the simulation passes its own.
+        self.rng = random
         self.state = "PATROL"
         self.alert_timer = 0
         self.stun_until_ms = 0
         self.last_heard_pos = None
         self.alert_until_ms = 0
         self.return_at_ms = 0
-        self.hear_radius = 6
-        self.last_move_ms = 0
+        self.hear_radius = HEAR_RADIUS
         self.move_delay_patrol = 260
         self.move_delay_alert = 220
         self.move_delay_chase = 180
-        self.patrol_path = []
-        self.patrol_index = 0
+        # Timestamps start one cooldown in the past so the sim clock can start at 0.
+        self.last_move_ms = -self.move_delay_patrol
+        # Shared PatrolRoutes (set by the simulation) and the position on ours.
+        self.routes = None
+        # Extra per-cell path costs, as pathfinding cost layers.
+        self.cost_layers = ()
+        # Region index used to skip searches for unreachable targets.
+        self.connectivity = None
+        # Planner backend (see pathfinding.PLANNERS); None searches the grid
+        # directly. `plan` is the path being walked toward a target.
+        self.planner = None
+        self.plan = None
+        # EnemyFields shared by the level's skeletons; walks read distance
+        # fields from it instead of searching. Ignored with a planner.
+        self.fields = None
+        self.patrol_loop: List[Tuple[int, int]] = []
+        self.loop_index = 0
+
+    @property
+    def move_ms(self) -> int:
+        if self.state == "CHASE":
+            return self.move_delay_chase
+        if self.state == "ALERT":
+            return self.move_delay_alert
+        return self.move_delay_patrol
 
     def _locked_doors_as_blocked(self, elements: dict) -> Set[Tuple[int, int]]:
         blocked = set()
@@ -238,39 +269,56 @@ class Enemy(Entity):
                 blocked.add(tuple(door["pos"]))
         return blocked
 
-    def _can_move(self, delay_ms: int) -> bool:
-        now = pygame.time.get_ticks()
-        if now - self.last_move_ms < delay_ms:
+    def _can_move(self, delay_ms: int, now_ms: int) -> bool:
+        if now_ms - self.last_move_ms < delay_ms:
             return False
-        self.last_move_ms = now
+        self.last_move_ms = now_ms
         return True
 
-    def _build_patrol_path(self, maze: List[List]):
-        cx, cy = self.spawn_pos
-        radius = 2
-        path = []
-
-        for x in range(cx - radius, cx + radius + 1):
-            path.append((x, cy - radius))
-        for y in range(cy - radius + 1, cy + radius + 1):
-            path.append((cx + radius, y))
-        for x in range(cx + radius - 1, cx - radius - 1, -1):
-            path.append((x, cy + radius))
-        for y in range(cy + radius - 1, cy - radius, -1):
-            path.append((cx - radius, y))
-
-        valid = []
-        w = len(maze[0])
-        h = len(maze)
-        for x, y in path:
-            if 0 <= x < w and 0 <= y < h and maze[y][x] == CellType.PATH:
-                valid.append((x, y))
-
-        if not valid:
-            valid = [self.spawn_pos]
-
-        self.patrol_path = valid
-        self.patrol_index = 0
+    def _patrol_route(
+        self, maze: List[List], elements: dict
+    ) -> List[Tuple[int, int]]:
+        if self.routes is None:
+            self.routes = PatrolRoutes(maze, elements)
+        route = self.routes.route(self.spawn_pos)
+        if route is not self.patrol_loop:
+            # New or recompiled route: head for its first waypoint.
+            self.patrol_loop = route
+            self.loop_index = len(route) - 1
+        return route
+
+    # Advance one cell along the patrol route; off the route (after a
+    # chase or return) walk back to the current waypoint first.
+    def _patrol_step(
+        self, route: List[Tuple[int, int]], maze: List[List], elements: dict
+    ):
+        pos = (self.x, self.y)
+        if route[self.loop_index] != pos:
+            if pos not in route:
+                if not self._step_toward(route[self.loop_index], maze, elements):
+                    self.loop_index = (self.loop_index + 1) % len(route)
+                return
+            self.loop_index = route.index(pos)
+        self.loop_index = (self.loop_index + 1) % len(route)
+        self.x, self.y = route[self.loop_index]
+
+    # Low-detail patrol for distant enemies. Returns False when the enemy is
+    # not patrolling on its route and needs a full update instead.
+    def update_coarse(self, maze: List[List], elements: dict, now_ms: int) -> bool:
+        if (
+            self.state != "PATROL"
+            or self.retreat_steps > 0
+            or now_ms < self.stun_until_ms
+            or self.health <= 0
+        ):
+            return False
+        route = self._patrol_route(maze, elements)
+        pos = (self.x, self.y)
+        if route[self.loop_index] != pos and pos not in route:
+            return False
+        if self._can_move(self.move_delay_patrol, now_ms):
+            self._patrol_step(route, maze, elements)
+        return True
 
     def _find_path_to_target(
         self, target: Tuple[int, int], maze: List[List], elements: dict
@@ -295,8 +343,17 @@ class Enemy(Entity):
         width: int = None,
         height: int = None,
     ) -> List[Tuple[int, int]]:
+        pos = (self.x, self.y)
+        if self.connectivity is not None:
+            targets = [t for t in targets if self.connectivity.connected(pos, t)]
         if not targets:
             return []
+        if self.planner is not None:
+            plans = [self.planner.plan(pos, target) for target in targets]
+            plans = [plan for plan in plans if plan is not None]
+            if not plans:
+                return []
+            return min(plans, key=lambda plan: plan.cost).remaining()
         if is_blocked is None:
             is_blocked = self._build_is_blocked(maze, elements)
         if width is None or height is None:
@@ -304,8 +361,8 @@ class Enemy(Entity):
             height = len(maze)
         best_path: List[Tuple[int, int]] = []
         for target in targets:
-            path = bfs_shortest_path(
-                (self.x, self.y), target, width, height, is_blocked
+            path = weighted_path(
+                (self.x, self.y), target, width, height, is_blocked, self.cost_layers
             )
             if path and (not best_path or len(path) < len(best_path)):
                 best_path = path
@@ -314,6 +371,10 @@ class Enemy(Entity):
     def _step_toward(
         self, target: Tuple[int, int], maze: List[List], elements: dict
     ) -> bool:
+        if self.planner is not None:
+            return self._follow_plan(target)
+        if self.fields is not None:
+            return self._follow_field(target, maze, elements)
         path = self._find_path_to_target(target, maze, elements)
         if path:
             nx, ny = path.pop(0)
@@ -322,6 +383,44 @@ class Enemy(Entity):
                 return True
         return False
 
+    # Step along the planned path to target, expanding it a leg at a time.
+    # Re-plan when the target changes, the enemy has been moved off the
+    # path or a door has opened since.
+    def _follow_plan(self, target: Tuple[int, int]) -> bool:
+        pos = (self.x, self.y)
+        plan = self.plan
+        if (
+            plan is None
+            or plan.goal != target
+            or plan.position != pos
+            or plan.version != self.planner.version
+        ):
+            plan = self.plan = None
+            if self.connectivity is None or self.connectivity.connected(pos, target):
+                plan = self.plan = self.planner.plan(pos, target)
+            if plan is None:
+                return False
+        step = plan.next_step()
+        if step is None:
+            return False
+        self.x, self.y = step
+        return True
+
+    # Step downhill on the shared distance field of target.
+    def _follow_field(
+        self, target: Tuple[int, int], maze: List[List], elements: dict
+    ) -> bool:
+        pos = (self.x, self.y)
+        if self.connectivity is not None and not self.connectivity.connected(
+            pos, target
+        ):
+            return False
+        step = self.fields.target_field(self, target, maze, elements).step(pos)
+        if step is None or step == pos:
+            return False
+        self.x, self.y = step
+        return True
+
     def has_line_of_sight(self, player, maze) -> bool:
 
         if self.x == player.x:
@@ -353,6 +452,12 @@ class Enemy(Entity):
     def find_path_to_player(
         self, player: "Player", maze: List[List], elements: dict
     ) -> List[Tuple[int, int]]:
+        if self.fields is not None and self.planner is None:
+            # Read off the shared field from the player; beyond its radius
+            # fall back to a search.
+            field = self.fields.player_field(self, player, maze, elements)
+            if field.distance((self.x, self.y)) >= 0:
+                return field.path((self.x, self.y))[:-1]
         is_blocked = self._build_is_blocked(maze, elements)
         width = len(maze[0])
         height = len(maze)
@@ -368,54 +473,107 @@ class Enemy(Entity):
             targets, maze, elements, is_blocked=is_blocked, width=width, height=height
         )
 
-    def update(self, player, maze, elements, sneaking: bool = False):
-        if self.health <= 0:
+    # `dist` may be passed in from a spatial query; beyond PERCEPTION_RADIUS
+    # line of sight is not traced since no transition can depend on it.
+    # With a NoiseMap the enemy is alerted by sounds that reach it through
+    # the maze; without one, by an unseen, non-sneaking player within
+    # PERCEPTION_RADIUS. A tick is split into perceive, transition and
+    # move so that EnemyBatch can run each as a pass over many enemies.
+    def update(
+        self,
+        player,
+        maze,
+        elements,
+        now_ms: int,
+        sneaking: bool = False,
+        dist: float = None,
+        noise=None,
+    ):
+        senses = self.perceive(player, maze, now_ms, sneaking, dist, noise)
+        if senses is None:
             return
+        move = self.transition(player, maze, elements, now_ms, *senses)
+        if move is not None:
+            self.move(move, player, maze, elements)
 
-        now = pygame.time.get_ticks()
-        if now < self.stun_until_ms:
-            return
+    # Start of a tick: None while dead, stunned or retreating (using up a
+    # retreat step), else (dist, chase_condition, alert_condition).
+    def perceive(
+        self,
+        player,
+        maze,
+        now_ms: int,
+        sneaking: bool = False,
+        dist: float = None,
+        noise=None,
+    ) -> Optional[Tuple[float, bool, bool]]:
+        if self.health <= 0:
+            return None
+
+        if now_ms < self.stun_until_ms:
+            return None
 
         if self.retreat_steps > 0:
 
             self.retreat_steps -= 1
 
-            return
+            return None
 
-        dist = abs(self.x - player.x) + abs(self.y - player.y)
-        sees_player = self.has_line_of_sight(player, maze)
+        return self.sense(player, maze, sneaking, dist, noise)
+
+    def sense(
+        self, player, maze, sneaking: bool = False, dist: float = None, noise=None
+    ) -> Tuple[float, bool, bool]:
+        if dist is None:
+            dist = abs(self.x - player.x) + abs(self.y - player.y)
+        sees_player = dist <= PERCEPTION_RADIUS and self.has_line_of_sight(
+            player, maze
+        )
         chase_condition = sees_player and dist <= 3
-        alert_condition = (not sneaking) and (dist <= 5) and (not sees_player)
-        now = pygame.time.get_ticks()
+        if noise is not None:
+            alert_condition = not sees_player and noise.hears(
+                (self.x, self.y), self.hear_radius
+            )
+        else:
+            alert_condition = (
+                (not sneaking) and (dist <= PERCEPTION_RADIUS) and (not sees_player)
+            )
+        return dist, chase_condition, alert_condition
+
+    # State machine step. Returns the move it granted this tick, as
+    # (MOVE_*, target), or None; move() carries it out.
+    def transition(
+        self,
+        player,
+        maze,
+        elements,
+        now_ms: int,
+        dist: float,
+        chase_condition: bool,
+        alert_condition: bool,
+    ) -> Optional[Tuple[int, object]]:
+        now = now_ms
 
         if self.state == "PATROL":
             if chase_condition:
                 self.state = "CHASE"
-                return
+                return None
 
             if alert_condition:
                 self.state = "ALERT"
                 self.last_heard_pos = (player.x, player.y)
                 self.alert_until_ms = now + 4000
-                return
+                return None
 
-            if not self.patrol_path:
-                self._build_patrol_path(maze)
-
-            if self._can_move(self.move_delay_patrol):
-                target = self.patrol_path[self.patrol_index]
-                if (self.x, self.y) == target:
-                    self.patrol_index = (self.patrol_index + 1) % len(self.patrol_path)
-                    target = self.patrol_path[self.patrol_index]
-                moved = self._step_toward(target, maze, elements)
-                if not moved:
-                    self.patrol_index = (self.patrol_index + 1) % len(self.patrol_path)
-            return
+            route = self._patrol_route(maze, elements)
+            if self._can_move(self.move_delay_patrol, now):
+                return MOVE_PATROL, route
+            return None
 
         if self.state == "ALERT":
             if chase_condition:
                 self.state = "CHASE"
-                return
+                return None
 
             if alert_condition:
                 self.last_heard_pos = (player.x, player.y)
@@ -424,25 +582,25 @@ class Enemy(Entity):
             if now > self.alert_until_ms:
                 self.state = "COOLDOWN"
                 self.return_at_ms = now + 10000
-                return
+                return None
 
-            if self.last_heard_pos and self._can_move(self.move_delay_alert):
-                self._step_toward(self.last_heard_pos, maze, elements)
-            return
+            if self.last_heard_pos and self._can_move(self.move_delay_alert, now):
+                return MOVE_TOWARD, self.last_heard_pos
+            return None
 
         if self.state == "COOLDOWN":
             if now >= self.return_at_ms:
                 self.state = "RETURN"
-            return
+            return None
 
         if self.state == "RETURN":
             if (self.x, self.y) == self.spawn_pos:
                 self.state = "PATROL"
-                self.patrol_path = []
-                return
-            if self._can_move(self.move_delay_patrol):
-                self._step_toward(self.spawn_pos, maze, elements)
-            return
+                self.patrol_loop = []
+                return None
+            if self._can_move(self.move_delay_patrol, now):
+                return MOVE_TOWARD, self.spawn_pos
+            return None
 
         if self.state == "CHASE":
             if not chase_condition:
@@ -453,34 +611,53 @@ class Enemy(Entity):
                 else:
                     self.state = "COOLDOWN"
                     self.return_at_ms = now + 10000
-                return
+                return None
 
             if dist == 1:
-                self.retreat_steps = random.randint(5, 10)
+                self.retreat_steps = self.rng.randint(5, 10)
                 self.state = "PATROL"
-                return
-
-            if self._can_move(self.move_delay_chase):
-                self.path = self.find_path_to_player(player, maze, elements)
-                if self.path:
-                    nx, ny = self.path.pop(0)
-                    if (nx, ny) != (player.x, player.y):
-                        self.x, self.y = nx, ny
+                return None
+
+            if self._can_move(self.move_delay_chase, now):
+                return MOVE_CHASE, None
+        return None
+
+    def move(self, move: Tuple[int, object], player, maze, elements):
+        kind, target = move
+        if kind == MOVE_PATROL:
+            self._patrol_step(target, maze, elements)
+        elif kind == MOVE_TOWARD:
+            self._step_toward(target, maze, elements)
+        else:
+            self.path = self.find_path_to_player(player, maze, elements)
+            if self.path:
+                nx, ny = self.path.pop(0)
+                if (nx, ny) != (player.x, player.y):
+                    self.x, self.y = nx, ny
 
-    def render(self, screen: pygame.Surface):
+    def render(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)):
         if self.sprite:
-            screen.blit(self.sprite, (self.x * self.grid_size, self.y * self.grid_size))
+            screen.blit(
+                self.sprite,
+                (self.x * self.grid_size - offset[0], self.y * self.grid_size - offset[1]),
+            )
         else:
             rect = pygame.Rect(
-                self.x * self.grid_size,
-                self.y * self.grid_size,
+                self.x * self.grid_size - offset[0],
+                self.y * self.grid_size - offset[1],
                 self.grid_size,
                 self.grid_size,
             )
             pygame.draw.rect(screen, self.color, rect)
 
-    def stun(self, duration_ms: int):
-        self.stun_until_ms = pygame.time.get_ticks() + duration_ms
+    def stun(self, duration_ms: int, now_ms: int):
+        self.stun_until_ms = now_ms + duration_ms
+
+    # Time until which update() is a no-op (stunned or cooling down).
+    def idle_until_ms(self) -> int:
+        if self.state == "COOLDOWN":
+            return max(self.stun_until_ms, self.return_at_ms)
+        return self.stun_until_ms
 
 
 class Witch(Entity):
@@ -489,10 +666,10 @@ class Witch(Entity):
         super().__init__(
             start_pos[0], start_pos[1], COLORS["enemy"], grid_size, "sprites/witch.png"
         )
-        self.last_fire_ms = 0
-        self.last_thorns_ms = 0
         self.fire_cooldown_ms = 5000
         self.thorns_cooldown_ms = 3000
+        self.last_fire_ms = -self.fire_cooldown_ms
+        self.last_thorns_ms = -self.thorns_cooldown_ms
         self.thorns_duration_ms = 1000
 
     def update(self, *args, **kwargs):
@@ -514,6 +691,13 @@ class Witch(Entity):
             return (step, 0)
         return (0, 0)
 
+    # Earliest time either attack can trigger again.
+    def next_ready_ms(self) -> int:
+        return min(
+            self.last_fire_ms + self.fire_cooldown_ms,
+            self.last_thorns_ms + self.thorns_cooldown_ms,
+        )
+
     def try_fireball(
         self, player: Player, maze: List[List], now_ms: int, sneaking: bool
     ) -> Tuple[int, int]:
@@ -540,17 +724,20 @@ class Witch(Entity):
         self.last_thorns_ms = now_ms
         return True
 
-    def render(self, screen):
+    def render(self, screen, offset: Tuple[int, int] = (0, 0)):
 
         if self.sprite:
 
-            screen.blit(self.sprite, (self.x * self.grid_size, self.y * self.grid_size))
+            screen.blit(
+                self.sprite,
+                (self.x * self.grid_size - offset[0], self.y * self.grid_size - offset[1]),
+            )
 
         else:
 
             rect = pygame.Rect(
-                self.x * self.grid_size,
-                self.y * self.grid_size,
+                self.x * self.grid_size - offset[0],
+                self.y * self.grid_size - offset[1],
                 self.grid_size,
                 self.grid_size,
             )
@@ -567,93 +754,123 @@ class Pig(Entity):
         self.state = "follow"
         self.follow_target = start_pos
         self.target_coin = None
-        self.last_move_time = 0
+        self.fetch_coins: List[Tuple[int, int]] = []
         self.move_delay = 200
+        self.last_move_time = -self.move_delay
         self.last_status = None
+        # Flow field toward the current target(s); rebuilt only when they
+        # change or a door opens.
+        self.field = None
+        self.cost_layers = ()
+        self.connectivity = None
+
+    @property
+    def move_ms(self) -> int:
+        return self.move_delay
 
     def set_follow_target(self, pos: Tuple[int, int]):
         self.follow_target = pos
 
+    # Fetch whichever of the coins is nearest through the maze.
     def command_fetch(self, coin_positions: List[Tuple[int, int]]) -> bool:
         if self.state != "follow":
             return False
         if not coin_positions:
             return False
-        best = min(
-            coin_positions, key=lambda p: abs(p[0] - self.x) + abs(p[1] - self.y)
-        )
-        self.target_coin = best
+        self.fetch_coins = list(coin_positions)
+        self.target_coin = None
         self.state = "fetch"
         return True
 
-    def _next_step(self, maze: List[List], target: Tuple[int, int]) -> Tuple[int, int]:
-        blocked = {CellType.WALL, CellType.DOOR}
-        width = len(maze[0])
-        height = len(maze)
+    def invalidate_paths(self):
+        self.field = None
+        self.target_coin = None
 
-        def is_blocked(pos: Tuple[int, int]) -> bool:
-            x, y = pos
-            return maze[y][x] in blocked
-
-        path = bfs_shortest_path(
-            (self.x, self.y),
-            target,
-            width,
-            height,
-            is_blocked,
-            allow_goal_blocked=True,
-        )
-        if path:
-            return path[0]
-        return (self.x, self.y)
+    def _flow(self, maze: List[List], sources: List[Tuple[int, int]]) -> FlowField:
+        pos = (self.x, self.y)
+        field = self.field
+        if field is None or field.sources != sources or field.distance(pos) < 0:
+            blocked = {CellType.WALL, CellType.DOOR}
+
+            def is_blocked(p: Tuple[int, int]) -> bool:
+                return maze[p[1]][p[0]] in blocked
+
+            field = FlowField(
+                sources,
+                len(maze[0]),
+                len(maze),
+                is_blocked,
+                stop=pos,
+                layers=self.cost_layers,
+            )
+            self.field = field
+        return field
 
-    def update(self, player: Player, maze: List[List], elements: dict):
-        now = pygame.time.get_ticks()
-        if now - self.last_move_time < self.move_delay:
+    def _next_step(
+        self, maze: List[List], sources: List[Tuple[int, int]]
+    ) -> Tuple[int, int]:
+        step = self._flow(maze, sources).step((self.x, self.y))
+        return step or (self.x, self.y)
+
+    def update(self, player: Player, maze: List[List], elements: dict, now_ms: int):
+        if now_ms - self.last_move_time < self.move_delay:
             return None
 
-        self.last_move_time = now
+        self.last_move_time = now_ms
         self.last_status = None
+        pos = (self.x, self.y)
+
+        if self.state == "fetch":
+            coins = elements.get("coins", [])
+            sources = [c for c in self.fetch_coins if c in coins]
+            if self.connectivity is not None:
+                sources = [c for c in sources if self.connectivity.connected(pos, c)]
+            field = self._flow(maze, sources) if sources else None
+            if field is None or field.distance(pos) < 0:
+                self.state = "follow"
+                self.fetch_coins = []
+                self.target_coin = None
+                self.last_status = "no_path"
+                return self.last_status
+            if field.distance(pos) == 0:
+                coins.remove(pos)
+                self.fetch_coins = []
+                self.target_coin = pos
+                self.state = "return"
+                return None
+            if self.target_coin not in sources:
+                self.target_coin = field.descend(pos)
+            self.x, self.y = field.step(pos)
+            return None
 
         if self.state == "follow":
             target = self.follow_target
-        elif self.state == "fetch":
-            target = self.target_coin
         else:
             target = (player.x, player.y)
 
         if not target:
             return None
 
-        if self.state == "fetch" and (self.x, self.y) == self.target_coin:
-            if self.target_coin in elements.get("coins", []):
-                elements["coins"].remove(self.target_coin)
-            self.state = "return"
-            return None
-
-        if self.state == "return" and (self.x, self.y) == (player.x, player.y):
+        if self.state == "return" and pos == target:
             self.state = "follow"
             self.target_coin = None
             self.last_status = "delivered"
 
-        if self.state in ("follow", "fetch", "return") and (self.x, self.y) != target:
-            nx, ny = self._next_step(maze, target)
-            if (nx, ny) == (self.x, self.y) and self.state == "fetch":
-                self.state = "follow"
-                self.target_coin = None
-                self.last_status = "no_path"
-                return self.last_status
-            self.x, self.y = nx, ny
+        if pos != target:
+            self.x, self.y = self._next_step(maze, [target])
 
         return self.last_status
 
-    def render(self, screen: pygame.Surface):
+    def render(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)):
         if self.sprite:
-            screen.blit(self.sprite, (self.x * self.grid_size, self.y * self.grid_size))
+            screen.blit(
+                self.sprite,
+                (self.x * self.grid_size - offset[0], self.y * self.grid_size - offset[1]),
+            )
         else:
             rect = pygame.Rect(
-                self.x * self.grid_size,
-                self.y * self.grid_size,
+                self.x * self.grid_size - offset[0],
+                self.y * self.grid_size - offset[1],
                 self.grid_size,
                 self.grid_size,
             )
@@ -1,6 +1,8 @@
+import base64
 import pygame
+import random
 import sys
-import time
+from functools import cached_property, partial
 from typing import List, Tuple, Dict
 
 from constants import (
@@ -10,18 +12,13 @@ from constants import (
     GRID_SIZE,
     MAZE_WIDTH,
     MAZE_HEIGHT,
-    CellType,
     COLORS,
-    MOVEMENT_DELAY,
-    ENEMY_DAMAGE,
-    EXIT_ARTIFACT_REQUIREMENT,
-    ARTIFACT_HP_HEAL,
-    resource_path,
 )
-from maze_generator import MazeGenerator
-from game_entities import Player, Enemy, Pig, Witch
-from fog_of_war import FogOfWar
-from level_validator import LevelValidator
+from asset_cache import assets, get_image
+from camera import Camera
+from fixed_step import FixedStepClock
+from hud import Hud
+from map_renderer import MapRenderer
 from menu import (
     Menu,
     HistoryScreen,
@@ -31,100 +28,134 @@ from menu import (
     LevelSelectScreen,
 )
 from save_manager import SaveManager
+from simulation import Simulation, HOLD, RELEASE, SNEAK, SHIELD, WEAPON, POTION, FETCH
 from sound_manager import SoundManager
-from ui_theme import get_font
+
+KEY_TO_DIR = {
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_w: (0, -1),
+    pygame.K_s: (0, 1),
+    pygame.K_a: (-1, 0),
+    pygame.K_d: (1, 0),
+}
+
+
+SPRITE_FILES = {
+    "key": "sprites/key.png",
+    "artifact": "sprites/artifact.png",
+    "exit": "sprites/exit.png",
+    "trap": "sprites/trap.png",
+    "door": "sprites/door.png",
+    "wall": "sprites/wall.png",
+    "path": "sprites/path.png",
+    "coin": "sprites/coin.png",
+    "witch": "sprites/witch.png",
+    "fireball": "sprites/fireball.png",
+    "thorns": "sprites/thorns.png",
+}
+
+# Images needed after save selection, decoded in the background while the
+# save screen is up: menu and level-select art, then gameplay sprites.
+PRELOAD_IMAGES = (
+    "sprites/background.png",
+    "sprites/level.png",
+    "sprites/blocked_level.png",
+    *SPRITE_FILES.values(),
+    "sprites/player.png",
+    "sprites/enemy.png",
+    "sprites/pig.png",
+    "sprites/shield.png",
+    "sprites/health_potion.png",
+    "sprites/wood_armor.png",
+)
 
 
 class GameManager:
-    # Set up pygame, game state, assets, and UI screens.
+    # Set up pygame and what the first frame (save selection) needs. Sound,
+    # gameplay sprites and the other screens are built on first use, and
+    # their images are decoded on a background thread in the meantime.
     def __init__(self):
 
-        pygame.init()
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Maze Dungeon Quest")
         self.clock = pygame.time.Clock()
         self.running = True
         self.game_running = False
 
-        self.maze = None
-        self.elements = None
-        self.player = None
-        self.enemies = []
-        self.witches = []
-        self.fireballs = []
-        self.thorns = []
-        self.last_player_pos = None
-        self.fog_of_war = None
+        self.sim = None
+        self.tick_clock = None
+        self.max_speed = False
+        self.map_renderer = None
+        self.camera = None
+        self.dirty_rendering = True
+        self.full_repaint = True
+        self.prev_overlays = []
+        self.hud = Hud((WINDOW_WIDTH, WINDOW_HEIGHT))
 
         self.keys_pressed = {}
-        self.last_movement_time = {}
-
-        self.enemy_contact_time = {}
-        self.enemy_contact_damage = {}
-        self.contact_cooldown = 3
-
-        self.sprites = self._load_sprites()
 
-        self.sound_manager = SoundManager()
-
-        self.menu = Menu()
-        self.menu.set_screen(self.screen)
-        self.history_screen = HistoryScreen(self.screen)
-        self.game_over_screen = GameOverScreen(self.screen)
+        self.save_screen = SaveSelectScreen(self.screen)
 
         self.active_save = None
         self.current_level = 1
-        self.pig = None
-        self.pig_coin_summons_remaining = 3
-        self.prev_player_pos = None
-        self.toast_text = ""
-        self.toast_until = 0
-        self.is_sneaking = False
         self.exit_to_menu = False
         self.exit_to_save_select = False
-        self.ui_shield_icon = None
-        try:
-            icon = pygame.image.load(
-                resource_path("sprites/shield.png")
-            ).convert_alpha()
-            self.ui_shield_icon = pygame.transform.scale(icon, (20, 20))
-        except Exception:
-            self.ui_shield_icon = None
+
+        assets.preload(PRELOAD_IMAGES)
 
     # Load and scale sprite assets used in the game.
-    def _load_sprites(self) -> Dict:
+    @cached_property
+    def sprites(self) -> Dict:
 
         sprites = {}
-        sprite_files = {
-            "key": "sprites/key.png",
-            "artifact": "sprites/artifact.png",
-            "exit": "sprites/exit.png",
-            "trap": "sprites/trap.png",
-            "door": "sprites/door.png",
-            "wall": "sprites/wall.png",
-            "path": "sprites/path.png",
-            "coin": "sprites/coin.png",
-            "witch": "sprites/witch.png",
-            "fireball": "sprites/fireball.png",
-            "thorns": "sprites/thorns.png",
-        }
-
-        for name, path in sprite_files.items():
-            try:
-                img = pygame.image.load(resource_path(path)).convert_alpha()
-                sprites[name] = pygame.transform.scale(img, (GRID_SIZE, GRID_SIZE))
-            except Exception as e:
-                sprites[name] = None
+        assets.build_atlas(SPRITE_FILES.values(), (GRID_SIZE, GRID_SIZE))
+        for name, path in SPRITE_FILES.items():
+            sprites[name] = get_image(path, (GRID_SIZE, GRID_SIZE))
 
         return sprites
 
+    @cached_property
+    def ui_shield_icon(self) -> pygame.Surface:
+        return get_image("sprites/shield.png", (20, 20))
+
+    @cached_property
+    def sound_manager(self) -> SoundManager:
+        return SoundManager()
+
+    @cached_property
+    def menu(self) -> Menu:
+        menu = Menu()
+        menu.set_screen(self.screen)
+        return menu
+
+    @cached_property
+    def history_screen(self) -> HistoryScreen:
+        return HistoryScreen(self.screen)
+
+    @cached_property
+    def game_over_screen(self) -> GameOverScreen:
+        return GameOverScreen(self.screen)
+
+    @cached_property
+    def shop_screen(self) -> ShopScreen:
+        return ShopScreen(self.screen)
+
+    @cached_property
+    def level_screen(self) -> LevelSelectScreen:
+        return LevelSelectScreen(self.screen)
+
     # Run the main menu loop and return the selected action.
     def show_main_menu(self) -> bool:
 
         self.sound_manager.play_music("menu_music", loops=-1)
 
         while True:
-            action = self.menu.handle_input()
+            action = self.menu.show()
 
             if action == "quit":
                 self.sound_manager.stop_music()
@@ -138,8 +169,7 @@ class GameManager:
                     return False
 
             elif action == "shop":
-                shop_screen = ShopScreen(self.screen)
-                updated_save = shop_screen.show(self.active_save)
+                updated_save = self.shop_screen.show(self.active_save)
                 if updated_save is not None:
                     self.active_save = updated_save
                     self.menu.set_save(self.active_save)
@@ -147,12 +177,9 @@ class GameManager:
                 self.exit_to_save_select = True
                 return False
 
-            self.menu.render()
-            self.clock.tick(FPS)
-
     # Apply purchased shop items to the current player/save.
     def _apply_shop_items(self):
-        if not self.active_save or self.player is None:
+        if not self.active_save or self.sim is None:
             return
         inv = self.active_save.setdefault("inventory", {})
         inv.setdefault("potion", 0)
@@ -162,288 +189,76 @@ class GameManager:
         inv.setdefault("pig", 0)
         inv.setdefault("shield", 0)
 
-        self.player.potions = inv.get("potion", 0)
-        self.player.shield_unlocked = inv.get("shield", 0) > 0
-
-        if inv.get("armor", 0) > 0:
-            self.player.armor_hits = max(0, int(inv.get("armor_hits", 0)))
-
-        if inv.get("artifact", 0) > 0:
-            self.player.collected_artifacts = max(
-                self.player.collected_artifacts, inv.get("artifact", 1)
-            )
-            self.player.has_artifact_weapon = True
-
-        if inv.get("pig", 0) > 0 and self.pig is None:
-            self._spawn_pig()
+        self.sim.apply_inventory(inv)
 
         SaveManager().save(self.active_save)
 
     # Save current armor durability back into the save file.
     def _persist_armor_state(self):
-        if not self.active_save or not self.player:
+        if not self.active_save or self.sim is None:
             return
         inv = self.active_save.setdefault("inventory", {})
         inv.setdefault("armor", 0)
-        inv["armor_hits"] = max(0, int(self.player.armor_hits))
+        inv["armor_hits"] = max(0, int(self.sim.player.armor_hits))
         SaveManager().save(self.active_save)
 
-    # Spawn the pig next to the player if possible.
-    def _spawn_pig(self):
-        if not self.player or not self.maze:
-            return
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = self.player.x + dx, self.player.y + dy
-            if 0 <= nx < MAZE_WIDTH and 0 <= ny < MAZE_HEIGHT:
-                if self.maze[ny][nx] not in (
-                    CellType.WALL,
-                    CellType.DOOR,
-                    CellType.TRAP,
-                ):
-                    self.pig = Pig((nx, ny))
-                    return
-
-    # Command the pig to fetch a visible coin if available.
-    def _pig_command_fetch(self):
-        if not self.pig or self.pig_coin_summons_remaining <= 0:
-            self._show_toast("No pig fetches left")
-            return
-        if not self.fog_of_war:
+    # Remember the level's seed and explored map in the save, so coming
+    # back to an unfinished level regenerates the same maze with the map
+    # uncovered so far.
+    def _record_level_state(self):
+        if not self.active_save or self.sim is None:
             return
-        visible_coins = [
-            c for c in self.elements.get("coins", []) if c in self.fog_of_war.visible
-        ]
-        if not visible_coins:
-            self._show_toast("No visible coins")
-            return
-        if self.pig.command_fetch(visible_coins):
-            self.pig_coin_summons_remaining -= 1
-        else:
-            self._show_toast("Pig is busy")
-
-    # Show a short on-screen status message.
-    def _show_toast(self, text: str, duration_ms: int = 2000):
-        self.toast_text = text
-        self.toast_until = pygame.time.get_ticks() + duration_ms
-
-    # Gather positions where new entities should not spawn.
-    def _collect_forbidden_positions(
-        self, player_pos: Tuple[int, int], enemy_positions: List[Tuple[int, int]]
-    ):
-        forbidden = {
-            player_pos,
-            self.elements.get("exit_pos"),
+        explored = self.sim.fog_of_war.pack_explored()
+        self.active_save["level_state"] = {
+            "level": self.current_level,
+            "seed": self.sim.seed,
+            "explored": base64.b64encode(explored).decode("ascii"),
         }
-        for pos in enemy_positions:
-            forbidden.add(pos)
-        for coin in self.elements.get("coins", []):
-            forbidden.add(coin)
-        for trap in self.elements.get("traps", []):
-            forbidden.add(trap)
-        for key_info in self.elements.get("keys", []):
-            if key_info.get("pos"):
-                forbidden.add(tuple(key_info["pos"]))
-        for art in self.elements.get("artifacts", []):
-            forbidden.add(art)
-        for door_info in self.elements.get("doors", []):
-            if door_info.get("pos"):
-                forbidden.add(tuple(door_info["pos"]))
-        return forbidden
-
-    # Spawn a number of witches in valid path tiles.
-    def _spawn_witches(
-        self,
-        count: int,
-        player_pos: Tuple[int, int],
-        enemy_positions: List[Tuple[int, int]],
-    ):
-        self.witches = []
-        if self.maze is None or count <= 0:
-            return
-        forbidden = self._collect_forbidden_positions(player_pos, enemy_positions)
-        candidates = []
-        for y in range(MAZE_HEIGHT):
-            for x in range(MAZE_WIDTH):
-                if self.maze[y][x] != CellType.PATH:
-                    continue
-                if (x, y) in forbidden:
-                    continue
-                candidates.append((x, y))
-
-        if not candidates:
-            return
-
-        import random
-
-        random.shuffle(candidates)
-        for pos in candidates:
-            if len(self.witches) >= count:
-                break
-            self.witches.append(Witch(pos))
-            forbidden.add(pos)
 
-    # Update witch fireballs and thorns based on cooldowns.
-    def _update_witch_attacks(self, now_ms: int):
-        if not self.witches:
-            return
-        for witch in self.witches:
-            direction = witch.try_fireball(
-                self.player, self.maze, now_ms, self.is_sneaking
-            )
-            if direction != (0, 0):
-                fx = witch.x + direction[0]
-                fy = witch.y + direction[1]
-                if not (0 <= fx < MAZE_WIDTH and 0 <= fy < MAZE_HEIGHT):
-                    continue
-                if self.maze[fy][fx] in (CellType.WALL, CellType.DOOR):
-                    continue
-                self.fireballs.append(
-                    {
-                        "x": fx,
-                        "y": fy,
-                        "dx": direction[0],
-                        "dy": direction[1],
-                        "next_ms": now_ms + 120,
-                    }
-                )
-                self.sound_manager.play_sound("fire")
-
-            if witch.try_thorns(self.player, now_ms, self.is_sneaking):
-                positions = []
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nx, ny = witch.x + dx, witch.y + dy
-                    if 0 <= nx < MAZE_WIDTH and 0 <= ny < MAZE_HEIGHT:
-                        if self.maze[ny][nx] == CellType.PATH:
-                            positions.append((nx, ny))
-                expire = now_ms + 1000
-                for pos in positions:
-                    self.thorns.append({"pos": pos, "expires": expire})
-
-    # Advance fireballs and apply damage on hit.
-    def _update_fireballs(self, now_ms: int):
-        if not self.fireballs:
-            return
-        active = []
-        for fb in self.fireballs:
-            if now_ms < fb["next_ms"]:
-                active.append(fb)
-                continue
-            nx = fb["x"] + fb["dx"]
-            ny = fb["y"] + fb["dy"]
-            if not (0 <= nx < MAZE_WIDTH and 0 <= ny < MAZE_HEIGHT):
-                continue
-            if self.maze[ny][nx] in (CellType.WALL, CellType.DOOR):
-                continue
-            if (nx, ny) == self.player.get_position():
-                self.player.take_damage(15)
-                self.player.apply_burn(5, now_ms)
-                continue
-            fb["x"] = nx
-            fb["y"] = ny
-            fb["next_ms"] = now_ms + 120
-            active.append(fb)
-        self.fireballs = active
-
-    # Expire thorns and apply damage on contact.
-    def _update_thorns(self, now_ms: int):
-        if not self.thorns:
-            return
-        self.thorns = [t for t in self.thorns if t["expires"] > now_ms]
-        current_pos = self.player.get_position()
-        if self.last_player_pos != current_pos:
-            for t in self.thorns:
-                if t["pos"] == current_pos:
-                    self.player.take_damage(10)
-                    break
-        self.last_player_pos = current_pos
-
-    # Generate a level, spawn entities, and reset state.
+    # Start a new simulation for the current level and reset view state.
     def _init_level(self):
 
-        max_attempts = 30
-
-        for _ in range(max_attempts):
-            generator = MazeGenerator(MAZE_WIDTH, MAZE_HEIGHT)
-            self.maze = generator.generate()
-            start_pos, self.elements = generator.place_special_elements()
-
-            exit_pos = self.elements["exit_pos"]
-            if LevelValidator.validate_level(
-                self.maze, self.elements, start_pos, exit_pos
-            ):
-                break
-        else:
-            raise RuntimeError("Не вдалося згенерувати коректний рівень за ліміт спроб")
-
-        self.player = Player(start_pos, GRID_SIZE, self.sound_manager)
-        self.pig = None
-        self.prev_player_pos = self.player.get_position()
-        self.last_player_pos = self.player.get_position()
-        self.pig_coin_summons_remaining = 3
+        state = (self.active_save or {}).get("level_state")
+        if not state or state.get("level") != self.current_level:
+            state = None
+        seed = state["seed"] if state else random.getrandbits(32)
+
+        self.tick_clock = FixedStepClock(max_speed=self.max_speed)
+        self.sim = Simulation(
+            self.current_level,
+            clock=self.tick_clock,
+            sound=self.sound_manager,
+            width=MAZE_WIDTH,
+            height=MAZE_HEIGHT,
+            seed=seed,
+        )
+        if state:
+            self.sim.fog_of_war.unpack_explored(base64.b64decode(state["explored"]))
         self.exit_to_menu = False
+        self.keys_pressed = {}
         self._apply_shop_items()
 
-        import random
-
-        skeleton_count = 1
-        witch_count = 1
-        desired_coins = None
-        if self.current_level == 2:
-            skeleton_count = 2
-            witch_count = 3
-            desired_coins = 15
-        elif self.current_level == 3:
-            skeleton_count = 3
-            witch_count = 5
-            desired_coins = 25
-
-        if desired_coins is not None:
-            forbidden = self._collect_forbidden_positions(start_pos, [])
-            candidates = []
-            for y in range(MAZE_HEIGHT):
-                for x in range(MAZE_WIDTH):
-                    if self.maze[y][x] != CellType.PATH:
-                        continue
-                    if (x, y) in forbidden:
-                        continue
-                    if (x, y) in self.elements.get("traps", []):
-                        continue
-                    candidates.append((x, y))
-            random.shuffle(candidates)
-            self.elements["coins"] = candidates[:desired_coins]
-
-        enemy_positions = []
-        tries = 0
-        while len(enemy_positions) < skeleton_count and tries < 400:
-            tries += 1
-            x = random.randint(1, MAZE_WIDTH - 2)
-            y = random.randint(1, MAZE_HEIGHT - 2)
-            pos = (x, y)
-            if self.maze[y][x] != CellType.PATH:
-                continue
-            if abs(x - self.player.x) + abs(y - self.player.y) <= 10:
-                continue
-            if pos in enemy_positions:
-                continue
-            if pos in self.elements.get("traps", []):
-                continue
-            if pos in self.elements.get("coins", []):
-                continue
-            enemy_positions.append(pos)
-
-        self.enemies = [Enemy(pos) for pos in enemy_positions]
-        self._spawn_witches(witch_count, start_pos, enemy_positions)
-
-        self.fog_of_war = FogOfWar(MAZE_WIDTH, MAZE_HEIGHT, GRID_SIZE)
-        self.fog_of_war.update(self.player.get_position())
+        self.camera = Camera(
+            (WINDOW_WIDTH, WINDOW_HEIGHT),
+            (self.sim.width, self.sim.height),
+            GRID_SIZE,
+        )
+        self.camera.follow(self.sim.player.get_position())
+        self.map_renderer = MapRenderer(
+            self.sim.maze, self.sim.fog_of_war, self.sprites, GRID_SIZE, self.camera
+        )
+        self.full_repaint = True
 
-    # Process player input and movement.
+    # Translate pygame events into simulation commands.
     def handle_input(self):
 
+        sim = self.sim
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
                 self.game_running = False
+            elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                self.full_repaint = True
             elif event.type == pygame.KEYDOWN:
 
                 if event.key == pygame.K_r:
@@ -455,258 +270,170 @@ class GameManager:
                     return
 
                 elif event.key == pygame.K_e:
-                    if self.player.use_artifact_weapon() and self.enemies:
-
-                        self.enemies[0].health = 0
-                        self.player.heal(ARTIFACT_HP_HEAL)
+                    sim.push(WEAPON)
                 elif event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
-                    self.is_sneaking = True
+                    sim.push(SNEAK, True)
                 elif event.key == pygame.K_f:
-                    if self.player.use_potion():
-                        if self.active_save:
-                            inv = self.active_save.setdefault("inventory", {})
-                            inv["potion"] = self.player.potions
-                            SaveManager().save(self.active_save)
+                    sim.push(POTION)
                 elif event.key == pygame.K_g:
-                    self._pig_command_fetch()
-                else:
-                    self.keys_pressed[event.key] = time.time()
+                    sim.push(FETCH)
+                elif event.key in KEY_TO_DIR:
+                    self.keys_pressed[event.key] = KEY_TO_DIR[event.key]
+                    sim.push(HOLD, KEY_TO_DIR[event.key])
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 3 and self.player.shield_unlocked:
-                    self.player.shield_blocking = True
+                if event.button == 3:
+                    sim.push(SHIELD, True)
             elif event.type == pygame.KEYUP:
-                if event.key in self.keys_pressed:
-                    del self.keys_pressed[event.key]
-                if event.key in self.last_movement_time:
-                    del self.last_movement_time[event.key]
+                direction = self.keys_pressed.pop(event.key, None)
+                if direction and direction not in self.keys_pressed.values():
+                    sim.push(RELEASE, direction)
                 if event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
-                    self.is_sneaking = False
+                    sim.push(SNEAK, False)
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 3:
-                    self.player.shield_blocking = False
-
-        current_time = time.time()
-        key_to_dir = {
-            pygame.K_UP: (0, -1),
-            pygame.K_DOWN: (0, 1),
-            pygame.K_LEFT: (-1, 0),
-            pygame.K_RIGHT: (1, 0),
-            pygame.K_w: (0, -1),
-            pygame.K_s: (0, 1),
-            pygame.K_a: (-1, 0),
-            pygame.K_d: (1, 0),
-        }
+                    sim.push(SHIELD, False)
 
-        self.player.sneaking = self.is_sneaking
-        delay_ms = int(MOVEMENT_DELAY * (1.5 if self.is_sneaking else 1.0))
-        for key, direction in key_to_dir.items():
-            if key in self.keys_pressed:
-
-                if key not in self.last_movement_time:
-                    old_pos = self.player.get_position()
-                    if self.player.move(
-                        direction[0], direction[1], self.maze, self.elements
-                    ):
-                        self.prev_player_pos = old_pos
-                    self.last_movement_time[key] = current_time
-
-                elif (current_time - self.last_movement_time[key]) * 1000 >= delay_ms:
-                    old_pos = self.player.get_position()
-                    if self.player.move(
-                        direction[0], direction[1], self.maze, self.elements
-                    ):
-                        self.prev_player_pos = old_pos
-                    self.last_movement_time[key] = current_time
-
-    # Update game state for one tick and return status.
+    # Run the fixed-step ticks owed since the last frame and react to sim
+    # events; returns "victory", "defeat" or None.
     def update(self):
-        if not self.player.is_alive:
-            return "defeat"
-
-        if (
-            self.player.x == self.elements["exit_pos"][0]
-            and self.player.y == self.elements["exit_pos"][1]
-            and len(self.player.keys) >= EXIT_ARTIFACT_REQUIREMENT
-        ):
-            return "victory"
-
-        self.fog_of_war.update(self.player.get_position())
-
-        alive_enemies = []
-        for i, enemy in enumerate(self.enemies):
-            if enemy.health <= 0:
-                continue
-
-            enemy.update(self.player, self.maze, self.elements, self.is_sneaking)
-
-            if abs(enemy.x - self.player.x) + abs(enemy.y - self.player.y) == 1:
-                self._handle_enemy_contact(i, enemy)
-
-            alive_enemies.append(enemy)
-
-        self.enemies = alive_enemies
-
-        now_ms = pygame.time.get_ticks()
-        self._update_witch_attacks(now_ms)
-        self._update_fireballs(now_ms)
-        self._update_thorns(now_ms)
-        self.player.tick_burn(now_ms)
-
-        if self.pig:
-            current_pos = self.player.get_position()
-            follow_pos = (
-                self.prev_player_pos
-                if self.prev_player_pos and self.prev_player_pos != current_pos
-                else None
-            )
-            self.pig.set_follow_target(follow_pos)
-            pig_status = self.pig.update(self.player, self.maze, self.elements)
-            if pig_status == "delivered":
-                self.player.collected_coins += 1
-                if self.sound_manager:
-                    self.sound_manager.play_sound("coin_pickup")
-            elif pig_status == "no_path":
-                self._show_toast("Coin not found")
-
-    # Apply enemy contact damage or block effects.
-    def _handle_enemy_contact(self, enemy_id: int, enemy):
-
-        current_time = time.time()
-        now_ms = pygame.time.get_ticks()
-
-        if (
-            self.player.shield_unlocked
-            and self.player.shield_blocking
-            and now_ms >= self.player.shield_next_ready_ms
-        ):
-            self.player.shield_next_ready_ms = now_ms + 5000
-            self.enemy_contact_time[enemy_id] = current_time
-            self.enemy_contact_damage[enemy_id] = 0
-            import random
-
-            if random.random() < 0.3:
-                enemy.stun(1500)
-            return
-
-        if enemy_id not in self.enemy_contact_damage:
-            self.enemy_contact_damage[enemy_id] = 0
-            self.enemy_contact_time[enemy_id] = current_time
-            self.player.take_damage(10)
-            self.sound_manager.play_sound("enemy_attack")
-            return
-
-        if current_time - self.enemy_contact_time[enemy_id] >= self.contact_cooldown:
-            self.player.take_damage(30)
-            self.enemy_contact_time[enemy_id] = current_time
-            self.enemy_contact_damage[enemy_id] += 1
-            self.sound_manager.play_sound("enemy_attack")
-
-        return "continue"
-
-    # Render the game world and HUD.
+        status = self.tick_clock.run(self.sim.step)
+        for event in self.sim.drain_events():
+            if event == "potion_used" and self.active_save:
+                inv = self.active_save.setdefault("inventory", {})
+                inv["potion"] = self.sim.player.potions
+                self._record_level_state()
+                SaveManager().save(self.active_save)
+        return status
+
+    # Render the game world and HUD, repainting only what changed.
     def render(self):
 
-        self.screen.fill(COLORS["unknown"])
-
-        self.fog_of_war.render(self.screen, self.maze, GRID_SIZE, self.sprites)
-
-        for enemy in self.enemies:
-            enemy.render(self.screen)
-
-        for witch in self.witches:
-            witch.render(self.screen)
-
-        self.player.render(self.screen)
-
-        if self.pig:
-            self.pig.render(self.screen)
-
-        for key_info in self.elements.get("keys", []):
-            if key_info["pos"] and self.fog_of_war.is_visible(key_info["pos"]):
-                x, y = key_info["pos"]
-                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                if self.sprites.get("key"):
-                    self.screen.blit(self.sprites["key"], rect)
-                else:
-                    pygame.draw.rect(self.screen, COLORS["key"], rect)
-
-        for artifact_pos in self.elements.get("artifacts", []):
-            if self.fog_of_war.is_visible(artifact_pos):
-                x, y = artifact_pos
-                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                if self.sprites.get("artifact"):
-                    self.screen.blit(self.sprites["artifact"], rect)
-                else:
-                    pygame.draw.rect(self.screen, COLORS["artifact"], rect)
-
-        for door_info in self.elements.get("doors", []):
-            pos = door_info["pos"]
-            if pos and self.fog_of_war.is_visible(pos):
-                x, y = pos
-                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                if self.sprites.get("door"):
-                    self.screen.blit(self.sprites["door"], rect)
-                else:
-                    pygame.draw.rect(self.screen, COLORS["door"], rect)
-
-        for coin_pos in self.elements.get("coins", []):
-            if self.fog_of_war.is_visible(coin_pos):
-                x, y = coin_pos
-                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-
-                if self.sprites.get("coin"):
-                    self.screen.blit(self.sprites["coin"], rect)
-                else:
-
-                    pygame.draw.circle(
-                        self.screen, COLORS["coin"], rect.center, GRID_SIZE // 3
-                    )
-
-        for fb in self.fireballs:
-            if self.fog_of_war.is_visible((fb["x"], fb["y"])):
-                rect = pygame.Rect(
-                    fb["x"] * GRID_SIZE, fb["y"] * GRID_SIZE, GRID_SIZE, GRID_SIZE
-                )
-                if self.sprites.get("fireball"):
-                    self.screen.blit(self.sprites["fireball"], rect)
-                else:
-                    pygame.draw.circle(
-                        self.screen, COLORS["enemy"], rect.center, GRID_SIZE // 4
-                    )
-
-        for thorn in self.thorns:
-            pos = thorn["pos"]
-            if self.fog_of_war.is_visible(pos):
-                rect = pygame.Rect(
-                    pos[0] * GRID_SIZE, pos[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE
-                )
-                if self.sprites.get("thorns"):
-                    self.screen.blit(self.sprites["thorns"], rect)
-                else:
-                    pygame.draw.rect(self.screen, COLORS["danger"], rect, 2)
-
-        self._render_hud()
-
-        pygame.display.flip()
+        # Doors only turn into paths under the player, so that is the one
+        # cell that can need re-baking.
+        pos = self.sim.player.get_position()
+        if self.camera.follow(pos):
+            self.full_repaint = True
+        rebaked = self.map_renderer.refresh_cell(pos)
+        changed_cells = self.map_renderer.sync()
+        overlays = self._collect_overlays()
+        self._update_hud()
+
+        if self.full_repaint or not self.dirty_rendering:
+            self.full_repaint = False
+            self.map_renderer.render(self.screen)
+            for _, _, draw in overlays:
+                draw(self.screen)
+            self.hud.draw(self.screen)
+            self.hud.consume_dirty()
+            pygame.display.flip()
+        else:
+            dirty = [self.map_renderer.cell_rect(i) for i in changed_cells]
+            if rebaked:
+                dirty.append(self.map_renderer.cell_rect(pos))
+
+            keys = {key for key, _, _ in overlays}
+            for key, rect, _ in self.prev_overlays:
+                if key not in keys:
+                    dirty.append(rect)
+            prev_keys = {key for key, _, _ in self.prev_overlays}
+            for key, rect, _ in overlays:
+                if key not in prev_keys:
+                    dirty.append(rect)
+            dirty.extend(self.hud.consume_dirty())
+
+            overlay_rects = [rect for _, rect, _ in overlays]
+            hud_rects = self.hud.rects()
+            for rect in dirty:
+                self.map_renderer.render_area(self.screen, rect)
+                self.screen.set_clip(rect)
+                for i in rect.collidelistall(overlay_rects):
+                    overlays[i][2](self.screen)
+                self.screen.set_clip(None)
+                if rect.collidelist(hud_rects) != -1:
+                    self.hud.draw_area(self.screen, rect)
+
+            if dirty:
+                pygame.display.update(dirty)
+
+        self.prev_overlays = overlays
+
+    # Collect everything drawn above the map as (key, rect, draw) in paint order.
+    # Only cells inside the camera's view are collected.
+    def _collect_overlays(self) -> List[Tuple]:
+        overlays = []
+        sim = self.sim
+        camera = self.camera
+        cell_rect = camera.cell_rect
+        offset = camera.offset
+        now_ms = self.tick_clock.render_ms
+
+        # Entities are drawn part-way between their previous and current cell.
+        for entity in sim.entities():
+            pos = entity.get_position()
+            if not camera.contains(pos):
+                continue
+            dx, dy = entity.lerp_offset(now_ms)
+            draw = partial(entity.render, offset=(offset[0] - dx, offset[1] - dy))
+            rect = cell_rect(pos).move(dx, dy)
+            overlays.append(((id(entity), pos, dx, dy), rect, draw))
+
+        tiles = []
+        for key_info in sim.elements.get("keys", []):
+            if key_info["pos"]:
+                tiles.append(("key", key_info["pos"]))
+        for artifact_pos in sim.elements.get("artifacts", []):
+            tiles.append(("artifact", artifact_pos))
+        for door_info in sim.elements.get("doors", []):
+            if door_info["pos"]:
+                tiles.append(("door", door_info["pos"]))
+        for coin_pos in sim.elements.get("coins", []):
+            tiles.append(("coin", coin_pos))
+        for pos in sim.fireballs.positions():
+            tiles.append(("fireball", pos))
+        for pos in sim.thorns.positions():
+            tiles.append(("thorns", pos))
+
+        for name, pos in tiles:
+            if not camera.contains(pos) or not sim.fog_of_war.is_visible(pos):
+                continue
+            rect = cell_rect(pos)
+            overlays.append(((name, pos), rect, partial(self._draw_tile, name, rect)))
+
+        return overlays
+
+    # Draw an item tile, falling back to a primitive when its sprite is missing.
+    def _draw_tile(self, name: str, rect: pygame.Rect, screen: pygame.Surface):
+        sprite = self.sprites.get(name)
+        if sprite:
+            screen.blit(sprite, rect)
+        elif name == "coin":
+            pygame.draw.circle(screen, COLORS["coin"], rect.center, GRID_SIZE // 3)
+        elif name == "fireball":
+            pygame.draw.circle(screen, COLORS["enemy"], rect.center, GRID_SIZE // 4)
+        elif name == "thorns":
+            pygame.draw.rect(screen, COLORS["danger"], rect, 2)
+        else:
+            pygame.draw.rect(screen, COLORS[name], rect)
 
-    # Render HUD elements like HP, coins, and status.
-    def _render_hud(self):
+    # Push current HUD values; the HUD re-renders only labels that changed.
+    def _update_hud(self):
 
-        font = get_font("hud")
+        hud = self.hud
+        player = self.sim.player
 
-        health_text = f"HP: {max(0, self.player.health)}/100"
-        keys_text = f"Keys: {len(self.player.keys)}"
-        artifact_text = f"Artifacts: {self.player.collected_artifacts}"
-        coins_text = f"Coins: {self.player.collected_coins}"
+        health_text = f"HP: {max(0, player.health)}/100"
+        keys_text = f"Keys: {len(player.keys)}"
+        artifact_text = f"Artifacts: {player.collected_artifacts}"
+        coins_text = f"Coins: {player.collected_coins}"
         weapon_text = (
-            f"Weapon (E): {'Yes' if self.player.has_artifact_weapon else 'No'}"
+            f"Weapon (E): {'Yes' if player.has_artifact_weapon else 'No'}"
         )
-        potions_text = f"Potions (F): {self.player.potions}"
+        potions_text = f"Potions (F): {player.potions}"
         pig_owned = False
         if self.active_save:
             pig_owned = self.active_save.get("inventory", {}).get("pig", 0) > 0
         pig_text = (
-            f"Pig fetches (G): {self.pig_coin_summons_remaining}/3"
+            f"Pig fetches (G): {self.sim.pig_coin_summons_remaining}/3"
             if pig_owned
             else ""
         )
@@ -724,56 +451,67 @@ class GameManager:
             restart_text,
         ]
         for i, text in enumerate(texts):
-            if text == "":
-                continue
             color = COLORS["text"]
-            if "HP" in text and self.player.health < 30:
+            if "HP" in text and player.health < 30:
                 color = COLORS["hud_low"]
-            surface = font.render(text, True, color)
-            self.screen.blit(surface, (10, 10 + i * 25))
+            hud.text(f"line{i}", text, color, topleft=(10, 10 + i * 25))
 
-        if self.player.armor_hits > 0:
+        if player.armor_hits > 0:
             bar_w = 90
             bar_h = 8
             bar_x = 180
             bar_y = 14
-            pygame.draw.rect(
-                self.screen, COLORS["armor_bar_bg"], (bar_x, bar_y, bar_w, bar_h)
+            hud.bar(
+                "armor_bar",
+                (bar_x, bar_y, bar_w, bar_h),
+                player.armor_hits / 5,
+                COLORS["armor_bar"],
+                COLORS["armor_bar_bg"],
             )
-            fill_w = int(bar_w * (self.player.armor_hits / 5))
-            pygame.draw.rect(
-                self.screen, COLORS["armor_bar"], (bar_x, bar_y, fill_w, bar_h)
+            hud.text(
+                "armor",
+                f"Armor: {player.armor_hits}/5",
+                COLORS["text"],
+                topleft=(bar_x + bar_w + 8, 6),
             )
-            armor_label = font.render(
-                f"Armor: {self.player.armor_hits}/5", True, COLORS["text"]
-            )
-            self.screen.blit(armor_label, (bar_x + bar_w + 8, 6))
+        else:
+            hud.hide("armor_bar")
+            hud.hide("armor")
 
-        if self.player.shield_unlocked and self.player.shield_blocking:
-            now_ms = pygame.time.get_ticks()
-            if self.ui_shield_icon:
-                self.screen.blit(self.ui_shield_icon, (WINDOW_WIDTH - 140, 8))
-            if now_ms < self.player.shield_next_ready_ms:
+        now_ms = self.sim.now_ms
+        if player.shield_unlocked and player.shield_blocking:
+            hud.image("shield_icon", self.ui_shield_icon, (WINDOW_WIDTH - 140, 8))
+            if now_ms < player.shield_next_ready_ms:
                 remaining = max(
-                    0, int((self.player.shield_next_ready_ms - now_ms) / 1000)
+                    0, int((player.shield_next_ready_ms - now_ms) / 1000)
                 )
                 status_text = f"CD {remaining}s"
             else:
                 status_text = "Blocking"
-            status_surface = font.render(status_text, True, COLORS["menu_highlight"])
-            self.screen.blit(status_surface, (WINDOW_WIDTH - 110, 8))
-
-        now = pygame.time.get_ticks()
-        if self.toast_text and now < self.toast_until:
-            toast = font.render(self.toast_text, True, COLORS["menu_highlight"])
-            rect = toast.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 20))
-            self.screen.blit(toast, rect)
+            hud.text(
+                "shield_status",
+                status_text,
+                COLORS["menu_highlight"],
+                topleft=(WINDOW_WIDTH - 110, 8),
+            )
+        else:
+            hud.hide("shield_icon")
+            hud.hide("shield_status")
+
+        toast_text = self.sim.toast_text if now_ms < self.sim.toast_until else ""
+        hud.text(
+            "toast",
+            toast_text,
+            COLORS["menu_highlight"],
+            center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 20),
+        )
 
     # Run a single level loop until victory/defeat/menu.
     def run_game_loop(self):
 
         self._init_level()
         self.game_running = True
+        player = self.sim.player
 
         while self.running and self.game_running:
             self.handle_input()
@@ -784,12 +522,13 @@ class GameManager:
             status = self.update()
 
             if status == "defeat":
+                self._record_level_state()
                 self._persist_armor_state()
                 stats = {
                     "health": 0,
-                    "keys": len(self.player.keys),
-                    "artifacts": self.player.collected_artifacts,
-                    "coins": self.player.collected_coins,
+                    "keys": len(player.keys),
+                    "artifacts": player.collected_artifacts,
+                    "coins": player.collected_coins,
                 }
 
                 action = self.game_over_screen.show_defeat(stats)
@@ -802,6 +541,8 @@ class GameManager:
                     return "quit"
 
             if status == "victory":
+                if self.active_save:
+                    self.active_save.pop("level_state", None)
                 self._persist_armor_state()
                 if self.active_save:
                     max_level = self.active_save.get("max_level", 1)
@@ -810,16 +551,16 @@ class GameManager:
                         SaveManager().save(self.active_save)
 
                 if self.active_save is not None:
-                    self.active_save["coins"] += self.player.collected_coins
+                    self.active_save["coins"] += player.collected_coins
                     SaveManager().save(self.active_save)
 
                 self.sound_manager.play_sound("victory")
 
                 stats = {
-                    "health": max(0, self.player.health),
-                    "keys": len(self.player.keys),
-                    "artifacts": self.player.collected_artifacts,
-                    "coins": self.player.collected_coins,
+                    "health": max(0, player.health),
+                    "keys": len(player.keys),
+                    "artifacts": player.collected_artifacts,
+                    "coins": player.collected_coins,
                     "total_coins": self.active_save["coins"] if self.active_save else 0,
                 }
 
@@ -835,7 +576,12 @@ class GameManager:
                     return "quit"
 
             self.render()
-            self.clock.tick(FPS)
+            if not self.max_speed:
+                self.clock.tick(FPS)
+
+        if self.active_save:
+            self._record_level_state()
+            SaveManager().save(self.active_save)
 
         if self.running and not self.game_running:
             if self.exit_to_menu:
@@ -849,8 +595,7 @@ class GameManager:
 
         while self.running:
 
-            save_screen = SaveSelectScreen(self.screen)
-            self.active_save = save_screen.show()
+            self.active_save = self.save_screen.show()
 
             if self.active_save is None:
                 break
@@ -863,8 +608,7 @@ class GameManager:
                     continue
                 break
 
-            level_screen = LevelSelectScreen(self.screen)
-            chosen_level = level_screen.show(self.active_save.get("max_level", 1))
+            chosen_level = self.level_screen.show(self.active_save.get("max_level", 1))
             if chosen_level is None:
                 continue
             self.current_level = chosen_level
@@ -893,9 +637,9 @@ class GameManager:
 
                     stats = {
                         "health": 0,
-                        "keys": len(self.player.keys),
-                        "artifacts": self.player.collected_artifacts,
-                        "coins": self.player.collected_coins,
+                        "keys": len(self.sim.player.keys),
+                        "artifacts": self.sim.player.collected_artifacts,
+                        "coins": self.sim.player.collected_coins,
                     }
 
                     choice = self.game_over_screen.show_defeat(stats)
@@ -0,0 +1,123 @@
+import pygame
+from typing import Dict, List, Optional, Tuple
+from ui_theme import get_font
+
+# Rendered text surfaces kept per (text, colour) before the cache is reset.
+TEXT_CACHE_LIMIT = 256
+
+
+class HudItem:
+    def __init__(self, key: Tuple, surface: pygame.Surface, rect: pygame.Rect):
+        self.key = key
+        self.surface = surface
+        self.rect = rect
+
+
+class Hud:
+    # Retained HUD: items are composed into one cached surface and only
+    # re-rasterised when their text, colour or value actually changes.
+    def __init__(self, size: Tuple[int, int], font: pygame.font.Font = None):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.font = font or get_font("hud")
+        self.items: Dict[str, HudItem] = {}
+        self._text_cache: Dict[Tuple, pygame.Surface] = {}
+        self._dirty: List[pygame.Rect] = []
+
+    def _render_text(self, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        key = (text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_LIMIT:
+                self._text_cache.clear()
+            surface = self.font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+
+    def _place(self, name: str, key: Tuple, build):
+        item = self.items.get(name)
+        if item is not None and item.key == key:
+            return
+        if item is not None:
+            del self.items[name]
+            self._clear(item.rect)
+        new_item = build()
+        if new_item is not None:
+            self.items[name] = new_item
+            self._compose(new_item)
+            self._dirty.append(new_item.rect)
+
+    def _clear(self, rect: pygame.Rect):
+        self.surface.fill((0, 0, 0, 0), rect)
+        self._dirty.append(rect)
+        for item in self.items.values():
+            if item.rect.colliderect(rect):
+                self.surface.set_clip(rect)
+                self._compose(item)
+                self.surface.set_clip(None)
+
+    def _compose(self, item: HudItem):
+        # RGBA_MAX copies the item's own pixels into the cleared area, so the
+        # final blit to the screen blends exactly like a direct font.render.
+        self.surface.blit(item.surface, item.rect, special_flags=pygame.BLEND_RGBA_MAX)
+
+    def text(self, name: str, text: str, color: Tuple[int, int, int], **anchor):
+        if not text:
+            self.hide(name)
+            return
+
+        def build():
+            surface = self._render_text(text, color)
+            return HudItem(key, surface, surface.get_rect(**anchor))
+
+        key = (text, color, tuple(sorted(anchor.items())))
+        self._place(name, key, build)
+
+    def image(self, name: str, surface: Optional[pygame.Surface], topleft):
+        if surface is None:
+            self.hide(name)
+            return
+        key = (id(surface), tuple(topleft))
+        self._place(
+            name, key, lambda: HudItem(key, surface, surface.get_rect(topleft=topleft))
+        )
+
+    def bar(self, name: str, rect, fraction: float, color, bg_color):
+        rect = pygame.Rect(rect)
+        fill_w = int(rect.width * fraction)
+        key = (tuple(rect), fill_w, color, bg_color)
+
+        def build():
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            surface.fill(bg_color)
+            surface.fill(color, (0, 0, fill_w, rect.height))
+            return HudItem(key, surface, rect)
+
+        self._place(name, key, build)
+
+    def hide(self, name: str):
+        self._place(name, None, lambda: None)
+
+    def rects(self) -> List[pygame.Rect]:
+        return [item.rect for item in self.items.values()]
+
+    # Screen areas that changed since the last call.
+    def consume_dirty(self) -> List[pygame.Rect]:
+        dirty = self._dirty
+        self._dirty = []
+        return dirty
+
+    def draw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        # Merge overlapping items so no area is blended twice.
+        rects: List[pygame.Rect] = []
+        for rect in self.rects():
+            i = rect.collidelist(rects)
+            while i != -1:
+                rect = rect.union(rects.pop(i))
+                i = rect.collidelist(rects)
+            rects.append(rect)
+        for rect in rects:
+            screen.blit(self.surface, rect, rect)
+        return rects
+
+    def draw_area(self, screen: pygame.Surface, rect: pygame.Rect):
+        screen.blit(self.surface, rect, rect)
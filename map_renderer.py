@@ -0,0 +1,211 @@
+import math
+import pygame
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from camera import Camera
+from constants import CellType, COLORS, GRID_SIZE
+from fog_of_war import FogOfWar
+
+# Sprite and COLORS key for each cell type that has a tile of its own.
+TILE_KEYS = {
+    CellType.WALL: "wall",
+    CellType.PATH: "path",
+    CellType.EXIT: "exit",
+    CellType.TRAP: "trap",
+}
+
+DIM_KEYS = {
+    CellType.WALL: "wall_dim",
+    CellType.PATH: "path_dim",
+    CellType.EXIT: "exit_dim",
+    CellType.TRAP: "trap_dim",
+}
+
+UNKNOWN = 0
+EXPLORED = 1
+VISIBLE = 2
+
+# Cells per side of a baked chunk.
+CHUNK_CELLS = 16
+
+
+# Chunks kept baked for a view of cols x rows cells: as many as the view
+# can overlap, twice over, so scrolling back does not re-bake at once.
+def chunk_budget(cols: int, rows: int) -> int:
+    return (
+        (math.ceil(cols / CHUNK_CELLS) + 1) * (math.ceil(rows / CHUNK_CELLS) + 1) * 2
+    )
+
+
+class MapChunk:
+    def __init__(self, size: Tuple[int, int]):
+        self.lit = pygame.Surface(size).convert()
+        self.dim = pygame.Surface(size).convert()
+        self.view = pygame.Surface(size).convert()
+
+
+class MapRenderer:
+    # Bake lit and dimmed map layers and composite fog per cell. The map is
+    # split into chunks that are baked lazily when they first scroll into
+    # view and evicted least-recently-used, so memory and per-frame cost
+    # follow the viewport rather than the map size.
+    def __init__(
+        self,
+        maze: List[List],
+        fog: FogOfWar,
+        sprites: Dict = None,
+        grid_size: int = GRID_SIZE,
+        camera: Camera = None,
+    ):
+        self.maze = maze
+        self.fog = fog
+        self.sprites = sprites or {}
+        self.grid_size = grid_size
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.camera = camera or Camera(
+            (self.width * grid_size, self.height * grid_size),
+            (self.width, self.height),
+            grid_size,
+        )
+
+        self.chunk_px = CHUNK_CELLS * grid_size
+        self.bounds = pygame.Rect(0, 0, self.width * grid_size, self.height * grid_size)
+        self.chunks: "OrderedDict[Tuple[int, int], MapChunk]" = OrderedDict()
+        self.max_chunks = chunk_budget(self.camera.cols, self.camera.rows)
+        self._cell_types = [row[:] for row in maze]
+        self._shown = bytearray(self.width * self.height)
+
+        fog.consume_dirty_spans()
+
+    # Screen rect of a cell given as (x, y) or as a row-major index.
+    def cell_rect(self, cell) -> pygame.Rect:
+        if isinstance(cell, int):
+            cell = (cell % self.width, cell // self.width)
+        return self.camera.cell_rect(cell)
+
+    # Fetch a chunk, baking it from the maze and fog on first use.
+    def _chunk(self, cx: int, cy: int) -> MapChunk:
+        chunk = self.chunks.get((cx, cy))
+        if chunk is not None:
+            self.chunks.move_to_end((cx, cy))
+            return chunk
+
+        if len(self.chunks) >= self.max_chunks:
+            self.chunks.popitem(last=False)
+        chunk = MapChunk((self.chunk_px, self.chunk_px))
+        chunk.view.fill(COLORS["unknown"])
+        self.chunks[(cx, cy)] = chunk
+
+        visible = self.fog.visible
+        explored = self.fog.explored
+        x0 = cx * CHUNK_CELLS
+        y0 = cy * CHUNK_CELLS
+        for y in range(y0, min(self.height, y0 + CHUNK_CELLS)):
+            for x in range(x0, min(self.width, x0 + CHUNK_CELLS)):
+                self._bake_cell(chunk, x, y)
+                i = y * self.width + x
+                state = VISIBLE if visible[i] else (EXPLORED if explored[i] else UNKNOWN)
+                self._shown[i] = state
+                self._compose_cell(chunk, x, y, state)
+        return chunk
+
+    def _local_rect(self, x: int, y: int) -> pygame.Rect:
+        gs = self.grid_size
+        return pygame.Rect(
+            (x % CHUNK_CELLS) * gs, (y % CHUNK_CELLS) * gs, gs, gs
+        )
+
+    def _bake_cell(self, chunk: MapChunk, x: int, y: int):
+        rect = self._local_rect(x, y)
+        cell_type = self._cell_types[y][x]
+
+        key = TILE_KEYS.get(cell_type)
+        sprite = self.sprites.get(key) if key else None
+        if sprite:
+            chunk.lit.fill(COLORS["unknown"], rect)
+            chunk.lit.blit(sprite, rect)
+        else:
+            chunk.lit.fill(COLORS[key or "unknown"], rect)
+
+        chunk.dim.fill(COLORS[DIM_KEYS.get(cell_type, "unknown")], rect)
+
+    def _compose_cell(self, chunk: MapChunk, x: int, y: int, state: int):
+        rect = self._local_rect(x, y)
+        if state == VISIBLE:
+            chunk.view.blit(chunk.lit, rect, rect)
+        elif state == EXPLORED:
+            chunk.view.blit(chunk.dim, rect, rect)
+        else:
+            chunk.view.fill(COLORS["unknown"], rect)
+
+    def _sync_span(self, start: int, end: int) -> List[int]:
+        visible = self.fog.visible
+        explored = self.fog.explored
+        shown = self._shown
+        chunks = self.chunks
+        width = self.width
+        changed = []
+        for i in range(start, end):
+            state = VISIBLE if visible[i] else (EXPLORED if explored[i] else UNKNOWN)
+            if state == shown[i]:
+                continue
+            x = i % width
+            y = i // width
+            chunk = chunks.get((x // CHUNK_CELLS, y // CHUNK_CELLS))
+            # Unbaked chunks pick the state up from the fog when first baked.
+            if chunk is None:
+                continue
+            shown[i] = state
+            self._compose_cell(chunk, x, y, state)
+            changed.append(i)
+        return changed
+
+    # Re-bake a single cell if the maze changed under it (e.g. an unlocked door).
+    def refresh_cell(self, pos: Tuple[int, int]) -> bool:
+        x, y = pos
+        cell_type = self.maze[y][x]
+        if self._cell_types[y][x] == cell_type:
+            return False
+        self._cell_types[y][x] = cell_type
+        chunk = self.chunks.get((x // CHUNK_CELLS, y // CHUNK_CELLS))
+        if chunk is None:
+            return False
+        self._bake_cell(chunk, x, y)
+        self._compose_cell(chunk, x, y, self._shown[y * self.width + x])
+        return True
+
+    # Composite any fog changes into the view; returns indices of changed cells.
+    def sync(self) -> List[int]:
+        changed = []
+        for start, end in self.fog.consume_dirty_spans():
+            changed.extend(self._sync_span(start, end))
+        return changed
+
+    def render(self, screen: pygame.Surface):
+        self.sync()
+        self.render_area(screen, self.camera.view_rect)
+
+    # Restore a screen area from the composited chunks (for dirty-rect repaints).
+    def render_area(self, screen: pygame.Surface, rect: pygame.Rect):
+        world = self.camera.screen_to_world(rect)
+        ox, oy = self.camera.offset
+        size = self.chunk_px
+        if not self.bounds.contains(world):
+            screen.fill(COLORS["unknown"], rect)
+        for cy in range(max(0, world.top // size), (world.bottom - 1) // size + 1):
+            if cy * CHUNK_CELLS >= self.height:
+                break
+            for cx in range(max(0, world.left // size), (world.right - 1) // size + 1):
+                if cx * CHUNK_CELLS >= self.width:
+                    break
+                chunk_rect = pygame.Rect(cx * size, cy * size, size, size)
+                area = chunk_rect.clip(world)
+                if not area.width or not area.height:
+                    continue
+                chunk = self._chunk(cx, cy)
+                screen.blit(
+                    chunk.view,
+                    (area.x - ox, area.y - oy),
+                    area.move(-chunk_rect.x, -chunk_rect.y),
+                )
@@ -1,14 +1,28 @@
 import random
 from typing import Dict, List, Optional, Set, Tuple
 from constants import CellType, MAZE_WIDTH, MAZE_HEIGHT
-from pathfinding import bfs_farthest, bfs_reachable, bfs_shortest_path
+from pathfinding import (
+    FlowField,
+    PassableMask,
+    _bfs,
+    _reconstruct_path,
+    bfs_reachable,
+    field_mask,
+)
 
 Coord = Tuple[int, int]
 
 class MazeGenerator:
-    def __init__(self, width: int = MAZE_WIDTH, height: int = MAZE_HEIGHT):
+    # Draws from `rng` (a random.Random) when given, else the module RNG.
+    def __init__(
+        self,
+        width: int = MAZE_WIDTH,
+        height: int = MAZE_HEIGHT,
+        rng: Optional[random.Random] = None,
+    ):
         self.width = width
         self.height = height
+        self.rng = rng or random
         
         if self.width % 2 == 0:
             self.width += 1
@@ -47,7 +61,7 @@ class MazeGenerator:
                     neighbors.append((nx, ny, dx // 2, dy // 2))
 
             if neighbors:
-                nx, ny, wx, wy = random.choice(neighbors)
+                nx, ny, wx, wy = self.rng.choice(neighbors)
 
                 self.maze[y + wy][x + wx] = CellType.PATH
                 self.maze[ny][nx] = CellType.PATH
@@ -103,34 +117,43 @@ class MazeGenerator:
 
         return is_blocked
 
+    # Farthest cell from start and the shortest path to it (start first),
+    # both read from one whole-maze search: a wavefront over `mask` when
+    # the maze is open enough to have one, else a BFS whose first farthest
+    # cell in discovery order is the exit.
+    def _farthest_path(
+        self, start_pos: Coord, is_blocked, mask: Optional[PassableMask]
+    ) -> Tuple[Coord, List[Coord]]:
+        if mask is None:
+            prev, dist = _bfs(start_pos, self.width, self.height, is_blocked)
+            exit_pos = start_pos
+            for pos, d in dist.items():
+                if d > dist[exit_pos]:
+                    exit_pos = pos
+            return exit_pos, _reconstruct_path(prev, exit_pos, include_start=True)
+
+        field = FlowField(
+            [start_pos], self.width, self.height, is_blocked, mask=mask
+        )
+        far = field.dist.index(max(field.dist))
+        exit_pos = (far % self.width, far // self.width)
+        path = [exit_pos] + field.path(exit_pos)
+        path.reverse()
+        return exit_pos, path
+
     def _pick_main_path(
         self, path_cells: List[Coord], is_blocked
     ) -> Tuple[Coord, Coord, List[Coord]]:
-        start_pos = random.choice(path_cells)
-        exit_pos = bfs_farthest(start_pos, self.width, self.height, is_blocked)
-        main_path = bfs_shortest_path(
-            start_pos,
-            exit_pos,
-            self.width,
-            self.height,
-            is_blocked,
-            include_start=True,
-        )
+        mask = field_mask(self.width, self.height, is_blocked, len(path_cells))
+        start_pos = self.rng.choice(path_cells)
+        exit_pos, main_path = self._farthest_path(start_pos, is_blocked, mask)
 
         if len(main_path) >= 8:
             return start_pos, exit_pos, main_path
 
         for _ in range(10):
-            start_pos = random.choice(path_cells)
-            exit_pos = bfs_farthest(start_pos, self.width, self.height, is_blocked)
-            main_path = bfs_shortest_path(
-                start_pos,
-                exit_pos,
-                self.width,
-                self.height,
-                is_blocked,
-                include_start=True,
-            )
+            start_pos = self.rng.choice(path_cells)
+            exit_pos, main_path = self._farthest_path(start_pos, is_blocked, mask)
             if len(main_path) >= 8:
                 break
 
@@ -139,7 +162,7 @@ class MazeGenerator:
     def _place_door_and_key(
         self, maze: List[List[CellType]], start_pos: Coord, main_path: List[Coord]
     ) -> Tuple[Coord, Coord, Set[Coord]]:
-        door_index = random.randint(
+        door_index = self.rng.randint(
             max(3, len(main_path) // 3),
             min(len(main_path) - 4, 2 * len(main_path) // 3),
         )
@@ -154,7 +177,7 @@ class MazeGenerator:
         raise_no_key = "Не знайшлось місце для ключа до дверей"
         if not key_candidates:
             raise ValueError(raise_no_key)
-        key_pos = random.choice(key_candidates)
+        key_pos = self.rng.choice(key_candidates)
         return door_pos, key_pos, pre_door_reachable
 
     def _pick_artifact_pos(
@@ -172,10 +195,10 @@ class MazeGenerator:
             c for c in pre_door_reachable if c not in (start_pos, key_pos)
         ]
 
-        if post_candidates and random.random() < 0.6:
-            return random.choice(post_candidates)
+        if post_candidates and self.rng.random() < 0.6:
+            return self.rng.choice(post_candidates)
         if pre_candidates:
-            return random.choice(pre_candidates)
+            return self.rng.choice(pre_candidates)
         return None
 
     def _place_traps_and_coins(
@@ -186,7 +209,7 @@ class MazeGenerator:
         exit_pos: Coord,
     ) -> Tuple[List[Coord], List[Coord]]:
         trap_candidates = [c for c in all_reachable if c not in forbidden]
-        random.shuffle(trap_candidates)
+        self.rng.shuffle(trap_candidates)
         trap_cells = trap_candidates[:2]
 
         ex, ey = exit_pos
@@ -194,11 +217,11 @@ class MazeGenerator:
         for tx, ty in trap_cells:
             maze[ty][tx] = CellType.TRAP
 
-        coin_count = random.randint(7, 9)
+        coin_count = self.rng.randint(7, 9)
         coin_candidates = [
             c for c in all_reachable if c not in forbidden and c not in trap_cells
         ]
-        random.shuffle(coin_candidates)
+        self.rng.shuffle(coin_candidates)
         coins = coin_candidates[:coin_count]
         return trap_cells, coins
 
@@ -1,7 +1,9 @@
 import pygame
 from save_manager import SaveManager
-from constants import WINDOW_WIDTH, WINDOW_HEIGHT, COLORS, FPS, resource_path
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT, COLORS
 from ui_theme import get_font
+from asset_cache import get_image
+from ui_widgets import Image, Label, ListWidget, Panel, TextInput
 
 def load_font(size: int):
     try:
@@ -10,161 +12,189 @@ def load_font(size: int):
     except:
         return get_font("body_l", size)
 
-def draw_menu_background(screen):
-    try:
-        img = pygame.image.load(resource_path("sprites/background.png")).convert()
-        img = pygame.transform.scale(img, (WINDOW_WIDTH, WINDOW_HEIGHT))
+def menu_background():
+    img = get_image("sprites/background.png", (WINDOW_WIDTH, WINDOW_HEIGHT), alpha=False)
 
-        screen.blit(img, (0, 0))
+    return img if img else COLORS["menu_bg"]
 
-    except:
-        screen.fill(COLORS["menu_bg"])
+class MenuScreen:
+    # Event-driven screen built from retained widgets. It blocks on
+    # pygame.event.wait() while idle; after each batch of events sync()
+    # pushes state into the widgets and only the dirty ones are repainted.
+    def __init__(self, screen: pygame.Surface = None):
+        self.screen = screen
 
-class Menu:
-    def __init__(self):
-        self.screen = None
+        self.root = None
 
-        self.clock = pygame.time.Clock()
+        self._done = False
 
-        self.running = True
+        self._result = None
 
-        self.selected = 0
+    def build(self) -> Panel:
+        return Panel()
 
-        self.active_save = None
+    def sync(self):
+        pass
 
-        self.font = get_font("body_l")
+    def finish(self, result=None):
+        self._done = True
 
-        self.font_title = get_font("title_xl")
+        self._result = result
 
-        self.font_hint = get_font("hint")
+    def handle_event(self, event: pygame.event.Event):
+        pass
 
-    def set_screen(self, screen: pygame.Surface):
-        self.screen = screen
+    def present(self, force: bool = False):
+        if self.root is None:
+            self.root = self.build()
 
-    def set_save(self, save_data):
-        self.active_save = save_data
+            force = True
 
-    def handle_input(self) -> str:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return "quit"
+        self.sync()
 
-            elif event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_UP, pygame.K_w):
-                    self.selected = (self.selected - 1) % 3
+        if force:
+            self.root.draw_all(self.screen)
 
-                elif event.key in (pygame.K_DOWN, pygame.K_s):
-                    self.selected = (self.selected + 1) % 3
+            pygame.display.flip()
 
-                elif event.key == pygame.K_ESCAPE:
-                    return "back"
+        else:
+            rects = self.root.draw_dirty(self.screen)
 
-                elif event.key == pygame.K_RETURN:
-                    if self.selected == 0:
-                        return "play"
+            if rects:
+                pygame.display.update(rects)
 
-                    elif self.selected == 1:
-                        return "history"
+    def run(self):
+        self._done = False
 
-                    else:
-                        return "shop"
+        self._result = None
 
-        return ""
+        self.present(force=True)
 
-    def render(self):
-        if self.screen is None:
-            return
+        while True:
+            for event in [pygame.event.wait()] + pygame.event.get():
+                self.handle_event(event)
 
-        draw_menu_background(self.screen)
+                if self._done:
+                    return self._result
 
-        title_font = self.font_title
+            self.present()
 
-        subtitle_font = self.font
+class Menu(MenuScreen):
+    def __init__(self):
+        super().__init__()
 
-        button_font = self.font
+        self.running = True
 
-        info_font = self.font_hint
+        self.selected = 0
 
-        title = title_font.render("MAZE DUNGEON", True, COLORS["menu_text"])
+        self.active_save = None
 
-        title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 110))
+        self.font = get_font("body_l")
 
-        self.screen.blit(title, title_rect)
+        self.font_title = get_font("title_xl")
 
-        subtitle = subtitle_font.render("QUEST", True, COLORS["menu_highlight"])
+        self.font_hint = get_font("hint")
 
-        subtitle_rect = subtitle.get_rect(center=(WINDOW_WIDTH // 2, 180))
+    def set_screen(self, screen: pygame.Surface):
+        self.screen = screen
 
-        self.screen.blit(subtitle, subtitle_rect)
+    def set_save(self, save_data):
+        self.active_save = save_data
 
-        if hasattr(self, "active_save") and self.active_save:
-            inv = self.active_save.get("inventory", {})
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            self.finish("quit")
 
-            artifact_count = inv.get("artifact", 0)
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_UP, pygame.K_w):
+                self.selected = (self.selected - 1) % 3
 
-            max_level = self.active_save.get("max_level", 1)
+            elif event.key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = (self.selected + 1) % 3
 
-            coins_text = f"Coins: {self.active_save['coins']} | Lvl {max_level}"
+            elif event.key == pygame.K_ESCAPE:
+                self.finish("back")
 
-            coins_surface = self.font.render(coins_text, True, COLORS["menu_text"])
+            elif event.key == pygame.K_RETURN:
+                if self.selected == 0:
+                    self.finish("play")
 
-            self.screen.blit(
-                coins_surface, (WINDOW_WIDTH // 2 - coins_surface.get_width() // 2, 210)
-            )
+                elif self.selected == 1:
+                    self.finish("history")
 
-            name_text = f"Save: {self.active_save.get('name', '')}"
+                else:
+                    self.finish("shop")
 
-            name_surface = self.font.render(name_text, True, COLORS["menu_text"])
+    def build(self) -> Panel:
+        root = Panel(self.screen.get_rect(), menu_background())
 
-            self.screen.blit(
-                name_surface, (WINDOW_WIDTH // 2 - name_surface.get_width() // 2, 240)
+        root.add(
+            Label(
+                "MAZE DUNGEON",
+                self.font_title,
+                COLORS["menu_text"],
+                center=(WINDOW_WIDTH // 2, 110),
             )
+        )
 
-        options = ["Play", "Legend", "Shop"]
+        root.add(
+            Label(
+                "QUEST",
+                self.font,
+                COLORS["menu_highlight"],
+                center=(WINDOW_WIDTH // 2, 180),
+            )
+        )
 
-        start_y = 320
+        self.coins_label = root.add(
+            Label("", self.font, COLORS["menu_text"], midtop=(WINDOW_WIDTH // 2, 210))
+        )
 
-        for i, label in enumerate(options):
-            prefix = "> " if self.selected == i else "  "
+        self.name_label = root.add(
+            Label("", self.font, COLORS["menu_text"], midtop=(WINDOW_WIDTH // 2, 240))
+        )
 
-            color = (
-                COLORS["menu_highlight"]
-                if self.selected == i
-                else COLORS["menu_inactive"]
+        self.options = root.add(
+            ListWidget(
+                ["Play", "Legend", "Shop"],
+                self.font,
+                origin=(WINDOW_WIDTH // 2, 320),
+                step=(0, 70),
             )
+        )
 
-            text = prefix + label
+        root.add(
+            Label(
+                "Up/Down or W/S - select | Enter - confirm | Esc - back",
+                self.font_hint,
+                COLORS["menu_info"],
+                center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50),
+            )
+        )
 
-            surface = button_font.render(text, True, color)
+        return root
 
-            rect = surface.get_rect(center=(WINDOW_WIDTH // 2, start_y + i * 70))
+    def sync(self):
+        save = self.active_save
 
-            self.screen.blit(surface, rect)
+        if save:
+            max_level = save.get("max_level", 1)
 
-        info_text = "Up/Down or W/S - select | Enter - confirm | Esc - back"
+            self.coins_label.set_text(f"Coins: {save['coins']} | Lvl {max_level}")
 
-        info_surface = info_font.render(info_text, True, COLORS["menu_info"])
+            self.name_label.set_text(f"Save: {save.get('name', '')}")
 
-        info_rect = info_surface.get_rect(
-            center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50)
-        )
+        self.coins_label.set_visible(bool(save))
 
-        self.screen.blit(info_surface, info_rect)
+        self.name_label.set_visible(bool(save))
 
-        pygame.display.flip()
+        self.options.select(self.selected)
 
     def show(self) -> str:
-        while self.running:
-            action = self.handle_input()
+        if not self.running:
+            return "quit"
 
-            if action in ["play", "history", "shop", "quit", "back"]:
-                return action
-
-            self.render()
-
-            self.clock.tick(FPS)
-
-        return "quit"
+        return self.run()
 
 SHOP_ITEMS = [
     {
@@ -193,14 +223,16 @@ SHOP_ITEMS = [
     },
 ]
 
-class ShopScreen:
+class ShopScreen(MenuScreen):
     def __init__(self, screen: pygame.Surface):
-        self.screen = screen
-
-        self.clock = pygame.time.Clock()
+        super().__init__(screen)
 
         self.selected = 0
 
+        self.save_data = None
+
+        self.inv = None
+
         self.font_title = get_font("title_l")
 
         self.font_item = get_font("body_l")
@@ -221,11 +253,7 @@ class ShopScreen:
             "pig": "sprites/pig.png",
         }
         for item_id, path in icons.items():
-            try:
-                img = pygame.image.load(resource_path(path)).convert_alpha()
-                self.item_icons[item_id] = pygame.transform.scale(img, (24, 24))
-            except Exception:
-                self.item_icons[item_id] = None
+            self.item_icons[item_id] = get_image(path, (24, 24))
 
     def _ensure_inventory(self, save_data: dict) -> dict:
         inv = save_data.setdefault("inventory", {})
@@ -248,109 +276,147 @@ class ShopScreen:
         if save_data is None:
             return None
 
-        inv = self._ensure_inventory(save_data)
+        self.save_data = save_data
 
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return save_data
+        self.inv = self._ensure_inventory(save_data)
 
-                elif event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_UP, pygame.K_w):
-                        self.selected = (self.selected - 1) % len(SHOP_ITEMS)
+        self.selected = 0
 
-                    elif event.key in (pygame.K_DOWN, pygame.K_s):
-                        self.selected = (self.selected + 1) % len(SHOP_ITEMS)
+        return self.run()
 
-                    elif event.key == pygame.K_ESCAPE:
-                        return save_data
+    def handle_event(self, event: pygame.event.Event):
+        save_data = self.save_data
 
-                    elif event.key == pygame.K_RETURN:
-                        item = SHOP_ITEMS[self.selected]
+        inv = self.inv
 
-                        if save_data.get("coins", 0) >= item["cost"]:
-                            if item["id"] == "armor":
-                                save_data["coins"] -= item["cost"]
+        if event.type == pygame.QUIT:
+            self.finish(save_data)
 
-                                inv["armor"] = 1
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_UP, pygame.K_w):
+                self.selected = (self.selected - 1) % len(SHOP_ITEMS)
 
-                                inv["armor_hits"] = 5
+            elif event.key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = (self.selected + 1) % len(SHOP_ITEMS)
 
-                            elif item["id"] == "shield":
-                                save_data["coins"] -= item["cost"]
+            elif event.key == pygame.K_ESCAPE:
+                self.finish(save_data)
 
-                                inv["shield"] = 1
+            elif event.key == pygame.K_RETURN:
+                item = SHOP_ITEMS[self.selected]
 
-                            else:
-                                save_data["coins"] -= item["cost"]
+                if save_data.get("coins", 0) >= item["cost"]:
+                    if item["id"] == "armor":
+                        save_data["coins"] -= item["cost"]
 
-                                inv[item["id"]] = inv.get(item["id"], 0) + 1
+                        inv["armor"] = 1
 
-                            SaveManager().save(save_data)
+                        inv["armor_hits"] = 5
 
-                    elif event.key == pygame.K_r:
-                        if inv.get("armor", 0) > 0 and inv.get("armor_hits", 0) > 0:
-                            if save_data.get("coins", 0) >= 1:
-                                save_data["coins"] -= 1
+                    elif item["id"] == "shield":
+                        save_data["coins"] -= item["cost"]
 
-                                inv["armor_hits"] = 5
+                        inv["shield"] = 1
 
-                                SaveManager().save(save_data)
+                    else:
+                        save_data["coins"] -= item["cost"]
 
-            self.render(save_data, inv)
+                        inv[item["id"]] = inv.get(item["id"], 0) + 1
 
-            self.clock.tick(30)
+                    SaveManager().save(save_data)
 
-    def render(self, save_data: dict, inv: dict):
-        self.screen.fill(COLORS["ui_bg"])
+            elif event.key == pygame.K_r:
+                if inv.get("armor", 0) > 0 and inv.get("armor_hits", 0) > 0:
+                    if save_data.get("coins", 0) >= 1:
+                        save_data["coins"] -= 1
 
-        title = self.font_title.render("Shop", True, COLORS["menu_highlight"])
+                        inv["armor_hits"] = 5
 
-        self.screen.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 40))
+                        SaveManager().save(save_data)
 
-        coins = self.font_item.render(
-            f"Coins: {save_data.get('coins', 0)}", True, COLORS["menu_text"]
+    def build(self) -> Panel:
+        root = Panel(self.screen.get_rect(), COLORS["ui_bg"])
+
+        root.add(
+            Label(
+                "Shop",
+                self.font_title,
+                COLORS["menu_highlight"],
+                midtop=(WINDOW_WIDTH // 2, 40),
+            )
         )
 
-        self.screen.blit(coins, (WINDOW_WIDTH // 2 - coins.get_width() // 2, 105))
+        self.coins_label = root.add(
+            Label(
+                "", self.font_item, COLORS["menu_text"], midtop=(WINDOW_WIDTH // 2, 105)
+            )
+        )
 
         start_y = 160
 
+        self.items = root.add(
+            ListWidget(
+                [item["name"] for item in SHOP_ITEMS],
+                self.font_item,
+                origin=(60, start_y),
+                step=(0, 70),
+                anchor="topleft",
+            )
+        )
+
         for i, item in enumerate(SHOP_ITEMS):
-            prefix = "> " if i == self.selected else "  "
+            icon = self.item_icons.get(item["id"])
 
-            color = (
-                COLORS["menu_highlight"]
-                if i == self.selected
-                else COLORS["menu_inactive"]
+            if icon:
+                root.add(Image(icon, topleft=(30, start_y + i * 70)))
+
+            root.add(
+                Label(
+                    item["desc"],
+                    self.font_desc,
+                    COLORS["text_dim"],
+                    topleft=(90, start_y + i * 70 + 30),
+                )
             )
 
-            owned = inv.get(item["id"], 0)
-
-            line = f"{prefix}{item['name']} - {item['cost']} coins (owned: {owned})"
+        root.add(
+            Label(
+                "Up/Down or W/S - select | Enter - buy | Esc - back | R - repair armor",
+                self.font_hint,
+                COLORS["hint"],
+                midtop=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40),
+            )
+        )
 
-            surface = self.font_item.render(line, True, color)
+        self.armor_label = root.add(
+            Label(
+                "", self.font_desc, COLORS["text_dim"], topleft=(60, WINDOW_HEIGHT - 80)
+            )
+        )
 
-            self.screen.blit(surface, (60, start_y + i * 70))
+        self.repair_label = root.add(
+            Label(
+                "", self.font_desc, COLORS["text_dim"], topleft=(60, WINDOW_HEIGHT - 60)
+            )
+        )
 
-            icon = self.item_icons.get(item["id"])
+        return root
 
-            if icon:
-                self.screen.blit(icon, (30, start_y + i * 70))
+    def sync(self):
+        save_data = self.save_data
 
-            desc = self.font_desc.render(item["desc"], True, COLORS["text_dim"])
+        inv = self.inv
 
-            self.screen.blit(desc, (90, start_y + i * 70 + 30))
+        self.coins_label.set_text(f"Coins: {save_data.get('coins', 0)}")
 
-        hint = self.font_hint.render(
-            "Up/Down or W/S - select | Enter - buy | Esc - back | R - repair armor",
-            True,
-            COLORS["hint"],
+        self.items.set_items(
+            [
+                f"{item['name']} - {item['cost']} coins (owned: {inv.get(item['id'], 0)})"
+                for item in SHOP_ITEMS
+            ]
         )
 
-        self.screen.blit(
-            hint, (WINDOW_WIDTH // 2 - hint.get_width() // 2, WINDOW_HEIGHT - 40)
-        )
+        self.items.select(self.selected)
 
         armor_hits = inv.get("armor_hits", 0)
 
@@ -362,9 +428,7 @@ class ShopScreen:
             else "Armor durability: -"
         )
 
-        armor_line = self.font_desc.render(armor_status, True, COLORS["text_dim"])
-
-        self.screen.blit(armor_line, (60, WINDOW_HEIGHT - 80))
+        self.armor_label.set_text(armor_status)
 
         if armor_owned and armor_hits > 0:
             repair_text = "Press R to repair armor for 1 coin"
@@ -372,73 +436,67 @@ class ShopScreen:
         else:
             repair_text = "Repair available only if armor not broken"
 
-        repair_line = self.font_desc.render(repair_text, True, COLORS["text_dim"])
-
-        self.screen.blit(repair_line, (60, WINDOW_HEIGHT - 60))
-
-        pygame.display.flip()
+        self.repair_label.set_text(repair_text)
+
+HISTORY_TEXTS = [
+    "Legend of the Crypt Maze",
+    "",
+    "Lore:",
+    "> Beneath the old cathedral lies a shifting crypt",
+    "> A lost relic binds the dead to the maze",
+    "> Break the curse and reach the exit",
+    "",
+    "Objective:",
+    "> Find the key and reach the exit",
+    "> The artifact empowers you, but is optional",
+    "",
+    "Controls:",
+    "> Arrows/WASD - move",
+    "> Hold = repeat with 200ms delay",
+    "> Hold Shift - sneak (quiet, detect within 2 tiles)",
+    "> E - use artifact weapon",
+    "> F - use health potion",
+    "> G - command pig to fetch visible coin",
+    "> RMB - shield block (cooldown)",
+    "> R - restart level",
+    "",
+    "Enemies:",
+    "> Skeletons patrol and chase if close",
+    "> Witch casts fireballs and thorns",
+    "",
+    "Shop Items:",
+    "> Potions, wood armor, shield, piglet",
+    "",
+    "Press ESC to return to menu",
+]
 
-class HistoryScreen:
+class HistoryScreen(MenuScreen):
     def __init__(self, screen: pygame.Surface):
-        self.screen = screen
-        self.clock = pygame.time.Clock()
+        super().__init__(screen)
         self.scroll_offset = 0
-        self.max_scroll = 0
         self.line_height = 28
+        visible_height = WINDOW_HEIGHT - 160
+        total_height = len(HISTORY_TEXTS) * self.line_height
+        self.max_scroll = max(0, total_height - visible_height)
 
-    def render(self):
-        self.screen.fill(COLORS["ui_bg"])
-
-        title_font = get_font("title_m")
-
-        title = title_font.render("LEGEND", True, COLORS["menu_highlight"])
-
-        title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 50))
+    def build(self) -> Panel:
+        root = Panel(self.screen.get_rect(), COLORS["ui_bg"])
 
-        self.screen.blit(title, title_rect)
+        root.add(
+            Label(
+                "LEGEND",
+                get_font("title_m"),
+                COLORS["menu_highlight"],
+                center=(WINDOW_WIDTH // 2, 50),
+            )
+        )
 
         text_font = get_font("body_m")
 
         info_font = get_font("body_s")
 
-        texts = [
-            "Legend of the Crypt Maze",
-            "",
-            "Lore:",
-            "> Beneath the old cathedral lies a shifting crypt",
-            "> A lost relic binds the dead to the maze",
-            "> Break the curse and reach the exit",
-            "",
-            "Objective:",
-            "> Find the key and reach the exit",
-            "> The artifact empowers you, but is optional",
-            "",
-            "Controls:",
-            "> Arrows/WASD - move",
-            "> Hold = repeat with 200ms delay",
-            "> Hold Shift - sneak (quiet, detect within 2 tiles)",
-            "> E - use artifact weapon",
-            "> F - use health potion",
-            "> G - command pig to fetch visible coin",
-            "> RMB - shield block (cooldown)",
-            "> R - restart level",
-            "",
-            "Enemies:",
-            "> Skeletons patrol and chase if close",
-            "> Witch casts fireballs and thorns",
-            "",
-            "Shop Items:",
-            "> Potions, wood armor, shield, piglet",
-            "",
-            "Press ESC to return to menu",
-        ]
-
-        visible_height = WINDOW_HEIGHT - 160
-        total_height = len(texts) * self.line_height
-        self.max_scroll = max(0, total_height - visible_height)
-
-        y_offset = 120 - self.scroll_offset
-        for text in texts:
+        self.lines = []
+        for text in HISTORY_TEXTS:
             if (
                 text.startswith("Game:")
                 or text.startswith("Description:")
@@ -446,43 +504,42 @@ class HistoryScreen:
                 or text.startswith("Controls:")
                 or text.startswith("Mechanics:")
             ):
-                surface = text_font.render(text, True, COLORS["menu_highlight"])
+                line = Label(text, text_font, COLORS["menu_highlight"])
 
             else:
-                surface = info_font.render(text, True, COLORS["text_dim"])
+                line = Label(text, info_font, COLORS["text_dim"])
 
-            self.screen.blit(surface, (60, y_offset))
+            self.lines.append(root.add(line))
 
+        return root
+
+    def sync(self):
+        y_offset = 120 - self.scroll_offset
+        for line in self.lines:
+            line.move(topleft=(60, y_offset))
             y_offset += self.line_height
 
-        pygame.display.flip()
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            self.finish("quit")
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.finish("menu")
+        elif event.type == pygame.MOUSEWHEEL:
+            offset = self.scroll_offset - event.y * self.line_height
+            self.scroll_offset = max(0, min(offset, self.max_scroll))
 
     def show(self) -> str:
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return "menu"
-                elif event.type == pygame.MOUSEWHEEL:
-                    self.scroll_offset -= event.y * self.line_height
-                    if self.scroll_offset < 0:
-                        self.scroll_offset = 0
-                    if self.scroll_offset > self.max_scroll:
-                        self.scroll_offset = self.max_scroll
-
-            self.render()
-            self.clock.tick(60)
-
-class LevelSelectScreen:
-    def __init__(self, screen: pygame.Surface):
-        self.screen = screen
+        return self.run()
 
-        self.clock = pygame.time.Clock()
+class LevelSelectScreen(MenuScreen):
+    def __init__(self, screen: pygame.Surface):
+        super().__init__(screen)
 
         self.selected = 0
 
+        self.max_level = 1
+
         self.font_title = get_font("title_l")
 
         self.font_item = get_font("body_l")
@@ -496,51 +553,47 @@ class LevelSelectScreen:
         self._load_icons()
 
     def _load_icons(self):
-        try:
-            img = pygame.image.load(resource_path("sprites/level.png")).convert_alpha()
-            self.level_img = pygame.transform.scale(img, (64, 64))
-        except Exception:
-            self.level_img = None
-        try:
-            img = pygame.image.load(
-                resource_path("sprites/blocked_level.png")
-            ).convert_alpha()
-            self.blocked_img = pygame.transform.scale(img, (64, 64))
-        except Exception:
-            self.blocked_img = None
+        self.level_img = get_image("sprites/level.png", (64, 64))
+        self.blocked_img = get_image("sprites/blocked_level.png", (64, 64))
 
     def show(self, max_level: int):
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
+        self.max_level = max_level
 
-                elif event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_LEFT, pygame.K_a):
-                        self.selected = (self.selected - 1) % 3
+        self.selected = 0
 
-                    elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                        self.selected = (self.selected + 1) % 3
+        return self.run()
 
-                    elif event.key == pygame.K_ESCAPE:
-                        return None
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            self.finish(None)
 
-                    elif event.key == pygame.K_RETURN:
-                        chosen = self.selected + 1
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_LEFT, pygame.K_a):
+                self.selected = (self.selected - 1) % 3
 
-                        if chosen <= max_level:
-                            return chosen
+            elif event.key in (pygame.K_RIGHT, pygame.K_d):
+                self.selected = (self.selected + 1) % 3
 
-            self.render(max_level)
+            elif event.key == pygame.K_ESCAPE:
+                self.finish(None)
 
-            self.clock.tick(30)
+            elif event.key == pygame.K_RETURN:
+                chosen = self.selected + 1
 
-    def render(self, max_level: int):
-        self.screen.fill(COLORS["ui_bg"])
+                if chosen <= self.max_level:
+                    self.finish(chosen)
 
-        title = self.font_title.render("Select Level", True, COLORS["menu_highlight"])
+    def build(self) -> Panel:
+        root = Panel(self.screen.get_rect(), COLORS["ui_bg"])
 
-        self.screen.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 40))
+        root.add(
+            Label(
+                "Select Level",
+                self.font_title,
+                COLORS["menu_highlight"],
+                midtop=(WINDOW_WIDTH // 2, 40),
+            )
+        )
 
         item_width = 180
 
@@ -550,151 +603,155 @@ class LevelSelectScreen:
 
         y = 160
 
-        for i in range(3):
-            level_num = i + 1
+        self.icons = []
 
-            unlocked = level_num <= max_level
+        self.outlines = []
 
+        for i in range(3):
             x = start_x + i * item_width
 
-            if unlocked:
-                img = self.level_img
+            self.icons.append(root.add(Image(None, topleft=(x + 40, y))))
 
-            else:
-                img = self.blocked_img
-
-            if img:
-                self.screen.blit(img, (x + 40, y))
+            self.outlines.append(
+                root.add(Panel(pygame.Rect(x + 40, y, 64, 64), border=2))
+            )
 
-            else:
-                rect = pygame.Rect(x + 40, y, 64, 64)
+        self.levels = root.add(
+            ListWidget(
+                [f"Level {i + 1}" for i in range(3)],
+                self.font_item,
+                origin=(start_x + 20, y + 80),
+                step=(item_width, 0),
+                anchor="topleft",
+            )
+        )
 
-                color = (
-                    COLORS["menu_highlight"] if unlocked else COLORS["menu_inactive"]
-                )
+        root.add(
+            Label(
+                "A/D or Left/Right - select | Enter - start | Esc - back",
+                self.font_hint,
+                COLORS["hint"],
+                midtop=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40),
+            )
+        )
 
-                pygame.draw.rect(self.screen, color, rect, 2)
+        return root
 
-            prefix = "> " if self.selected == i else "  "
+    def sync(self):
+        for i in range(3):
+            unlocked = i + 1 <= self.max_level
 
-            label = f"{prefix}Level {level_num}"
+            img = self.level_img if unlocked else self.blocked_img
 
-            color = (
-                COLORS["menu_highlight"]
-                if (self.selected == i and unlocked)
-                else COLORS["menu_inactive"]
-            )
+            self.icons[i].set_image(img)
 
-            text = self.font_item.render(label, True, color)
+            color = COLORS["menu_highlight"] if unlocked else COLORS["menu_inactive"]
 
-            self.screen.blit(text, (x + 20, y + 80))
+            self.outlines[i].set_background(color)
 
-        hint = self.font_hint.render(
-            "A/D or Left/Right - select | Enter - start | Esc - back",
-            True,
-            COLORS["hint"],
-        )
+            self.outlines[i].set_visible(img is None)
 
-        self.screen.blit(
-            hint, (WINDOW_WIDTH // 2 - hint.get_width() // 2, WINDOW_HEIGHT - 40)
-        )
+            self.levels.buttons[i].set_enabled(unlocked)
 
-        pygame.display.flip()
+        self.levels.select(self.selected)
 
-class GameOverScreen:
+class GameOverScreen(MenuScreen):
     def __init__(self, screen: pygame.Surface):
-        self.screen = screen
-
-        self.clock = pygame.time.Clock()
+        super().__init__(screen)
 
         self.font = get_font("body_l")
 
         self.font_title = get_font("title_xl")
 
-    def show_victory(self, stats: dict) -> str:
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                        return "restart"
+        self.victory = False
 
-                    elif event.key == pygame.K_n:
-                        return "next"
+        self.stats = {}
 
-                    elif event.key == pygame.K_ESCAPE:
-                        return "menu"
+    def show_victory(self, stats: dict) -> str:
+        self.victory = True
 
-            self.screen.fill(COLORS["ui_bg"])
+        self.stats = stats
 
-            title_font = self.font_title
+        return self.run()
 
-            text_font = self.font
+    def show_defeat(self, stats: dict) -> str:
+        self.victory = False
 
-            info_font = get_font("body_s")
+        self.stats = stats
 
-            title = title_font.render("VICTORY!", True, COLORS["menu_highlight"])
+        return self.run()
 
-            title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 100))
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            self.finish("quit")
 
-            self.screen.blit(title, title_rect)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
+                self.finish("restart")
 
-            stats_text = [
-                f"HP: {stats.get('health', 100)}/100",
-                f"Artifacts: {stats.get('artifacts', 0)}",
-                f"Keys: {stats.get('keys', 0)}",
-                f"Coins: +{stats['coins']}",
-                f"Total coins: {stats['total_coins']}",
-            ]
+            elif self.victory and event.key == pygame.K_n:
+                self.finish("next")
 
-            y_offset = 250
+            elif self.victory and event.key == pygame.K_ESCAPE:
+                self.finish("menu")
 
-            for text in stats_text:
-                surface = text_font.render(text, True, COLORS["text"])
+    def build(self) -> Panel:
+        root = Panel(self.screen.get_rect(), COLORS["ui_bg"])
 
-                self.screen.blit(surface, (WINDOW_WIDTH // 2 - 200, y_offset))
+        left = WINDOW_WIDTH // 2 - 200
 
-                y_offset += 50
-
-            info1 = info_font.render("Enter - restart level", True, COLORS["text_dim"])
-
-            info2 = info_font.render(
-                "N - next level | ESC - return to menu", True, COLORS["text_dim"]
+        self.title = root.add(
+            Label(
+                "",
+                self.font_title,
+                COLORS["menu_highlight"],
+                center=(WINDOW_WIDTH // 2, 100),
             )
+        )
 
-            self.screen.blit(info1, (WINDOW_WIDTH // 2 - 200, 500))
+        self.stat_lines = [
+            root.add(
+                Label("", self.font, COLORS["text"], topleft=(left, 250 + i * 50))
+            )
+            for i in range(5)
+        ]
 
-            self.screen.blit(info2, (WINDOW_WIDTH // 2 - 200, 530))
+        info_font = get_font("body_s")
 
-            pygame.display.flip()
+        self.info1 = root.add(
+            Label("", info_font, COLORS["text_dim"], topleft=(left, 500))
+        )
 
-            self.clock.tick(60)
+        self.info2 = root.add(
+            Label("", info_font, COLORS["text_dim"], topleft=(left, 530))
+        )
 
-    def show_defeat(self, stats: dict) -> str:
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
+        return root
 
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                        return "restart"
+    def sync(self):
+        stats = self.stats
 
-            self.screen.fill(COLORS["ui_bg"])
+        if self.victory:
+            self.title.set_text("VICTORY!")
 
-            title_font = self.font_title
+            self.title.set_color(COLORS["menu_highlight"])
 
-            text_font = self.font
+            stats_text = [
+                f"HP: {stats.get('health', 100)}/100",
+                f"Artifacts: {stats.get('artifacts', 0)}",
+                f"Keys: {stats.get('keys', 0)}",
+                f"Coins: +{stats['coins']}",
+                f"Total coins: {stats['total_coins']}",
+            ]
 
-            info_font = get_font("body_s")
+            self.info1.set_text("Enter - restart level")
 
-            title = title_font.render("DEFEAT", True, COLORS["danger"])
+            self.info2.set_text("N - next level | ESC - return to menu")
 
-            title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 100))
+        else:
+            self.title.set_text("DEFEAT")
 
-            self.screen.blit(title, title_rect)
+            self.title.set_color(COLORS["danger"])
 
             stats_text = [
                 f"HP: 0/100",
@@ -703,30 +760,19 @@ class GameOverScreen:
                 f"Coins: {stats.get('coins', 0)}",
             ]
 
-            y_offset = 250
-
-            for text in stats_text:
-                surface = text_font.render(text, True, COLORS["text"])
-
-                self.screen.blit(surface, (WINDOW_WIDTH // 2 - 200, y_offset))
-
-                y_offset += 50
+            self.info1.set_text("Enter — restart level")
 
-            info1 = info_font.render("Enter — restart level", True, COLORS["text_dim"])
+            self.info2.set_text("Only restart available")
 
-            info2 = info_font.render("Only restart available", True, COLORS["text_dim"])
+        for i, line in enumerate(self.stat_lines):
+            if i < len(stats_text):
+                line.set_text(stats_text[i])
 
-            self.screen.blit(info1, (WINDOW_WIDTH // 2 - 200, 500))
+            line.set_visible(i < len(stats_text))
 
-            self.screen.blit(info2, (WINDOW_WIDTH // 2 - 200, 530))
-
-            pygame.display.flip()
-
-            self.clock.tick(60)
-
-class SaveSelectScreen:
+class SaveSelectScreen(MenuScreen):
     def __init__(self, screen):
-        self.screen = screen
+        super().__init__(screen)
 
         self.save_manager = SaveManager()
 
@@ -760,120 +806,138 @@ class SaveSelectScreen:
             self.selected = 0
 
     def show(self):
-        clock = pygame.time.Clock()
-
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
-
-                if event.type == pygame.KEYDOWN:
-                    if self.mode == "select":
-                        if event.key in (pygame.K_UP, pygame.K_w):
-                            self.selected = (self.selected - 1) % len(self.saves)
-
-                        elif event.key in (pygame.K_DOWN, pygame.K_s):
-                            self.selected = (self.selected + 1) % len(self.saves)
-
-                        elif event.key == pygame.K_RETURN:
-                            chosen = self.saves[self.selected]
-
-                            if chosen["coins"] is None:
-                                self.mode = "create"
+        self.mode = "select"
 
-                                self.input_text = ""
+        self.reload_saves()
 
-                            else:
-                                return chosen
+        return self.run()
 
-                        elif event.key == pygame.K_ESCAPE:
-                            return None
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            self.finish(None)
 
-                    elif self.mode == "create":
-                        if event.key == pygame.K_RETURN and self.input_text.strip():
-                            save = self.save_manager.create_save(
-                                self.input_text.strip()
-                            )
+        if event.type == pygame.KEYDOWN:
+            if self.mode == "select":
+                if event.key in (pygame.K_UP, pygame.K_w):
+                    self.selected = (self.selected - 1) % len(self.saves)
 
-                            self.reload_saves()
+                elif event.key in (pygame.K_DOWN, pygame.K_s):
+                    self.selected = (self.selected + 1) % len(self.saves)
 
-                            return save
+                elif event.key == pygame.K_RETURN:
+                    chosen = self.saves[self.selected]
 
-                        elif event.key == pygame.K_ESCAPE:
-                            self.mode = "select"
+                    if chosen["coins"] is None:
+                        self.mode = "create"
 
-                        elif event.key == pygame.K_BACKSPACE:
-                            self.input_text = self.input_text[:-1]
+                        self.input_text = ""
+                        self.input.set_value("")
 
-                        else:
-                            if (
-                                len(self.input_text) < 20
-                                and event.unicode.isprintable()
-                            ):
-                                self.input_text += event.unicode
+                    else:
+                        self.finish(chosen)
 
-            self.render()
+                elif event.key == pygame.K_ESCAPE:
+                    self.finish(None)
 
-            clock.tick(30)
+            elif self.mode == "create":
+                if event.key == pygame.K_RETURN and self.input_text.strip():
+                    save = self.save_manager.create_save(self.input_text.strip())
 
-    def render(self):
-        self.screen.fill(COLORS["ui_panel_bg"])
+                    self.reload_saves()
 
-        title = self.font_title.render("Save selection", True, COLORS["text"])
+                    self.finish(save)
 
-        self.screen.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 60))
+                elif event.key == pygame.K_ESCAPE:
+                    self.mode = "select"
 
-        if self.mode == "select":
-            y = 160
+                elif event.key != pygame.K_RETURN and self.input.handle_key(event):
+                    self.input_text = self.input.value
 
-            for i, save in enumerate(self.saves):
-                if save["coins"] is None:
-                    text = save["name"]
+    def build(self) -> Panel:
+        root = Panel(self.screen.get_rect(), COLORS["ui_panel_bg"])
 
-                else:
-                    level = save.get("max_level", 1)
+        root.add(
+            Label(
+                "Save selection",
+                self.font_title,
+                COLORS["text"],
+                midtop=(WINDOW_WIDTH // 2, 60),
+            )
+        )
 
-                    text = f"{save['name']}   Lvl {level}"
+        self.select_panel = root.add(Panel())
+
+        self.save_list = self.select_panel.add(
+            ListWidget(
+                [],
+                self.font_item,
+                origin=(WINDOW_WIDTH // 2, 160),
+                step=(0, 40),
+                anchor="midtop",
+                prefix=False,
+                color=COLORS["text"],
+                selected_color=COLORS["highlight"],
+            )
+        )
 
-                color = COLORS["highlight"] if i == self.selected else COLORS["text"]
+        self.select_panel.add(
+            Label(
+                "Arrows or W/S — choise | Enter — confirm | Esc — exit",
+                self.font_hint,
+                COLORS["hint"],
+                midtop=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40),
+            )
+        )
 
-                surface = self.font_item.render(text, True, color)
+        self.create_panel = root.add(Panel())
 
-                self.screen.blit(
-                    surface, (WINDOW_WIDTH // 2 - surface.get_width() // 2, y)
-                )
+        self.create_panel.add(
+            Label(
+                "Enter save name:",
+                self.font_item,
+                COLORS["text"],
+                midtop=(WINDOW_WIDTH // 2, 220),
+            )
+        )
 
-                y += 40
+        self.input = self.create_panel.add(
+            TextInput(
+                self.font_item,
+                COLORS["highlight"],
+                max_length=20,
+                midtop=(WINDOW_WIDTH // 2, 270),
+            )
+        )
 
-            hint = self.font_hint.render(
-                "Arrows or W/S — choise | Enter — confirm | Esc — exit",
-                True,
+        self.create_panel.add(
+            Label(
+                "Enter — create | Esc — back",
+                self.font_hint,
                 COLORS["hint"],
+                midtop=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40),
             )
+        )
 
-            self.screen.blit(
-                hint, (WINDOW_WIDTH // 2 - hint.get_width() // 2, WINDOW_HEIGHT - 40)
-            )
+        return root
 
-        elif self.mode == "create":
-            prompt = self.font_item.render("Enter save name:", True, COLORS["text"])
+    def sync(self):
+        labels = []
 
-            self.screen.blit(prompt, (WINDOW_WIDTH // 2 - prompt.get_width() // 2, 220))
+        for save in self.saves:
+            if save["coins"] is None:
+                labels.append(save["name"])
 
-            input_surface = self.font_item.render(
-                self.input_text + "|", True, COLORS["highlight"]
-            )
+            else:
+                level = save.get("max_level", 1)
 
-            self.screen.blit(
-                input_surface, (WINDOW_WIDTH // 2 - input_surface.get_width() // 2, 270)
-            )
+                labels.append(f"{save['name']}   Lvl {level}")
 
-            hint = self.font_hint.render(
-                "Enter — create | Esc — back", True, COLORS["hint"]
-            )
+        self.save_list.set_items(labels)
 
-            self.screen.blit(
-                hint, (WINDOW_WIDTH // 2 - hint.get_width() // 2, WINDOW_HEIGHT - 40)
-            )
+        self.save_list.select(self.selected)
+
+        self.input.set_value(self.input_text)
+
+        self.select_panel.set_visible(self.mode == "select")
 
-        pygame.display.flip()
+        self.create_panel.set_visible(self.mode == "create")
@@ -0,0 +1,85 @@
+import math
+from array import array
+from typing import List, Tuple
+from constants import CellType, HEAR_RADIUS
+
+# Sound stops at walls and closed doors.
+BLOCKING = (CellType.WALL, CellType.DOOR)
+
+
+class NoiseMap:
+    # Sounds made during a tick, as the effective distance to the loudest
+    # source at each cell: maze distance divided by loudness, so a sound of
+    # loudness 2 is heard twice as far. Each emission floods a BFS bounded
+    # by what the keenest listener (max_hear cells) could hear. Buffers are
+    # allocated once and stamped with a generation, so clearing is O(1) and
+    # an emission costs only the cells it reaches.
+    def __init__(self, maze: List[List], max_hear: int = HEAR_RADIUS):
+        self.maze = maze
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.max_hear = max_hear
+        size = self.width * self.height
+        self.level = array("f", bytes(4 * size))
+        self.stamp = array("I", bytes(4 * size))
+        self.seen = array("I", bytes(4 * size))
+        self.queue = array("i")
+        self.generation = 1
+        self.emissions = 0
+        self.active = False
+
+    # Forget this tick's sounds.
+    def clear(self):
+        if self.active:
+            self.generation += 1
+            self.active = False
+
+    def emit(self, pos: Tuple[int, int], loudness: float = 1.0):
+        w, h = self.width, self.height
+        maze = self.maze
+        level, stamp, seen = self.level, self.stamp, self.seen
+        gen = self.generation
+        self.emissions += 1
+        mark = self.emissions
+        reach = int(self.max_hear * loudness)
+
+        queue = self.queue
+        del queue[:]
+        start = pos[1] * w + pos[0]
+        queue.append(start)
+        seen[start] = mark
+        head = 0
+        d = 0
+        while head < len(queue):
+            # Process one ring (all cells at distance d) at a time.
+            ring_end = len(queue)
+            eff = d / loudness
+            while head < ring_end:
+                i = queue[head]
+                head += 1
+                if stamp[i] != gen or eff < level[i]:
+                    level[i] = eff
+                    stamp[i] = gen
+                if d == reach:
+                    continue
+                x, y = i % w, i // w
+                for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+                    if not (0 <= nx < w and 0 <= ny < h):
+                        continue
+                    j = ny * w + nx
+                    if seen[j] == mark or maze[ny][nx] in BLOCKING:
+                        continue
+                    seen[j] = mark
+                    queue.append(j)
+            d += 1
+        self.active = True
+
+    # Effective distance to the loudest sound this tick, inf if none.
+    def distance(self, pos: Tuple[int, int]) -> float:
+        i = pos[1] * self.width + pos[0]
+        if self.stamp[i] != self.generation:
+            return math.inf
+        return self.level[i]
+
+    def hears(self, pos: Tuple[int, int], hear_radius: int) -> bool:
+        return self.active and self.distance(pos) <= hear_radius
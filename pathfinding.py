@@ -1,5 +1,8 @@
+import heapq
+import sys
+from array import array
 from collections import deque
-from typing import Callable, Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 Coord = Tuple[int, int]
 
@@ -76,15 +79,747 @@ def bfs_reachable(
     return set(prev.keys())
 
 
-def bfs_farthest(
+# A cost layer is a flat row-major per-cell array (array, bytearray or
+# list) and a weight; entering a cell costs step_cost plus the weighted
+# sum of its layer values.
+CostLayer = Tuple[Sequence[int], int]
+
+# Searches whose largest step cost is at most this use a bucket queue
+# (0-1 BFS when costs are 0 or 1) instead of a binary heap.
+BUCKET_MAX_COST = 16
+
+
+def _max_entry_cost(layers: Sequence[CostLayer], step_cost: int) -> int:
+    return step_cost + sum(w * max(layer) for layer, w in layers if layer)
+
+
+# Cheapest path under cost layers, [] if the goal is unreachable. Uses a
+# bucket queue when step costs are small integers (0-1 BFS for 0/1 costs),
+# otherwise Dijkstra with a binary heap; both stop at the goal.
+def weighted_path(
+    start: Coord,
+    goal: Coord,
+    width: int,
+    height: int,
+    is_blocked: Callable[[Coord], bool],
+    layers: Sequence[CostLayer] = (),
+    step_cost: int = 1,
+    include_start: bool = False,
+) -> List[Coord]:
+    if start == goal:
+        return [start] if include_start else []
+    start_i = start[1] * width + start[0]
+    goal_i = goal[1] * width + goal[0]
+    max_cost = _max_entry_cost(layers, step_cost)
+    if max_cost <= BUCKET_MAX_COST:
+        prev = _bucket_search(
+            start_i, goal_i, width, height, is_blocked, layers, step_cost, max_cost
+        )
+    else:
+        prev = _heap_search(
+            start_i, goal_i, width, height, is_blocked, layers, step_cost
+        )
+    if goal_i not in prev:
+        return []
+
+    path = []
+    i = goal_i
+    while i != start_i:
+        path.append((i % width, i // width))
+        i = prev[i]
+    if include_start:
+        path.append(start)
+    path.reverse()
+    return path
+
+
+# Dial's algorithm: one FIFO per cost modulo (max_cost + 1).
+def _bucket_search(
+    start_i: int,
+    goal_i: int,
+    width: int,
+    height: int,
+    is_blocked: Callable[[Coord], bool],
+    layers: Sequence[CostLayer],
+    step_cost: int,
+    max_cost: int,
+) -> Dict[int, int]:
+    buckets = [deque() for _ in range(max_cost + 1)]
+    buckets[0].append(start_i)
+    dist = {start_i: 0}
+    prev: Dict[int, int] = {}
+    pending = 1
+    d = 0
+    while pending:
+        bucket = buckets[d % (max_cost + 1)]
+        while bucket:
+            i = bucket.popleft()
+            pending -= 1
+            if dist[i] != d:
+                continue
+            if i == goal_i:
+                return prev
+            x, y = i % width, i // width
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                j = ny * width + nx
+                nd = d + step_cost
+                for layer, weight in layers:
+                    nd += weight * layer[j]
+                if nd >= dist.get(j, nd + 1) or is_blocked((nx, ny)):
+                    continue
+                dist[j] = nd
+                prev[j] = i
+                buckets[nd % (max_cost + 1)].append(j)
+                pending += 1
+        d += 1
+    return prev
+
+
+def _heap_search(
+    start_i: int,
+    goal_i: int,
+    width: int,
+    height: int,
+    is_blocked: Callable[[Coord], bool],
+    layers: Sequence[CostLayer],
+    step_cost: int,
+) -> Dict[int, int]:
+    dist = {start_i: 0}
+    prev: Dict[int, int] = {}
+    heap = [(0, start_i)]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if i == goal_i:
+            break
+        if d > dist[i]:
+            continue
+        x, y = i % width, i // width
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            j = ny * width + nx
+            nd = d + step_cost
+            for layer, weight in layers:
+                nd += weight * layer[j]
+            if nd >= dist.get(j, nd + 1) or is_blocked((nx, ny)):
+                continue
+            dist[j] = nd
+            prev[j] = i
+            heapq.heappush(heap, (nd, j))
+    return prev
+
+
+# Shortest path where entering a cell costs 1 plus its entry in `cost`.
+def dijkstra_path(
     start: Coord,
+    goal: Coord,
+    width: int,
+    height: int,
+    is_blocked: Callable[[Coord], bool],
+    cost: Sequence[int],
+    include_start: bool = False,
+) -> List[Coord]:
+    return weighted_path(
+        start, goal, width, height, is_blocked, [(cost, 1)], 1, include_start
+    )
+
+
+# Wavefront rings with at most this many cells skip the bit planes.
+SPARSE_RING = 32
+# Byte patterns for the 32-bit little-endian lanes PassableMask unpacks into.
+_LANE_ONE = {ord("0"): "\0\0\0\0", ord("1"): "\1\0\0\0"}
+_LANE_UNREACHED = {ord("0"): "\xff\xff\xff\xff", ord("1"): "\0\0\0\0"}
+
+
+class PassableMask:
+    # The open cells of a grid as the bits of one integer, row-major with
+    # a stride of width + 1: the spare column is always closed, so shifting
+    # by one bit cannot wrap from one row into the next. A distance field
+    # over it is a wavefront: each ring is the previous one shifted a cell
+    # in all four directions and masked to the open cells not reached yet,
+    # a handful of big-integer operations per ring instead of a queue pop
+    # and four neighbour checks per cell. Ring distances are collected as
+    # bit planes and unpacked into an int32 array at the end.
+    def __init__(
+        self, width: int, height: int, is_blocked: Callable[[Coord], bool]
+    ):
+        self.width = width
+        self.height = height
+        self.stride = width + 1
+        bits = []
+        for y in range(height):
+            bits.extend("0" if is_blocked((x, y)) else "1" for x in range(width))
+            bits.append("0")
+        self.bits = int("".join(reversed(bits)), 2)
+
+    # Cell at pos became passable.
+    def open(self, pos: Coord):
+        self.bits |= 1 << (pos[1] * self.stride + pos[0])
+
+    # distance_field over the mask: same distances, and with `stop` every
+    # cell up to the stop cell's distance is labelled. Rings of at most
+    # SPARSE_RING cells (corridors) are written out cell by cell; wider
+    # ones go into the bit planes.
+    def field(
+        self,
+        sources: Iterable[Coord],
+        stop: Optional[Coord] = None,
+        max_dist: int = -1,
+    ) -> array:
+        stride = self.stride
+        ring = 0
+        for x, y in sources:
+            ring |= 1 << (y * stride + x)
+        todo = self.bits & ~ring
+        reached = ring
+        stop_bit = 1 << (stop[1] * stride + stop[0]) if stop is not None else 0
+        planes: List[int] = []
+        cells: List[Tuple[int, int]] = []
+        d = 0
+        while ring:
+            if ring.bit_count() <= SPARSE_RING:
+                rest = ring
+                while rest:
+                    b = rest.bit_length() - 1
+                    rest ^= 1 << b
+                    cells.append((b - b // stride, d))
+            else:
+                k = 0
+                while d >> k:
+                    if len(planes) == k:
+                        planes.append(0)
+                    if d >> k & 1:
+                        planes[k] |= ring
+                    k += 1
+            if ring & stop_bit or d == max_dist:
+                break
+            grown = (ring << 1) | (ring >> 1) | (ring << stride) | (ring >> stride)
+            ring = grown & todo
+            todo ^= ring
+            reached |= ring
+            d += 1
+
+        lanes = self._lanes(reached, _LANE_UNREACHED)
+        for k, plane in enumerate(planes):
+            if plane:
+                lanes += self._lanes(plane, _LANE_ONE) << k
+        dist = array("i")
+        dist.frombytes(lanes.to_bytes(4 * self.width * self.height, "little"))
+        if sys.byteorder == "big":
+            dist.byteswap()
+        for i, d in cells:
+            dist[i] = d
+        return dist
+
+    # One 32-bit lane per cell (padding column dropped), from a bit set.
+    def _lanes(self, bits: int, table: dict) -> int:
+        width, stride = self.width, self.stride
+        cells = format(bits, "b").zfill(stride * self.height)[::-1]
+        rows = "".join(
+            cells[start : start + width]
+            for start in range(0, stride * self.height, stride)
+        )
+        return int.from_bytes(rows.translate(table).encode("latin-1"), "little")
+
+
+# Share of open cells from which a one-off whole-map field is cheaper as a
+# wavefront, mask build included (benchmarks/bench_fields.py: grids with
+# scattered walls down to 0.64 open win, corridor mazes near 0.5 lose).
+WAVEFRONT_MIN_OPEN = 0.6
+
+
+# PassableMask for a grid with `open_cells` passable cells if its density
+# favours the wavefront, None where the queue BFS is faster.
+def field_mask(
+    width: int, height: int, is_blocked: Callable[[Coord], bool], open_cells: int
+) -> Optional[PassableMask]:
+    if open_cells < WAVEFRONT_MIN_OPEN * width * height:
+        return None
+    return PassableMask(width, height, is_blocked)
+
+
+# Multi-source BFS over a flat array: the distance from each cell to the
+# nearest source, -1 where unreached. Sources are seeded even if blocked.
+# With `stop`, the search ends once that cell is labelled, by which point
+# every cell closer to a source is labelled too; with `max_dist`, cells
+# farther than that are left unreached. With cost layers the distances
+# are weighted (see weighted_path) and found with Dijkstra instead; without
+# them, a PassableMask of the same grid runs the search as a wavefront.
+def distance_field(
+    sources: Iterable[Coord],
     width: int,
     height: int,
     is_blocked: Callable[[Coord], bool],
-) -> Coord:
-    _, dist = _bfs(start, width, height, is_blocked)
-    far = start
-    for pos, d in dist.items():
-        if d > dist[far]:
-            far = pos
-    return far
+    stop: Optional[Coord] = None,
+    max_dist: int = -1,
+    layers: Sequence[CostLayer] = (),
+    mask: Optional[PassableMask] = None,
+) -> array:
+    if layers:
+        return _weighted_field(
+            sources, width, height, is_blocked, stop, max_dist, layers
+        )
+    if mask is not None:
+        return mask.field(sources, stop, max_dist)
+    dist = array("i", [-1]) * (width * height)
+    q = deque()
+    for x, y in sources:
+        if dist[y * width + x] < 0:
+            dist[y * width + x] = 0
+            q.append((x, y))
+    stop_i = stop[1] * width + stop[0] if stop is not None else -1
+
+    while q:
+        x, y = q.popleft()
+        d = dist[y * width + x] + 1
+        if y * width + x == stop_i or d - 1 == max_dist:
+            break
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            i = ny * width + nx
+            if dist[i] >= 0 or is_blocked((nx, ny)):
+                continue
+            dist[i] = d
+            q.append((nx, ny))
+
+    return dist
+
+
+def _weighted_field(
+    sources: Iterable[Coord],
+    width: int,
+    height: int,
+    is_blocked: Callable[[Coord], bool],
+    stop: Optional[Coord],
+    max_dist: int,
+    layers: Sequence[CostLayer],
+) -> array:
+    dist = array("i", [-1]) * (width * height)
+    done = bytearray(width * height)
+    max_cost = _max_entry_cost(layers, 1)
+    use_buckets = max_cost <= BUCKET_MAX_COST
+    buckets = [deque() for _ in range(max_cost + 1)] if use_buckets else None
+    heap = []
+    pending = 0
+    for x, y in sources:
+        i = y * width + x
+        if dist[i] < 0:
+            dist[i] = 0
+            if use_buckets:
+                buckets[0].append(i)
+            else:
+                heap.append((0, i))
+            pending += 1
+    stop_i = stop[1] * width + stop[0] if stop is not None else -1
+
+    d = 0
+    while pending:
+        if use_buckets:
+            bucket = buckets[d % (max_cost + 1)]
+            if not bucket:
+                d += 1
+                continue
+            i = bucket.popleft()
+        else:
+            d, i = heapq.heappop(heap)
+        pending -= 1
+        if done[i] or dist[i] != d:
+            continue
+        done[i] = 1
+        if i == stop_i or 0 <= max_dist <= d:
+            break
+        x, y = i % width, i // width
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            j = ny * width + nx
+            nd = d + 1
+            for layer, weight in layers:
+                nd += weight * layer[j]
+            if done[j] or 0 <= dist[j] <= nd or is_blocked((nx, ny)):
+                continue
+            dist[j] = nd
+            if use_buckets:
+                buckets[nd % (max_cost + 1)].append(j)
+            else:
+                heapq.heappush(heap, (nd, j))
+            pending += 1
+
+    return dist
+
+
+class FlowField:
+    # Distances to the nearest of several sources; an agent walks downhill
+    # one neighbour at a time with no further search.
+    def __init__(
+        self,
+        sources: Iterable[Coord],
+        width: int,
+        height: int,
+        is_blocked: Callable[[Coord], bool],
+        stop: Optional[Coord] = None,
+        max_dist: int = -1,
+        layers: Sequence[CostLayer] = (),
+        mask: Optional[PassableMask] = None,
+    ):
+        self.sources = list(sources)
+        self.width = width
+        self.height = height
+        self.dist = distance_field(
+            self.sources, width, height, is_blocked, stop, max_dist, layers, mask
+        )
+
+    def distance(self, pos: Coord) -> int:
+        return self.dist[pos[1] * self.width + pos[0]]
+
+    # Next cell toward the nearest source: pos itself on a source, None if
+    # no source is reachable.
+    def step(self, pos: Coord) -> Optional[Coord]:
+        d = self.distance(pos)
+        if d <= 0:
+            return pos if d == 0 else None
+        x, y = pos
+        best = None
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                nd = self.dist[ny * self.width + nx]
+                if 0 <= nd < d:
+                    best, d = (nx, ny), nd
+        return best
+
+    # Cells stepped through from pos to the nearest source, ending on it;
+    # empty on a source or if none is reachable.
+    def path(self, pos: Coord) -> List[Coord]:
+        path = []
+        if self.distance(pos) < 0:
+            return path
+        while self.distance(pos) > 0:
+            pos = self.step(pos)
+            path.append(pos)
+        return path
+
+    # The source that stepping from pos ends on, or None if unreachable.
+    def descend(self, pos: Coord) -> Optional[Coord]:
+        while pos is not None and self.distance(pos) > 0:
+            pos = self.step(pos)
+        return pos
+
+
+# Side of a HierarchicalPlanner cluster, in cells.
+CLUSTER_SIZE = 16
+# Border openings at least this wide get an entrance at each end instead
+# of one in the middle.
+WIDE_ENTRANCE = 6
+
+
+class PlannedPath:
+    # A path from a planner as a chain of waypoints. Each leg between two
+    # waypoints is expanded into cells only when the walker reaches it.
+    def __init__(
+        self,
+        start: Coord,
+        goal: Coord,
+        cost: int,
+        waypoints: Iterable[Coord],
+        refine: Callable[[Coord, Coord], List[Coord]],
+        version: int = 0,
+    ):
+        self.goal = goal
+        self.cost = cost
+        self.position = start
+        self.version = version
+        self.waypoints = deque(waypoints)
+        self.refine = refine
+        self.cells: deque = deque()
+
+    # Cell to step onto next, None at the goal.
+    def next_step(self) -> Optional[Coord]:
+        while not self.cells:
+            if not self.waypoints:
+                return None
+            self.cells.extend(self.refine(self.position, self.waypoints.popleft()))
+        self.position = self.cells.popleft()
+        return self.position
+
+    # Expand the rest of the path, excluding the current position.
+    def remaining(self) -> List[Coord]:
+        path = []
+        step = self.next_step()
+        while step is not None:
+            path.append(step)
+            step = self.next_step()
+        return path
+
+
+class GridPlanner:
+    # Planner backend that searches the whole grid for every query.
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        is_blocked: Callable[[Coord], bool],
+        layers: Sequence[CostLayer] = (),
+    ):
+        self.width = width
+        self.height = height
+        self.is_blocked = is_blocked
+        self.layers = layers
+        self.version = 0
+
+    def plan(self, start: Coord, goal: Coord) -> Optional[PlannedPath]:
+        path = weighted_path(
+            start, goal, self.width, self.height, self.is_blocked, self.layers
+        )
+        if not path and start != goal:
+            return None
+        cost = 0
+        for x, y in path:
+            cost += 1
+            for layer, weight in self.layers:
+                cost += weight * layer[y * self.width + x]
+        return PlannedPath(
+            start, goal, cost, path, lambda a, b: [b], self.version
+        )
+
+    def path(self, start: Coord, goal: Coord) -> List[Coord]:
+        plan = self.plan(start, goal)
+        return plan.remaining() if plan is not None else []
+
+    # Cell at pos became passable.
+    def open(self, pos: Coord):
+        self.version += 1
+
+
+class HierarchicalPlanner:
+    # HPA*: the grid is cut into square clusters. Each run of open cell
+    # pairs across a cluster border gets an entrance (see WIDE_ENTRANCE),
+    # and each cluster caches the costs between its own entrances. A query
+    # links start and goal to the entrances of their clusters with local
+    # searches, runs A* over the entrance graph and returns a PlannedPath
+    # whose legs are expanded by local searches as they are walked.
+    # Borders and clusters are analysed the first time a query reaches
+    # them; opening a door drops only the caches of the clusters around it.
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        is_blocked: Callable[[Coord], bool],
+        layers: Sequence[CostLayer] = (),
+        cluster_size: int = CLUSTER_SIZE,
+    ):
+        self.width = width
+        self.height = height
+        self.is_blocked = is_blocked
+        self.layers = layers
+        self.size = cluster_size
+        self.cols = (width + cluster_size - 1) // cluster_size
+        self.rows = (height + cluster_size - 1) // cluster_size
+        # (cluster, right or lower neighbour) -> entrance cell index pairs.
+        self.borders: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # cluster -> entrance -> {entrance: cost}, for the entrances of the
+        # same cluster and the ones just across its borders.
+        self.links: Dict[int, Dict[int, Dict[int, int]]] = {}
+        self.version = 0
+
+    def _cluster_of(self, i: int) -> int:
+        x, y = i % self.width, i // self.width
+        return (y // self.size) * self.cols + x // self.size
+
+    def _bounds(self, c: int) -> Tuple[int, int, int, int]:
+        x0 = (c % self.cols) * self.size
+        y0 = (c // self.cols) * self.size
+        return x0, y0, min(x0 + self.size, self.width), min(y0 + self.size, self.height)
+
+    def _entry_cost(self, i: int) -> int:
+        cost = 1
+        for layer, weight in self.layers:
+            cost += weight * layer[i]
+        return cost
+
+    # Entrances between cluster a and its right or lower neighbour b.
+    def _border(self, a: int, b: int) -> List[Tuple[int, int]]:
+        pairs = self.borders.get((a, b))
+        if pairs is not None:
+            return pairs
+        w = self.width
+        x0, y0, x1, y1 = self._bounds(a)
+        if b == a + 1:
+            crossings = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        else:
+            crossings = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+        pairs = []
+        run = []
+        for inside, outside in crossings + [(None, None)]:
+            if inside is None or self.is_blocked(inside) or self.is_blocked(outside):
+                if len(run) >= WIDE_ENTRANCE:
+                    pairs += [run[0], run[-1]]
+                elif run:
+                    pairs.append(run[len(run) // 2])
+                run = []
+                continue
+            run.append((inside[1] * w + inside[0], outside[1] * w + outside[0]))
+        self.borders[(a, b)] = pairs
+        return pairs
+
+    def _cluster(self, c: int) -> Dict[int, Dict[int, int]]:
+        links = self.links.get(c)
+        if links is not None:
+            return links
+        cx, cy = c % self.cols, c // self.cols
+        crossings = []
+        if cx > 0:
+            crossings += [(q, p) for p, q in self._border(c - 1, c)]
+        if cx < self.cols - 1:
+            crossings += self._border(c, c + 1)
+        if cy > 0:
+            crossings += [(q, p) for p, q in self._border(c - self.cols, c)]
+        if cy < self.rows - 1:
+            crossings += self._border(c, c + self.cols)
+        links = {}
+        for inside, outside in crossings:
+            links.setdefault(inside, {})[outside] = self._entry_cost(outside)
+        for n in list(links):
+            dist, _ = self._local_search(n, c)
+            for m in links:
+                if m != n and m in dist:
+                    links[n][m] = dist[m]
+        self.links[c] = links
+        return links
+
+    # Dijkstra confined to cluster c. Forward distances are the cost of
+    # walking from source; with reverse, of walking to it.
+    def _local_search(
+        self, source: int, c: int, target: int = -1, reverse: bool = False
+    ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        w = self.width
+        x0, y0, x1, y1 = self._bounds(c)
+        dist = {source: 0}
+        prev: Dict[int, int] = {}
+        heap = [(0, source)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            if i == target:
+                break
+            x, y = i % w, i // w
+            leave = self._entry_cost(i) if reverse else 0
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                nx, ny = x + dx, y + dy
+                if not (x0 <= nx < x1 and y0 <= ny < y1):
+                    continue
+                j = ny * w + nx
+                nd = d + (leave if reverse else self._entry_cost(j))
+                if nd >= dist.get(j, nd + 1) or self.is_blocked((nx, ny)):
+                    continue
+                dist[j] = nd
+                prev[j] = i
+                heapq.heappush(heap, (nd, j))
+        return dist, prev
+
+    def plan(self, start: Coord, goal: Coord) -> Optional[PlannedPath]:
+        if start == goal:
+            return PlannedPath(start, goal, 0, [], self._refine, self.version)
+        if self.is_blocked(goal):
+            return None
+        w = self.width
+        s = start[1] * w + start[0]
+        g = goal[1] * w + goal[0]
+        cs, cg = self._cluster_of(s), self._cluster_of(g)
+        out, _ = self._local_search(s, cs)
+        into, _ = self._local_search(g, cg, reverse=True)
+
+        # A* over the entrances, with -1 standing for the goal.
+        gx, gy = goal
+        cost: Dict[int, int] = {}
+        prev: Dict[int, int] = {}
+        heap = []
+
+        def relax(node: int, d: int, via: int):
+            if d >= cost.get(node, d + 1):
+                return
+            cost[node] = d
+            prev[node] = via
+            h = abs(node % w - gx) + abs(node // w - gy) if node >= 0 else 0
+            heapq.heappush(heap, (d + h, d, node))
+
+        if cs == cg and g in out:
+            relax(-1, out[g], s)
+        for n in self._cluster(cs):
+            if n in out:
+                relax(n, out[n], s)
+        while heap:
+            _, d, n = heapq.heappop(heap)
+            if d > cost[n]:
+                continue
+            if n < 0:
+                break
+            c = self._cluster_of(n)
+            for m, step in self._cluster(c)[n].items():
+                relax(m, d + step, n)
+            if c == cg and n in into:
+                relax(-1, d + into[n], n)
+        if -1 not in cost:
+            return None
+
+        waypoints = [goal]
+        n = prev[-1]
+        while n != s:
+            waypoints.append((n % w, n // w))
+            n = prev[n]
+        waypoints.reverse()
+        return PlannedPath(start, goal, cost[-1], waypoints, self._refine, self.version)
+
+    # Cells from a (exclusive) to b along one leg of a plan.
+    def _refine(self, a: Coord, b: Coord) -> List[Coord]:
+        if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1:
+            return [b]
+        w = self.width
+        ai, bi = a[1] * w + a[0], b[1] * w + b[0]
+        _, prev = self._local_search(ai, self._cluster_of(ai), target=bi)
+        path = []
+        i = bi
+        while i in prev:
+            path.append((i % w, i // w))
+            i = prev[i]
+        path.reverse()
+        return path
+
+    def path(self, start: Coord, goal: Coord) -> List[Coord]:
+        plan = self.plan(start, goal)
+        return plan.remaining() if plan is not None else []
+
+    # Cell at pos became passable: forget the border entrances it lies on
+    # and the entrance costs of the clusters either side.
+    def open(self, pos: Coord):
+        x, y = pos
+        c = self._cluster_of(y * self.width + x)
+        x0, y0, x1, y1 = self._bounds(c)
+        stale = [c]
+        if x == x0 and x0 > 0:
+            stale.append(c - 1)
+            self.borders.pop((c - 1, c), None)
+        if x == x1 - 1 and x1 < self.width:
+            stale.append(c + 1)
+            self.borders.pop((c, c + 1), None)
+        if y == y0 and y0 > 0:
+            stale.append(c - self.cols)
+            self.borders.pop((c - self.cols, c), None)
+        if y == y1 - 1 and y1 < self.height:
+            stale.append(c + self.cols)
+            self.borders.pop((c, c + self.cols), None)
+        for c in stale:
+            self.links.pop(c, None)
+        self.version += 1
+
+
+# Planner backends, by name.
+PLANNERS = {"grid": GridPlanner, "hpa": HierarchicalPlanner}
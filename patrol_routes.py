@@ -0,0 +1,117 @@
+from typing import Dict, List, Tuple
+from constants import CellType
+from pathfinding import bfs_reachable, bfs_shortest_path
+
+Coord = Tuple[int, int]
+
+# Patrols walk a square ring this many cells out from the spawn.
+PATROL_RADIUS = 2
+
+
+# Ring cells around a spawn that are walkable, in walking order.
+def patrol_waypoints(
+    spawn: Coord, maze: List[List], radius: int = PATROL_RADIUS
+) -> List[Coord]:
+    cx, cy = spawn
+    ring = []
+    for x in range(cx - radius, cx + radius + 1):
+        ring.append((x, cy - radius))
+    for y in range(cy - radius + 1, cy + radius + 1):
+        ring.append((cx + radius, y))
+    for x in range(cx + radius - 1, cx - radius - 1, -1):
+        ring.append((x, cy + radius))
+    for y in range(cy + radius - 1, cy - radius, -1):
+        ring.append((cx - radius, y))
+
+    w = len(maze[0])
+    h = len(maze)
+    valid = [
+        (x, y)
+        for x, y in ring
+        if 0 <= x < w and 0 <= y < h and maze[y][x] == CellType.PATH
+    ]
+    return valid or [spawn]
+
+
+class PatrolRoutes:
+    # Patrol routes compiled once per level: each spawn's waypoints are
+    # stitched into one cyclic cell sequence (the last cell is the first
+    # waypoint), so a patrol step is an index advance. Routes are shared by
+    # every enemy with the same spawn, and legs by every route that visits
+    # the same pair of waypoints. Doors only ever open, which can shorten a
+    # leg but never breaks one, so the cache is only dropped on open_door.
+    def __init__(
+        self, maze: List[List], elements: dict, connectivity=None, planner=None
+    ):
+        self.maze = maze
+        self.elements = elements
+        self.connectivity = connectivity
+        self.planner = planner
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.routes: Dict[Coord, List[Coord]] = {}
+        self.legs: Dict[Tuple[Coord, Coord], List[Coord]] = {}
+        self._locked = self._locked_doors()
+
+    def _locked_doors(self) -> set:
+        return {
+            tuple(door["pos"])
+            for door in self.elements.get("doors", [])
+            if door.get("is_locked", False)
+        }
+
+    def _is_blocked(self, pos: Coord) -> bool:
+        x, y = pos
+        return pos in self._locked or self.maze[y][x] == CellType.WALL
+
+    def _leg(self, start: Coord, goal: Coord) -> List[Coord]:
+        key = (start, goal)
+        leg = self.legs.get(key)
+        if leg is None and self.connectivity is not None:
+            if not self.connectivity.connected(start, goal):
+                leg = []
+        if leg is None:
+            if self.planner is not None:
+                leg = self.planner.path(start, goal)
+            else:
+                leg = bfs_shortest_path(
+                    start, goal, self.width, self.height, self._is_blocked
+                )
+            self.legs[key] = leg
+        return leg
+
+    def route(self, spawn: Coord) -> List[Coord]:
+        route = self.routes.get(spawn)
+        if route is None:
+            route = self._compile(spawn)
+            self.routes[spawn] = route
+        return route
+
+    # Waypoints in another region than the spawn are dropped before
+    # stitching, so the cycle starts at the first reachable one; with none
+    # left the route is the spawn itself.
+    def _compile(self, spawn: Coord) -> List[Coord]:
+        waypoints = patrol_waypoints(spawn, self.maze)
+        if self.connectivity is not None:
+            waypoints = [
+                w for w in waypoints if self.connectivity.connected(spawn, w)
+            ]
+        else:
+            region = bfs_reachable(spawn, self.width, self.height, self._is_blocked)
+            waypoints = [w for w in waypoints if w in region]
+        if not waypoints:
+            return [spawn]
+        route: List[Coord] = []
+        cur = waypoints[0]
+        for target in waypoints[1:] + waypoints[:1]:
+            leg = self._leg(cur, target)
+            if leg:
+                route.extend(leg)
+                cur = target
+        return route or [waypoints[0]]
+
+    # Recompile lazily after a door opens.
+    def open_door(self):
+        self.routes = {}
+        self.legs = {}
+        self._locked = self._locked_doors()
@@ -0,0 +1,161 @@
+from array import array
+from collections import OrderedDict
+from typing import Iterator, List, Tuple
+from constants import CellType, DIRECTIONS
+
+# Fireballs advance one cell per FIREBALL_STEP_MS.
+FIREBALL_STEP_MS = 120
+
+BLOCKING = (CellType.WALL, CellType.DOOR)
+
+
+class WallDistances:
+    # Free cells ahead of every cell in each of the four DIRECTIONS, built
+    # with one sweep per row/column. Doors only ever open, so after one does
+    # the table underestimates; callers re-check the maze when it says 0.
+    def __init__(self, maze: List[List]):
+        self.maze = maze
+        self.width = len(maze[0])
+        self.height = len(maze)
+        size = self.width * self.height
+        self.ahead = [array("i", bytes(4 * size)) for _ in DIRECTIONS]
+        for d, (dx, dy) in enumerate(DIRECTIONS):
+            self._sweep(self.ahead[d], dx, dy)
+
+    def _sweep(self, table: array, dx: int, dy: int):
+        w, h = self.width, self.height
+        maze = self.maze
+        xs = range(w - 1, -1, -1) if dx > 0 else range(w)
+        ys = range(h - 1, -1, -1) if dy > 0 else range(h)
+        for y in ys:
+            for x in xs:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < w and 0 <= ny < h) or maze[ny][nx] in BLOCKING:
+                    table[y * w + x] = 0
+                else:
+                    table[y * w + x] = table[ny * w + nx] + 1
+
+    def blocked(self, x: int, y: int) -> bool:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return self.maze[y][x] in BLOCKING
+
+    def ahead_of(self, x: int, y: int, direction: int) -> int:
+        return self.ahead[direction][y * self.width + x]
+
+
+class FireballPool:
+    # Fireballs as parallel arrays (struct of arrays), bucketed by the time
+    # of their next step. Every fireball steps FIREBALL_STEP_MS after its
+    # last one, so a bucket stays together for life, buckets are created in
+    # due order, and a tick only touches the buckets that are due. A
+    # fireball's free run comes from WallDistances, so stepping is a
+    # countdown plus a player-position compare.
+    def __init__(self, walls: WallDistances):
+        self.walls = walls
+        self.buckets: "OrderedDict[int, Tuple[array, array, array, array]]" = (
+            OrderedDict()
+        )
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _bucket(self, due_ms: int) -> Tuple[array, array, array, array]:
+        bucket = self.buckets.get(due_ms)
+        if bucket is None:
+            bucket = (array("i"), array("i"), array("b"), array("i"))
+            self.buckets[due_ms] = bucket
+        return bucket
+
+    def spawn(self, x: int, y: int, direction: int, now_ms: int):
+        xs, ys, dirs, run = self._bucket(now_ms + FIREBALL_STEP_MS)
+        xs.append(x)
+        ys.append(y)
+        dirs.append(direction)
+        run.append(self.walls.ahead_of(x, y, direction))
+        self.count += 1
+
+    # Step every due fireball; returns how many hit the player.
+    def update(self, now_ms: int, player_pos: Tuple[int, int]) -> int:
+        buckets = self.buckets
+        walls = self.walls
+        px, py = player_pos
+        hits = 0
+        while buckets:
+            due = next(iter(buckets))
+            if due > now_ms:
+                break
+            xs, ys, dirs, run = buckets.pop(due)
+            next_due = now_ms + FIREBALL_STEP_MS
+            out = self._bucket(next_due)
+            out_xs, out_ys, out_dirs, out_run = out
+            before = len(out_xs)
+            for x, y, d, left in zip(xs, ys, dirs, run):
+                dx, dy = DIRECTIONS[d]
+                nx = x + dx
+                ny = y + dy
+                if left == 0:
+                    if walls.blocked(nx, ny):
+                        continue
+                    left = walls.ahead_of(nx, ny, d) + 1
+                if nx == px and ny == py:
+                    hits += 1
+                    continue
+                out_xs.append(nx)
+                out_ys.append(ny)
+                out_dirs.append(d)
+                out_run.append(left - 1)
+            self.count += len(out_xs) - before - len(xs)
+            if not out_xs:
+                del buckets[next_due]
+        return hits
+
+    def positions(self) -> Iterator[Tuple[int, int]]:
+        for xs, ys, _, _ in self.buckets.values():
+            yield from zip(xs, ys)
+
+
+class ThornField:
+    # Thorns as a FIFO of (cell, expiry) arrays plus a per-cell occupancy
+    # count. Every batch lives for the same duration, so expiries arrive in
+    # order and expiring is a head-pointer advance; contact is one lookup.
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.cells = array("i")
+        self.expires = array("q")
+        self.head = 0
+        self.occupancy = array("H", bytes(2 * width * height))
+
+    def __len__(self) -> int:
+        return len(self.cells) - self.head
+
+    def spawn(self, positions: List[Tuple[int, int]], expires_ms: int):
+        for x, y in positions:
+            i = y * self.width + x
+            self.cells.append(i)
+            self.expires.append(expires_ms)
+            self.occupancy[i] += 1
+
+    # Drop thorns that have run out; returns their cell indices.
+    def expire(self, now_ms: int) -> List[int]:
+        cells, expires = self.cells, self.expires
+        start = head = self.head
+        while head < len(cells) and expires[head] <= now_ms:
+            self.occupancy[cells[head]] -= 1
+            head += 1
+        expired = cells[start:head].tolist()
+        if head and head * 2 >= len(cells):
+            del cells[:head]
+            del expires[:head]
+            head = 0
+        self.head = head
+        return expired
+
+    def occupied(self, pos: Tuple[int, int]) -> bool:
+        return self.occupancy[pos[1] * self.width + pos[0]] > 0
+
+    def positions(self) -> Iterator[Tuple[int, int]]:
+        w = self.width
+        for i in self.cells[self.head :]:
+            yield (i % w, i // w)
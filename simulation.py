@@ -0,0 +1,720 @@
+import math
+import random
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from constants import (
+    GRID_SIZE,
+    MAZE_WIDTH,
+    MAZE_HEIGHT,
+    CellType,
+    MOVEMENT_DELAY,
+    DIRECTIONS,
+    EXIT_ARTIFACT_REQUIREMENT,
+    ARTIFACT_HP_HEAL,
+    PERCEPTION_RADIUS,
+    AI_FULL_RADIUS,
+    AI_LOD_INTERVAL_MS,
+    NOISE_FOOTSTEP,
+    NOISE_POTION,
+    NOISE_FIGHT,
+    TRAP_AVOID_COST,
+)
+from maze_generator import MazeGenerator
+from game_entities import Player, Enemy, Pig, Witch
+from connectivity import Connectivity
+from danger import DangerMap
+from enemy_batch import EnemyBatch
+from enemy_fields import EnemyFields
+from fog_of_war import FogOfWar
+from level_validator import LevelValidator
+from noise import NoiseMap
+from pathfinding import PLANNERS
+from patrol_routes import PatrolRoutes
+from projectiles import FireballPool, ThornField, WallDistances
+from spatial_hash import SpatialHash
+from timers import TimerQueue
+
+# Input commands accepted by Simulation.push(). Directions are (dx, dy).
+HOLD = "hold"
+RELEASE = "release"
+SNEAK = "sneak"
+SHIELD = "shield"
+WEAPON = "weapon"
+POTION = "potion"
+FETCH = "fetch"
+
+
+class ManualClock:
+    # Millisecond clock that only moves when told to; the default for
+    # headless runs, so a tick can be simulated without waiting for it.
+    def __init__(self, start_ms: int = 0):
+        self.now_ms = start_ms
+
+    def advance(self, ms: int) -> int:
+        self.now_ms += ms
+        return self.now_ms
+
+    def __call__(self) -> int:
+        return self.now_ms
+
+
+class Simulation:
+    # Game rules for one level, with no dependency on a window or the event
+    # queue. Time comes from the injected clock (a callable returning ms) and
+    # input from commands queued with push(); step() advances one tick.
+    def __init__(
+        self,
+        level: int = 1,
+        clock: Callable[[], int] = None,
+        sound=None,
+        width: int = MAZE_WIDTH,
+        height: int = MAZE_HEIGHT,
+        seed: Optional[int] = None,
+        ai_lod: bool = True,
+        path_backend: Optional[str] = None,
+        batched_ai: bool = False,
+    ):
+        # Every random draw of the level (generation, spawns, fights) comes
+        # from this, so seeded simulations do not disturb each other.
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.level = level
+        self.clock = clock or ManualClock()
+        self.sound = sound
+        self.width = width
+        self.height = height
+
+        self.commands = deque()
+        self.events: List[str] = []
+        self.held: Dict[Tuple[int, int], Optional[int]] = {}
+
+        self.maze = None
+        self.elements = None
+        self.player = None
+        self.enemies = []
+        self.witches = []
+        self.fireballs = None
+        self.thorns = None
+        self.pig = None
+        self.pig_coin_summons_remaining = 3
+        self.prev_player_pos = None
+        self.last_player_pos = None
+        self.is_sneaking = False
+        self.toast_text = ""
+        self.toast_until = 0
+
+        # Deadlines (projectile steps, expiries, burn, wake-ups) live in the
+        # timer queue; entities in `asleep` are skipped until it wakes them.
+        self.timers = TimerQueue()
+        self.asleep = set()
+        self._burn_timer = None
+
+        # Skeletons far from the player run at low detail (see AI_FULL_RADIUS);
+        # lod_next_ms holds when each non-patrolling one may tick next.
+        self.ai_lod = ai_lod
+        self.lod_next_ms: Dict[int, int] = {}
+        # Name of the pathfinding planner skeletons walk with (see
+        # pathfinding.PLANNERS); None keeps plain grid searches.
+        self.path_backend = path_backend
+        self.planner = None
+        # With batched_ai, skeletons are views onto EnemyBatch columns and
+        # their full-detail updates run as one batch per tick.
+        self.enemy_batch = EnemyBatch() if batched_ai else None
+
+        self.enemy_contact_time = {}
+        self.enemy_contact_damage = {}
+        self.contact_cooldown_ms = 3000
+
+        self._generate()
+
+    @property
+    def now_ms(self) -> int:
+        return self.clock()
+
+    def _play(self, name: str):
+        if self.sound:
+            self.sound.play_sound(name)
+
+    # Generate a level and spawn entities.
+    def _generate(self):
+
+        max_attempts = 30
+
+        for _ in range(max_attempts):
+            generator = MazeGenerator(self.width, self.height, self.rng)
+            self.maze = generator.generate()
+            start_pos, self.elements = generator.place_special_elements()
+
+            exit_pos = self.elements["exit_pos"]
+            if LevelValidator.validate_level(
+                self.maze, self.elements, start_pos, exit_pos
+            ):
+                break
+        else:
+            raise RuntimeError("Не вдалося згенерувати коректний рівень за ліміт спроб")
+
+        self.player = Player(start_pos, GRID_SIZE, self.sound)
+        self.prev_player_pos = self.player.get_position()
+        self.last_player_pos = self.player.get_position()
+
+        skeleton_count = 1
+        witch_count = 1
+        desired_coins = None
+        if self.level == 2:
+            skeleton_count = 2
+            witch_count = 3
+            desired_coins = 15
+        elif self.level == 3:
+            skeleton_count = 3
+            witch_count = 5
+            desired_coins = 25
+
+        if desired_coins is not None:
+            forbidden = self._collect_forbidden_positions(start_pos, [])
+            candidates = []
+            for y in range(self.height):
+                for x in range(self.width):
+                    if self.maze[y][x] != CellType.PATH:
+                        continue
+                    if (x, y) in forbidden:
+                        continue
+                    if (x, y) in self.elements.get("traps", []):
+                        continue
+                    candidates.append((x, y))
+            self.rng.shuffle(candidates)
+            self.elements["coins"] = candidates[:desired_coins]
+
+        enemy_positions = []
+        tries = 0
+        while len(enemy_positions) < skeleton_count and tries < 400:
+            tries += 1
+            x = self.rng.randint(1, self.width - 2)
+            y = self.rng.randint(1, self.height - 2)
+            pos = (x, y)
+            if self.maze[y][x] != CellType.PATH:
+                continue
+            if abs(x - self.player.x) + abs(y - self.player.y) <= 10:
+                continue
+            if pos in enemy_positions:
+                continue
+            if pos in self.elements.get("traps", []):
+                continue
+            if pos in self.elements.get("coins", []):
+                continue
+            enemy_positions.append(pos)
+
+        self.connectivity = Connectivity(self.maze)
+        traps = bytearray(self.width * self.height)
+        for x, y in self.elements.get("traps", []):
+            traps[y * self.width + x] = 1
+        self.cost_layers = [(traps, TRAP_AVOID_COST)]
+        if self.path_backend is not None:
+            self.planner = PLANNERS[self.path_backend](
+                self.width, self.height, self._blocks_walkers, self.cost_layers
+            )
+        self.patrol_routes = PatrolRoutes(
+            self.maze, self.elements, self.connectivity, self.planner
+        )
+        self.enemy_fields = EnemyFields()
+        self.enemies = [self._new_enemy(pos) for pos in enemy_positions]
+        self._spawn_witches(witch_count, start_pos, enemy_positions)
+
+        self.fog_of_war = FogOfWar(self.width, self.height, GRID_SIZE)
+        self.fog_of_war.update(self.player.get_position())
+
+        walls = WallDistances(self.maze)
+        self.fireballs = FireballPool(walls)
+        self.danger = DangerMap(self.maze, walls, self.witches)
+        self.thorns = ThornField(self.width, self.height)
+        self.noise = NoiseMap(self.maze)
+        self.grid = SpatialHash()
+        self.grid.rebuild(self.entities())
+
+    # Apply inventory items (from a save) to the player.
+    def apply_inventory(self, inv: dict):
+        self.player.potions = inv.get("potion", 0)
+        self.player.shield_unlocked = inv.get("shield", 0) > 0
+
+        if inv.get("armor", 0) > 0:
+            self.player.armor_hits = max(0, int(inv.get("armor_hits", 0)))
+
+        if inv.get("artifact", 0) > 0:
+            self.player.collected_artifacts = max(
+                self.player.collected_artifacts, inv.get("artifact", 1)
+            )
+            self.player.has_artifact_weapon = True
+
+        if inv.get("pig", 0) > 0 and self.pig is None:
+            self._spawn_pig()
+
+    def _new_enemy(self, pos: Tuple[int, int]) -> Enemy:
+        if self.enemy_batch is not None:
+            enemy = self.enemy_batch.spawn(pos)
+        else:
+            enemy = Enemy(pos)
+        enemy.routes = self.patrol_routes
+        enemy.cost_layers = self.cost_layers
+        enemy.connectivity = self.connectivity
+        enemy.planner = self.planner
+        enemy.rng = self.rng
+        enemy.fields = self.enemy_fields
+        return enemy
+
+    # Add a skeleton at a cell (used by stress runs and benchmarks).
+    def spawn_enemy(self, pos: Tuple[int, int]) -> Enemy:
+        enemy = self._new_enemy(pos)
+        self.enemies.append(enemy)
+        self.grid.insert(enemy)
+        return enemy
+
+    # Spawn the pig next to the player if possible.
+    def _spawn_pig(self):
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = self.player.x + dx, self.player.y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                if self.maze[ny][nx] not in (
+                    CellType.WALL,
+                    CellType.DOOR,
+                    CellType.TRAP,
+                ):
+                    self.pig = Pig((nx, ny))
+                    self.pig.cost_layers = self.cost_layers
+                    self.pig.connectivity = self.connectivity
+                    self.grid.insert(self.pig)
+                    return
+
+    # Gather positions where new entities should not spawn.
+    def _collect_forbidden_positions(
+        self, player_pos: Tuple[int, int], enemy_positions: List[Tuple[int, int]]
+    ):
+        forbidden = {
+            player_pos,
+            self.elements.get("exit_pos"),
+        }
+        for pos in enemy_positions:
+            forbidden.add(pos)
+        for coin in self.elements.get("coins", []):
+            forbidden.add(coin)
+        for trap in self.elements.get("traps", []):
+            forbidden.add(trap)
+        for key_info in self.elements.get("keys", []):
+            if key_info.get("pos"):
+                forbidden.add(tuple(key_info["pos"]))
+        for art in self.elements.get("artifacts", []):
+            forbidden.add(art)
+        for door_info in self.elements.get("doors", []):
+            if door_info.get("pos"):
+                forbidden.add(tuple(door_info["pos"]))
+        return forbidden
+
+    # Spawn a number of witches in valid path tiles.
+    def _spawn_witches(
+        self,
+        count: int,
+        player_pos: Tuple[int, int],
+        enemy_positions: List[Tuple[int, int]],
+    ):
+        self.witches = []
+        if self.maze is None or count <= 0:
+            return
+        forbidden = self._collect_forbidden_positions(player_pos, enemy_positions)
+        candidates = []
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.maze[y][x] != CellType.PATH:
+                    continue
+                if (x, y) in forbidden:
+                    continue
+                candidates.append((x, y))
+
+        if not candidates:
+            return
+
+        self.rng.shuffle(candidates)
+        for pos in candidates:
+            if len(self.witches) >= count:
+                break
+            self.witches.append(Witch(pos))
+            forbidden.add(pos)
+
+    def entities(self) -> List:
+        entities = self.enemies + self.witches + [self.player]
+        if self.pig:
+            entities.append(self.pig)
+        return entities
+
+    # Queue an input command; it is applied at the start of the next step().
+    def push(self, command: str, arg=None):
+        self.commands.append((command, arg))
+
+    # Events (e.g. "potion_used") raised since the last call.
+    def drain_events(self) -> List[str]:
+        events = self.events
+        self.events = []
+        return events
+
+    # Show a short on-screen status message.
+    def show_toast(self, text: str, duration_ms: int = 2000):
+        self.toast_text = text
+        self.toast_until = self.now_ms + duration_ms
+
+    def _apply_command(self, command: str, arg, now_ms: int):
+        if command == HOLD:
+            self.held.setdefault(arg, None)
+        elif command == RELEASE:
+            self.held.pop(arg, None)
+        elif command == SNEAK:
+            self.is_sneaking = bool(arg)
+        elif command == SHIELD:
+            self.player.shield_blocking = bool(arg) and self.player.shield_unlocked
+        elif command == WEAPON:
+            if self.player.use_artifact_weapon() and self.enemies:
+
+                self.enemies[0].health = 0
+                self.player.heal(ARTIFACT_HP_HEAL)
+        elif command == POTION:
+            if self.player.use_potion():
+                self.events.append("potion_used")
+                self.noise.emit(self.player.get_position(), NOISE_POTION)
+        elif command == FETCH:
+            self._pig_command_fetch()
+
+    # Move the player for held directions, repeating after MOVEMENT_DELAY.
+    def _apply_movement(self, now_ms: int):
+        self.player.sneaking = self.is_sneaking
+        delay_ms = int(MOVEMENT_DELAY * (1.5 if self.is_sneaking else 1.0))
+        self.player.move_ms = delay_ms
+        for direction, last_ms in self.held.items():
+            if last_ms is not None and now_ms - last_ms < delay_ms:
+                continue
+            old_pos = self.player.get_position()
+            tx, ty = old_pos[0] + direction[0], old_pos[1] + direction[1]
+            door = (
+                0 <= tx < self.width
+                and 0 <= ty < self.height
+                and self.maze[ty][tx] == CellType.DOOR
+            )
+            if self.player.move(
+                direction[0], direction[1], self.maze, self.elements, now_ms
+            ):
+                self.prev_player_pos = old_pos
+                self.grid.update(self.player)
+                if not self.is_sneaking:
+                    self.noise.emit(self.player.get_position(), NOISE_FOOTSTEP)
+                if door:
+                    self._on_door_opened((tx, ty))
+            self.held[direction] = now_ms
+
+    # Refresh state derived from connectivity after a door becomes a path.
+    def _on_door_opened(self, pos: Tuple[int, int]):
+        self.connectivity.open(pos)
+        if self.planner is not None:
+            self.planner.open(pos)
+        self.patrol_routes.open_door()
+        self.enemy_fields.open_door()
+        self.danger.open_door(self.witches)
+        if self.pig:
+            self.pig.invalidate_paths()
+
+    def _blocks_walkers(self, pos: Tuple[int, int]) -> bool:
+        return self.maze[pos[1]][pos[0]] in (CellType.WALL, CellType.DOOR)
+
+    # Whether a walker could get from a to b through the currently open
+    # cells (closed doors count as walls).
+    def can_reach(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        return self.connectivity.connected(a, b)
+
+    # Path for the player that trades extra steps for less danger (fire
+    # lanes, thorns, traps); locked doors count as walls.
+    def safest_path(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> List[Tuple[int, int]]:
+        locked = {
+            tuple(door["pos"])
+            for door in self.elements.get("doors", [])
+            if door.get("is_locked", False)
+        }
+
+        def is_blocked(pos: Tuple[int, int]) -> bool:
+            return pos in locked or self.maze[pos[1]][pos[0]] == CellType.WALL
+
+        return self.danger.safest_path(start, goal, is_blocked)
+
+    # Command the pig to fetch a visible coin if available.
+    def _pig_command_fetch(self):
+        if not self.pig or self.pig_coin_summons_remaining <= 0:
+            self.show_toast("No pig fetches left")
+            return
+        visible_coins = [
+            c
+            for c in self.elements.get("coins", [])
+            if self.fog_of_war.is_visible(c)
+        ]
+        if not visible_coins:
+            self.show_toast("No visible coins")
+            return
+        if self.pig.command_fetch(visible_coins):
+            self.pig_coin_summons_remaining -= 1
+        else:
+            self.show_toast("Pig is busy")
+
+    # Apply queued input and advance the rules by one tick; returns
+    # "victory", "defeat" or None. Moves made during the tick are recorded
+    # on the entities for render interpolation.
+    def step(self) -> Optional[str]:
+        now_ms = self.now_ms
+        for entity in self.entities():
+            entity.snapshot()
+        status = self._advance(now_ms)
+        for entity in self.entities():
+            entity.track_move(now_ms)
+        return status
+
+    def _advance(self, now_ms: int) -> Optional[str]:
+        while self.commands:
+            command, arg = self.commands.popleft()
+            self._apply_command(command, arg, now_ms)
+        self._apply_movement(now_ms)
+
+        if not self.player.is_alive:
+            return "defeat"
+
+        if (
+            self.player.x == self.elements["exit_pos"][0]
+            and self.player.y == self.elements["exit_pos"][1]
+            and len(self.player.keys) >= EXIT_ARTIFACT_REQUIREMENT
+        ):
+            return "victory"
+
+        self.fog_of_war.update(self.player.get_position())
+
+        # Perception distances come from one range query; enemies outside
+        # it cannot react to the player this tick. Those also beyond
+        # AI_FULL_RADIUS and out of sight are only simulated coarsely.
+        player_pos = self.player.get_position()
+        grid = self.grid
+        fog = self.fog_of_war
+        near = {
+            id(e): dist
+            for e, dist in grid.near(
+                player_pos, max(PERCEPTION_RADIUS, AI_FULL_RADIUS), Enemy
+            )
+        }
+
+        alive_enemies = []
+        index = {}
+        full = []
+        coarse = []
+        for i, enemy in enumerate(self.enemies):
+            if enemy.health <= 0:
+                grid.remove(enemy)
+                self.lod_next_ms.pop(id(enemy), None)
+                continue
+            index[id(enemy)] = i
+
+            alive_enemies.append(enemy)
+            if id(enemy) in self.asleep:
+                continue
+            if (
+                not self.ai_lod
+                or id(enemy) in near
+                or fog.is_visible(enemy.get_position())
+            ):
+                full.append((enemy, near.get(id(enemy), math.inf)))
+                continue
+            coarse.append(enemy)
+
+        self.enemies = alive_enemies
+
+        # Coarse rows that are not patrolling tick at the reduced rate.
+        rejected = [
+            enemy
+            for enemy in coarse
+            if not enemy.update_coarse(self.maze, self.elements, now_ms)
+        ]
+        for enemy in rejected:
+            if now_ms >= self.lod_next_ms.get(id(enemy), now_ms):
+                self.lod_next_ms[id(enemy)] = now_ms + AI_LOD_INTERVAL_MS
+                full.append((enemy, math.inf))
+
+        if self.enemy_batch is not None:
+            self.enemy_batch.update(
+                full,
+                self.player,
+                self.maze,
+                self.elements,
+                now_ms,
+                self.is_sneaking,
+                self.noise,
+            )
+        else:
+            for enemy, dist in full:
+                enemy.update(
+                    self.player,
+                    self.maze,
+                    self.elements,
+                    now_ms,
+                    self.is_sneaking,
+                    dist,
+                    self.noise,
+                )
+        # Sounds are heard once; fights below are heard next tick.
+        self.noise.clear()
+        for enemy in alive_enemies:
+            if id(enemy) in self.asleep:
+                continue
+            grid.update(enemy)
+            wake_ms = enemy.idle_until_ms()
+            if wake_ms > now_ms:
+                self._sleep(enemy, wake_ms)
+
+        contacts = grid.adjacent(player_pos, Enemy)
+        for enemy in sorted(contacts, key=lambda e: index[id(e)]):
+            self._handle_enemy_contact(index[id(enemy)], enemy, now_ms)
+            wake_ms = enemy.idle_until_ms()
+            if wake_ms > now_ms:
+                self._sleep(enemy, wake_ms)
+
+        self._update_witch_attacks(now_ms)
+        for _ in range(self.fireballs.update(now_ms, self.player.get_position())):
+            self.player.take_damage(15, now_ms)
+            self._apply_burn(now_ms)
+        self.timers.run_due(now_ms)
+        self._update_thorns(now_ms)
+
+        if self.pig:
+            current_pos = self.player.get_position()
+            follow_pos = (
+                self.prev_player_pos
+                if self.prev_player_pos and self.prev_player_pos != current_pos
+                else None
+            )
+            self.pig.set_follow_target(follow_pos)
+            pig_status = self.pig.update(self.player, self.maze, self.elements, now_ms)
+            self.grid.update(self.pig)
+            if pig_status == "delivered":
+                self.player.collected_coins += 1
+                self._play("coin_pickup")
+            elif pig_status == "no_path":
+                self.show_toast("Coin not found")
+
+        return None
+
+    # Skip an entity's updates until wake_ms.
+    def _sleep(self, entity, wake_ms: int):
+        if id(entity) in self.asleep:
+            return
+        self.asleep.add(id(entity))
+        self.timers.schedule(wake_ms, self._wake, entity)
+
+    def _wake(self, now_ms: int, entity):
+        self.asleep.discard(id(entity))
+
+    # Apply enemy contact damage or block effects.
+    def _handle_enemy_contact(self, enemy_id: int, enemy, now_ms: int):
+
+        if (
+            self.player.shield_unlocked
+            and self.player.shield_blocking
+            and now_ms >= self.player.shield_next_ready_ms
+        ):
+            self.player.shield_next_ready_ms = now_ms + 5000
+            self.noise.emit(self.player.get_position(), NOISE_FIGHT)
+            self.enemy_contact_time[enemy_id] = now_ms
+            self.enemy_contact_damage[enemy_id] = 0
+
+            if self.rng.random() < 0.3:
+                enemy.stun(1500, now_ms)
+            return
+
+        if enemy_id not in self.enemy_contact_damage:
+            self.enemy_contact_damage[enemy_id] = 0
+            self.enemy_contact_time[enemy_id] = now_ms
+            self.player.take_damage(10, now_ms)
+            self.noise.emit(self.player.get_position(), NOISE_FIGHT)
+            self._play("enemy_attack")
+            return
+
+        if now_ms - self.enemy_contact_time[enemy_id] >= self.contact_cooldown_ms:
+            self.player.take_damage(30, now_ms)
+            self.enemy_contact_time[enemy_id] = now_ms
+            self.enemy_contact_damage[enemy_id] += 1
+            self.noise.emit(self.player.get_position(), NOISE_FIGHT)
+            self._play("enemy_attack")
+
+    # Update witch fireballs and thorns based on cooldowns.
+    def _update_witch_attacks(self, now_ms: int):
+        if not self.witches:
+            return
+        # Thorns only reach 2 cells; fireball lines are checked per witch.
+        in_thorn_range = {
+            id(w) for w, _ in self.grid.near(self.player.get_position(), 2, Witch)
+        }
+        for witch in self.witches:
+            if id(witch) in self.asleep:
+                continue
+            ready_ms = witch.next_ready_ms()
+            if ready_ms > now_ms:
+                self._sleep(witch, ready_ms)
+                continue
+            direction = witch.try_fireball(
+                self.player, self.maze, now_ms, self.is_sneaking
+            )
+            if direction != (0, 0):
+                self.danger.witch_fired(witch)
+                self.timers.schedule(
+                    witch.last_fire_ms + witch.fire_cooldown_ms,
+                    self._rearm_witch,
+                    witch,
+                )
+                fx = witch.x + direction[0]
+                fy = witch.y + direction[1]
+                if not (0 <= fx < self.width and 0 <= fy < self.height):
+                    continue
+                if self.maze[fy][fx] in (CellType.WALL, CellType.DOOR):
+                    continue
+                self.fireballs.spawn(fx, fy, DIRECTIONS.index(direction), now_ms)
+                self._play("fire")
+
+            if id(witch) in in_thorn_range and witch.try_thorns(
+                self.player, now_ms, self.is_sneaking
+            ):
+                positions = []
+                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                    nx, ny = witch.x + dx, witch.y + dy
+                    if 0 <= nx < self.width and 0 <= ny < self.height:
+                        if self.maze[ny][nx] == CellType.PATH:
+                            positions.append((nx, ny))
+                self.thorns.spawn(positions, now_ms + 1000)
+                self.danger.add_thorns(positions)
+
+    def _rearm_witch(self, now_ms: int, witch):
+        self.danger.witch_ready(witch)
+
+    # Start (or restart) the 5-tick burn; the pending burn tick is replaced.
+    def _apply_burn(self, now_ms: int):
+        self.player.apply_burn(5, now_ms)
+        self.timers.cancel(self._burn_timer)
+        self._burn_timer = self.timers.schedule(
+            self.player.burn_next_ms, self._tick_burn
+        )
+
+    def _tick_burn(self, now_ms: int):
+        self._burn_timer = None
+        self.player.tick_burn(now_ms)
+        if self.player.burn_ticks > 0:
+            self._burn_timer = self.timers.schedule(
+                self.player.burn_next_ms, self._tick_burn
+            )
+
+    # Expire thorns and apply damage when the player steps onto one.
+    def _update_thorns(self, now_ms: int):
+        thorns = self.thorns
+        if not thorns:
+            return
+        self.danger.remove_thorns(thorns.expire(now_ms))
+        current_pos = self.player.get_position()
+        if self.last_player_pos != current_pos and thorns.occupied(current_pos):
+            self.player.take_damage(10, now_ms)
+        self.last_player_pos = current_pos
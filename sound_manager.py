@@ -1,57 +1,164 @@
 import pygame
 import os
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional
 from constants import resource_path
 
+# Effects, in the order the background loader decodes them (most frequent
+# first).
+SOUND_FILES = {
+    "footstep": "footstep.wav",
+    "coin_pickup": "coin_pickup.wav",
+    "damage": "damage.wav",
+    "enemy_attack": "enemy_attack.wav",
+    "fire": "fire.wav",
+    "collect_key": "collect_key.wav",
+    "collect_artifact": "collect_artifact.wav",
+    "artifact_weapon": "artifact_weapon.wav",
+    "defeat": "defeat.wav",
+    "victory": "victory.wav",
+}
+
+# Music is only ever streamed from disk by pygame.mixer.music.
+MUSIC_FILES = {
+    "menu_music": "menu_music.wav",
+}
+
+# Bytes of decoded effects kept in memory; past it the least recently
+# played are dropped and decoded again when next played. The gameplay
+# effects together decode to about 400 KB.
+SOUND_MEMORY_BUDGET = 1 << 20
+
+# Rare end-of-level effects (victory alone decodes to about 950 KB):
+# decoded when played and released once finished, outside the budget, so
+# they never evict the gameplay effects.
+ONE_SHOT_SOUNDS = ("victory", "defeat")
+
+
 class SoundManager:
-    def __init__(self, sounds_dir: str = "sounds"):
+    # Effects are decoded on a background thread after the mixer starts,
+    # as far as the memory budget allows; one played before the loader
+    # reaches it is decoded on the spot. Decoded effects form an LRU.
+    def __init__(
+        self, sounds_dir: str = "sounds", memory_budget: int = SOUND_MEMORY_BUDGET
+    ):
         pygame.mixer.init()
-        
+
         self.sounds_dir = resource_path(sounds_dir)
-        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.sounds: "OrderedDict[str, pygame.mixer.Sound]" = OrderedDict()
+        self.sound_bytes: Dict[str, int] = {}
+        self.memory_used = 0
+        self.memory_budget = memory_budget
+        self.volumes: Dict[str, float] = {}
+        self.one_shots: Dict[str, pygame.mixer.Sound] = {}
         self.current_music = None
         self.music_enabled = True
         self.sfx_enabled = True
-        self._load_sounds()
+        self._lock = threading.Lock()
+        self._loader = threading.Thread(
+            target=self._load_sounds, name="sound-loader", daemon=True
+        )
+        self._loader.start()
 
-    def _load_sounds(self):
+    def _decode(self, name: str) -> Optional[pygame.mixer.Sound]:
+        filename = SOUND_FILES.get(name)
+        if filename is None:
+            return None
+        path = os.path.join(self.sounds_dir, filename)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pygame.mixer.Sound(path)
+        except Exception:
+            return None
 
-        sound_files = {
-            "menu_music": "menu_music.wav",
-            "footstep": "footstep.wav",
-            "enemy_attack": "enemy_attack.wav",
-            "damage": "damage.wav",
-            "collect_key": "collect_key.wav",
-            "collect_artifact": "collect_artifact.wav",
-            "coin_pickup": "coin_pickup.wav",
-            "artifact_weapon": "artifact_weapon.wav",
-            "fire": "fire.wav",
-            "victory": "victory.wav",
-            "defeat": "defeat.wav",
-        }
-
-        for name, filename in sound_files.items():
+    def _size_of(self, sound: pygame.mixer.Sound) -> int:
+        init = pygame.mixer.get_init()
+        if not init:
+            return 0
+        freq, size, channels = init
+        return int(sound.get_length() * freq) * channels * (abs(size) // 8)
+
+    # Add a decoded effect. The loader only fills free budget; a sound being
+    # played evicts the least recently played ones instead.
+    def _store(self, name: str, sound: pygame.mixer.Sound, evict: bool) -> bool:
+        size = self._size_of(sound)
+        with self._lock:
+            if name in self.sounds:
+                return True
+            if not evict and self.memory_used + size > self.memory_budget:
+                return False
+            if name in self.volumes:
+                sound.set_volume(self.volumes[name])
+            self.sounds[name] = sound
+            self.sound_bytes[name] = size
+            self.memory_used += size
+            while self.memory_used > self.memory_budget and len(self.sounds) > 1:
+                old, _ = self.sounds.popitem(last=False)
+                self.memory_used -= self.sound_bytes.pop(old)
+        return True
+
+    def _load_sounds(self):
+        for name, filename in SOUND_FILES.items():
+            if name in self.sounds or name in ONE_SHOT_SOUNDS:
+                continue
+            # Decoded audio is never smaller than the WAV file holding it.
             path = os.path.join(self.sounds_dir, filename)
-            if os.path.exists(path):
-                try:
-                    self.sounds[name] = pygame.mixer.Sound(path)
-                except Exception:
-                    pass
+            free = self.memory_budget - self.memory_used
+            if os.path.exists(path) and os.path.getsize(path) > free:
+                continue
+            sound = self._decode(name)
+            if sound is not None:
+                self._store(name, sound, evict=False)
+
+    def _get(self, name: str) -> Optional[pygame.mixer.Sound]:
+        with self._lock:
+            sound = self.sounds.get(name)
+            if sound is not None:
+                self.sounds.move_to_end(name)
+                return sound
+        sound = self._decode(name)
+        if sound is not None:
+            self._store(name, sound, evict=True)
+        return sound
+
+    # Decode a one-shot effect, holding it only while it plays.
+    def _one_shot(self, name: str) -> Optional[pygame.mixer.Sound]:
+        with self._lock:
+            for old, sound in list(self.one_shots.items()):
+                if sound.get_num_channels() == 0:
+                    del self.one_shots[old]
+        sound = self._decode(name)
+        if sound is not None:
+            with self._lock:
+                if name in self.volumes:
+                    sound.set_volume(self.volumes[name])
+                self.one_shots[name] = sound
+        return sound
 
     def play_sound(self, sound_name: str, loops: int = 0):
-        if not self.sfx_enabled or sound_name not in self.sounds:
+        if not self.sfx_enabled:
+            return
+        if sound_name in ONE_SHOT_SOUNDS:
+            sound = self._one_shot(sound_name)
+        else:
+            sound = self._get(sound_name)
+        if sound is None:
             return
         try:
-            self.sounds[sound_name].play(loops=loops)
+            sound.play(loops=loops)
         except Exception:
             pass
 
     def play_music(self, music_name: str, loops: int = -1):
-        if not self.music_enabled or music_name not in self.sounds:
+        if not self.music_enabled or music_name not in MUSIC_FILES:
+            return
+        path = os.path.join(self.sounds_dir, MUSIC_FILES[music_name])
+        if not os.path.exists(path):
             return
         try:
             pygame.mixer.music.stop()
-            path = os.path.join(self.sounds_dir, f"{music_name}.wav")
             pygame.mixer.music.load(path)
             pygame.mixer.music.play(loops=loops)
             self.current_music = music_name
@@ -62,10 +169,14 @@ class SoundManager:
     def stop_music(self):
         pygame.mixer.music.stop()
         self.current_music = None
-    
+
     def stop_sound(self, sound_name: str):
-        if sound_name in self.sounds:
-            self.sounds[sound_name].stop()
+        with self._lock:
+            sound = self.sounds.get(sound_name) or self.one_shots.pop(
+                sound_name, None
+            )
+        if sound is not None:
+            sound.stop()
 
     def toggle_music(self):
         self.music_enabled = not self.music_enabled
@@ -75,9 +186,14 @@ class SoundManager:
     def toggle_sfx(self):
         self.sfx_enabled = not self.sfx_enabled
 
+    # Kept per name, so it also applies once an evicted effect is reloaded.
     def set_volume(self, sound_name: str, volume: float):
-        if sound_name in self.sounds:
-            self.sounds[sound_name].set_volume(max(0.0, min(1.0, volume)))
+        volume = max(0.0, min(1.0, volume))
+        with self._lock:
+            self.volumes[sound_name] = volume
+            sound = self.sounds.get(sound_name) or self.one_shots.get(sound_name)
+            if sound is not None:
+                sound.set_volume(volume)
 
     def set_music_volume(self, volume: float):
         pygame.mixer.music.set_volume(max(0.0, min(1.0, volume)))
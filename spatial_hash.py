@@ -0,0 +1,69 @@
+from typing import Dict, List, Tuple
+
+# Cells per side of a hash bucket.
+BUCKET_CELLS = 4
+
+
+class SpatialHash:
+    # Entities bucketed by cell block, kept current as they move, so range
+    # and adjacency queries only visit buckets around the query cell.
+    def __init__(self, bucket: int = BUCKET_CELLS):
+        self.bucket = bucket
+        self.buckets: Dict[Tuple[int, int], List] = {}
+        self._keys: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.bucket, y // self.bucket)
+
+    def insert(self, entity):
+        key = self._key(entity.x, entity.y)
+        self.buckets.setdefault(key, []).append(entity)
+        self._keys[id(entity)] = key
+
+    def remove(self, entity):
+        key = self._keys.pop(id(entity), None)
+        if key is None:
+            return
+        bucket = self.buckets[key]
+        bucket.remove(entity)
+        if not bucket:
+            del self.buckets[key]
+
+    # Re-bucket an entity after it moved; cheap when it stayed in its bucket.
+    def update(self, entity):
+        key = self._key(entity.x, entity.y)
+        if self._keys.get(id(entity)) != key:
+            self.remove(entity)
+            self.insert(entity)
+
+    def rebuild(self, entities):
+        self.buckets.clear()
+        self._keys.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    # Entities within Manhattan distance `radius`, as (entity, distance).
+    def near(self, pos: Tuple[int, int], radius: int, kind=None) -> List[Tuple]:
+        x, y = pos
+        bx0, by0 = self._key(x - radius, y - radius)
+        bx1, by1 = self._key(x + radius, y + radius)
+        found = []
+        for by in range(by0, by1 + 1):
+            for bx in range(bx0, bx1 + 1):
+                for entity in self.buckets.get((bx, by), ()):
+                    if kind is not None and not isinstance(entity, kind):
+                        continue
+                    dist = abs(entity.x - x) + abs(entity.y - y)
+                    if dist <= radius:
+                        found.append((entity, dist))
+        return found
+
+    # Entities on the four cells next to pos.
+    def adjacent(self, pos: Tuple[int, int], kind=None) -> List:
+        return [e for e, dist in self.near(pos, 1, kind) if dist == 1]
+
+    def at(self, pos: Tuple[int, int], kind=None) -> List:
+        return [e for e, _ in self.near(pos, 0, kind)]
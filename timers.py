@@ -0,0 +1,48 @@
+import heapq
+import itertools
+from typing import Callable, List, Optional
+
+
+class TimerQueue:
+    # Min-heap of pending callbacks ordered by due time (ms). Only due
+    # entries are touched each tick; callbacks scheduled for the same time
+    # run in the order they were scheduled. Cancelled entries are dropped
+    # lazily when they reach the top of the heap.
+    def __init__(self):
+        self._heap: List[list] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    # Call callback(now_ms, *args) once the clock reaches due_ms; returns a
+    # handle for cancel().
+    def schedule(self, due_ms: int, callback: Callable, *args) -> list:
+        entry = [due_ms, next(self._seq), callback, args]
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def cancel(self, entry: Optional[list]):
+        if entry is not None:
+            entry[2] = None
+
+    def next_due(self) -> Optional[int]:
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    # Run every callback due at or before now_ms; returns how many ran.
+    def run_due(self, now_ms: int) -> int:
+        heap = self._heap
+        ran = 0
+        while heap and heap[0][0] <= now_ms:
+            _, _, callback, args = heapq.heappop(heap)
+            if callback is None:
+                continue
+            callback(now_ms, *args)
+            ran += 1
+        return ran
+
+    def clear(self):
+        self._heap.clear()
@@ -0,0 +1,299 @@
+import pygame
+from typing import Iterator, List, Optional, Sequence, Tuple
+from constants import COLORS
+
+Color = Tuple[int, int, int]
+
+
+class Widget:
+    # Retained widget: keeps its rendered surface and bounding rect, and is
+    # only re-rendered after a state change marked it dirty.
+    def __init__(self, **anchor):
+        self.anchor = anchor
+        self.surface: Optional[pygame.Surface] = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.visible = True
+        self.dirty = True
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def set_visible(self, visible: bool):
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = True
+
+    def move(self, **anchor):
+        if anchor != self.anchor:
+            self.anchor = anchor
+            self.dirty = True
+
+    def _render(self) -> Optional[pygame.Surface]:
+        return None
+
+    # Re-render if dirty; returns the screen areas that need repainting.
+    def refresh(self) -> List[pygame.Rect]:
+        if not self.dirty:
+            return []
+        self.dirty = False
+        old = self.rect
+        self.surface = self._render()
+        if self.surface is not None:
+            self.rect = self.surface.get_rect(**self.anchor)
+        else:
+            self.rect = pygame.Rect(self.anchor.get("topleft", (0, 0)), (0, 0))
+        return [r for r in (old, self.rect) if r.width and r.height]
+
+    def draw(self, target: pygame.Surface):
+        if self.visible and self.surface is not None:
+            target.blit(self.surface, self.rect)
+
+    def walk(self) -> Iterator["Widget"]:
+        yield self
+
+
+class Label(Widget):
+    def __init__(self, text: str, font: pygame.font.Font, color: Color, **anchor):
+        super().__init__(**anchor)
+        self.text = text
+        self.font = font
+        self.color = color
+
+    def set_text(self, text: str):
+        if text != self.text:
+            self.text = text
+            self.dirty = True
+
+    def set_color(self, color: Color):
+        if color != self.color:
+            self.color = color
+            self.dirty = True
+
+    def _render(self) -> Optional[pygame.Surface]:
+        return self.font.render(self.text, True, self.color)
+
+
+class Image(Widget):
+    def __init__(self, image: Optional[pygame.Surface], **anchor):
+        super().__init__(**anchor)
+        self.image = image
+
+    def set_image(self, image: Optional[pygame.Surface]):
+        if image is not self.image:
+            self.image = image
+            self.dirty = True
+
+    def _render(self) -> Optional[pygame.Surface]:
+        return self.image
+
+
+class Button(Label):
+    # Menu entry drawn as "> label" in the highlight colour when selected.
+    def __init__(
+        self,
+        label: str,
+        font: pygame.font.Font,
+        prefix: bool = True,
+        color: Color = COLORS["menu_inactive"],
+        selected_color: Color = COLORS["menu_highlight"],
+        **anchor,
+    ):
+        super().__init__(label, font, color, **anchor)
+        self.label = label
+        self.prefix = prefix
+        self.base_color = color
+        self.selected_color = selected_color
+        self.selected = False
+        self.enabled = True
+
+    def set_label(self, label: str):
+        if label != self.label:
+            self.label = label
+            self.dirty = True
+
+    def set_selected(self, selected: bool):
+        if selected != self.selected:
+            self.selected = selected
+            self.dirty = True
+
+    def set_enabled(self, enabled: bool):
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.dirty = True
+
+    def _render(self) -> Optional[pygame.Surface]:
+        prefix = ("> " if self.selected else "  ") if self.prefix else ""
+        self.text = prefix + self.label
+        highlighted = self.selected and self.enabled
+        self.color = self.selected_color if highlighted else self.base_color
+        return super()._render()
+
+
+class TextInput(Label):
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        color: Color,
+        max_length: int = 20,
+        cursor: str = "|",
+        **anchor,
+    ):
+        super().__init__(cursor, font, color, **anchor)
+        self.value = ""
+        self.max_length = max_length
+        self.cursor = cursor
+
+    def set_value(self, value: str):
+        if value != self.value:
+            self.value = value
+            self.set_text(value + self.cursor)
+
+    # Apply an editing key; returns True if the event was consumed.
+    def handle_key(self, event: pygame.event.Event) -> bool:
+        if event.key == pygame.K_BACKSPACE:
+            self.set_value(self.value[:-1])
+            return True
+        if len(self.value) < self.max_length and event.unicode.isprintable():
+            self.set_value(self.value + event.unicode)
+            return True
+        return False
+
+
+class Panel(Widget):
+    # Container with an optional background colour/image or border. The root
+    # panel of a screen composites dirty widgets and reports their rects.
+    def __init__(
+        self,
+        rect: Optional[pygame.Rect] = None,
+        background=None,
+        border: int = 0,
+        children: Sequence[Widget] = (),
+    ):
+        super().__init__()
+        self.rect = pygame.Rect(rect) if rect else pygame.Rect(0, 0, 0, 0)
+        self.background = background
+        self.border = border
+        self.children: List[Widget] = list(children)
+
+    def set_background(self, background):
+        if background != self.background:
+            self.background = background
+            self.dirty = True
+
+    def add(self, widget: Widget) -> Widget:
+        self.children.append(widget)
+        return widget
+
+    def bounds(self) -> pygame.Rect:
+        if self.rect.width and self.rect.height:
+            return self.rect
+        rects = [c.bounds() if isinstance(c, Panel) else c.rect for c in self.children]
+        rects = [r for r in rects if r.width and r.height]
+        return rects[0].unionall(rects[1:]) if rects else self.rect
+
+    def refresh(self) -> List[pygame.Rect]:
+        if not self.dirty:
+            return []
+        self.dirty = False
+        bounds = self.bounds()
+        return [bounds] if bounds.width and bounds.height else []
+
+    def draw(self, target: pygame.Surface):
+        if not self.visible or self.background is None:
+            return
+        if isinstance(self.background, pygame.Surface):
+            area = self.background.get_rect()
+            target.blit(self.background, self.rect, area)
+        else:
+            pygame.draw.rect(target, self.background, self.rect, self.border)
+
+    def walk(self) -> Iterator[Widget]:
+        yield self
+        if not self.visible:
+            return
+        for child in self.children:
+            yield from child.walk()
+
+    def draw_all(self, target: pygame.Surface):
+        widgets = list(self.walk())
+        for widget in widgets:
+            widget.refresh()
+        for widget in widgets:
+            widget.draw(target)
+
+    # Composite only dirty widgets; returns rects for pygame.display.update.
+    def draw_dirty(self, target: pygame.Surface) -> List[pygame.Rect]:
+        dirty: List[pygame.Rect] = []
+        for widget in self._all_widgets():
+            dirty.extend(widget.refresh())
+        if not dirty:
+            return []
+
+        widgets = list(self.walk())
+        rects = [w.rect for w in widgets]
+        for rect in dirty:
+            target.set_clip(rect)
+            for i in rect.collidelistall(rects):
+                widgets[i].draw(target)
+        target.set_clip(None)
+        return dirty
+
+    # Includes children of hidden panels so their removal is repainted too.
+    def _all_widgets(self) -> Iterator[Widget]:
+        yield self
+        for child in self.children:
+            if isinstance(child, Panel):
+                yield from child._all_widgets()
+            else:
+                yield child
+
+
+class ListWidget(Panel):
+    # Selectable column or row of Buttons laid out at a fixed step.
+    def __init__(
+        self,
+        labels: Sequence[str],
+        font: pygame.font.Font,
+        origin: Tuple[int, int],
+        step: Tuple[int, int],
+        anchor: str = "center",
+        **button_options,
+    ):
+        super().__init__()
+        self.font = font
+        self.origin = origin
+        self.step = step
+        self.anchor_name = anchor
+        self.button_options = button_options
+        self.selected = 0
+        self.set_items(labels)
+
+    @property
+    def buttons(self) -> List[Button]:
+        return self.children
+
+    def set_items(self, labels: Sequence[str]):
+        for i, label in enumerate(labels):
+            x = self.origin[0] + i * self.step[0]
+            y = self.origin[1] + i * self.step[1]
+            if i < len(self.children):
+                self.children[i].set_label(label)
+                self.children[i].set_visible(True)
+                self.children[i].move(**{self.anchor_name: (x, y)})
+            else:
+                self.children.append(
+                    Button(
+                        label,
+                        self.font,
+                        **self.button_options,
+                        **{self.anchor_name: (x, y)},
+                    )
+                )
+        for button in self.children[len(labels):]:
+            button.set_visible(False)
+        self.select(self.selected)
+
+    def select(self, index: int):
+        self.selected = index
+        for i, button in enumerate(self.children):
+            button.set_selected(i == index)